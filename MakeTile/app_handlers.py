@@ -5,8 +5,9 @@ from bpy.app.handlers import persistent
 from .utils.registration import get_prefs, get_path
 from .materials.materials import (
     get_blend_filenames,
-    load_materials)
-from .lib.utils.file_handling import absolute_file_paths
+    load_materials,
+    link_default_materials)
+from .lib.utils.material_catalogue import get_material_catalogue
 
 
 def create_properties_on_activation(dummy):
@@ -16,6 +17,7 @@ def create_properties_on_activation(dummy):
     create_default_materials(context)
     load_default_materials(context)
     initialise_scene_props(context)
+    prefetch_scene_materials(context)
 
 
 @persistent
@@ -23,52 +25,101 @@ def create_properties_on_load(dummy):
     context = bpy.context
     load_default_materials(context)
     initialise_scene_props(context)
+    prefetch_scene_materials(context)
 
 
 def create_default_materials(context):
     """Create a list of default materials that appear in the MakeTile menu.
 
+    Materials in the default and user asset libraries are listed from the
+    material catalogue, so only library files that have changed are opened.
+
     Args:
-        context ([type]): [description]
+        context (bpy.context): context
     """
     prefs = get_prefs()
 
     # Collection of custom props containg name and path to material
     default_mats = prefs.default_materials
+    existing = set((mat.name, mat.filepath) for mat in default_mats)
 
-    default_assets_dir = os.path.join(prefs.assets_path, "materials")
-
-    paths = [path for path in absolute_file_paths(
-        default_assets_dir) if path.endswith(".blend")]
+    directories = [
+        os.path.join(prefs.assets_path, "materials"),
+        os.path.join(prefs.user_assets_path, "materials")]
 
-    for path in paths:
-        with bpy.data.libraries.load(path) as (data_from, data_to):
-            for mat in data_from.materials:
-                if mat not in [mat.name for mat in default_mats if mat.filepath == path]:
-                    new_mat = default_mats.add()
-                    new_mat.name = mat
-                    new_mat.filepath = path
-    return
+    for path, materials in get_material_catalogue(directories).items():
+        for mat in materials:
+            if (mat, path) not in existing:
+                new_mat = default_mats.add()
+                new_mat.name = mat
+                new_mat.filepath = path
+                existing.add((mat, path))
 
 
 def load_default_materials(context):
+    """Link the secondary material.
+
+    Other default materials are only linked when they are first used, see
+    materials.get_material, so opening a file doesn't load the whole
+    material library.
+
+    Args:
+        context (bpy.context): context
+    """
     prefs = get_prefs()
-    default_mats = prefs.default_materials
-    paths = set([mat.filepath for mat in default_mats])
+    link_default_materials([prefs.secondary_material])
+
+
+def get_scene_material_names(context):
+    """Return the default materials selected in the scene's material properties.
+
+    Args:
+        context (bpy.context): context
+
+    Returns:
+        set[str]: material names
+    """
+    default_names = set(mat.name for mat in get_prefs().default_materials)
+    scene_props = context.scene.mt_scene_props
+    names = set()
+    for prop in scene_props.bl_rna.properties:
+        if prop.type == 'ENUM' and prop.identifier.endswith('_material'):
+            name = getattr(scene_props, prop.identifier)
+            if name in default_names:
+                names.add(name)
+    return names
+
+
+# {library path: material names} waiting to be linked by the prefetch timer
+_prefetch_queue = {}
 
-    try:
-        for path in paths:
-            mats = [mat.name for mat in default_mats if mat.filepath == path]
-            with bpy.data.libraries.load(path, link=True) as (data_from, data_to):
-                data_to.materials = [
-                    mat for mat in data_from.materials if mat in mats]
-        return True
-    except OSError as err:
-        print(err)
-        return False
-    except KeyError as err:
-        print(err)
-        return False
+
+def prefetch_scene_materials(context):
+    """Link the materials the scene uses in the background.
+
+    One library is linked per timer tick so the UI stays responsive. Timers
+    don't run in background mode, where materials are just linked on first use.
+
+    Args:
+        context (bpy.context): context
+    """
+    if bpy.app.background:
+        return
+    wanted = get_scene_material_names(context)
+    _prefetch_queue.clear()
+    for mat in get_prefs().default_materials:
+        if mat.name in wanted:
+            _prefetch_queue.setdefault(mat.filepath, set()).add(mat.name)
+    if _prefetch_queue and not bpy.app.timers.is_registered(_prefetch_next_library):
+        bpy.app.timers.register(_prefetch_next_library, first_interval=0.5)
+
+
+def _prefetch_next_library():
+    if not _prefetch_queue:
+        return None
+    path = next(iter(_prefetch_queue))
+    link_default_materials(_prefetch_queue.pop(path))
+    return 0.1 if _prefetch_queue else None
 
 
 @persistent
@@ -94,10 +145,10 @@ def update_mt_scene_props_handler(dummy):
             scene_props.base_y = tile_props.base_size[1]
             scene_props.base_z = tile_props.base_size[2]
 
+            scene_keys = set(scene_props.keys())
             for key, value in tile_props.items():
-                for k in scene_props.keys():
-                    if k == key:
-                        scene_props[k] = value
+                if key in scene_keys:
+                    scene_props[key] = value
             scene_props.mt_last_selected = obj
 
     except KeyError:
@@ -106,53 +157,131 @@ def update_mt_scene_props_handler(dummy):
         pass
 
 
+# tile_defaults.json is read by enum callbacks which Blender calls on every
+# panel redraw so it is cached here and only read again if it changes.
+_tile_defaults_cache = {
+    'path': None,
+    'mtime': None,
+    'defaults': False,
+    'by_type': {},
+    'enum_items': {}}
+
+
 def load_tile_defaults(context):
-    """Load tile defaults into memory."""
-    addon_path = get_path()
-    json_path = os.path.join(
-        addon_path,
-        "assets",
-        "data",
-        "tile_defaults.json"
-    )
-
-    if os.path.exists(json_path):
+    """Load tile defaults into memory.
+
+    The file is only read again when its modification time changes.
+
+    Args:
+        context (bpy.types.Context): context
+
+    Returns:
+        list[dict] | False: tile defaults or False if the file doesn't exist
+    """
+    cache = _tile_defaults_cache
+    json_path = cache['path']
+    if json_path is None:
+        addon_path = get_path()
+        json_path = cache['path'] = os.path.join(
+            addon_path,
+            "assets",
+            "data",
+            "tile_defaults.json"
+        )
+
+    try:
+        mtime = os.stat(json_path).st_mtime_ns
+    except OSError:
+        return False
+
+    if cache['mtime'] != mtime:
         with open(json_path) as json_file:
             tile_defaults = json.load(json_file)
-            return tile_defaults
-    return False
+        cache['defaults'] = tile_defaults
+        cache['by_type'] = {tile['type']: tile for tile in tile_defaults}
+        cache['enum_items'] = {}
+        cache['mtime'] = mtime
+    return cache['defaults']
+
+
+def get_tile_defaults(context, tile_type):
+    """Return the tile defaults for a tile type.
+
+    Args:
+        context (bpy.types.Context): context
+        tile_type (str): tile type
+
+    Returns:
+        dict | None: tile defaults or None if there are none for tile_type
+    """
+    if not load_tile_defaults(context):
+        return None
+    return _tile_defaults_cache['by_type'].get(tile_type)
+
+
+def get_tile_enum_items(context, tile_type, key):
+    """Return sorted enum items for one of a tile type's blueprint or wall position dicts.
+
+    The same list is returned until tile_defaults.json changes, which also
+    keeps the item strings referenced as Blender requires for dynamic enums.
+
+    Args:
+        context (bpy.types.Context): context
+        tile_type (str): tile type
+        key (str): 'main_part_blueprints', 'base_blueprints' or 'wall_positions'
+
+    Returns:
+        list[tuple(str, str, str)]: enum items
+    """
+    tile = get_tile_defaults(context, tile_type)
+    enum_items = _tile_defaults_cache['enum_items']
+    try:
+        return enum_items[tile_type, key]
+    except KeyError:
+        pass
+    # some tiles such as mini bases don't have a main part
+    if tile is None or key not in tile:
+        items = []
+    else:
+        items = sorted((k, v, "") for k, v in tile[key].items())
+    enum_items[tile_type, key] = items
+    return items
 
 
 def initialise_scene_props(context):
     prefs = get_prefs()
     scene_props = context.scene.mt_scene_props
     scene_props.tile_type = prefs.default_tile_type
-    tile_defaults = load_tile_defaults(context)
-
-    for tile in tile_defaults:
-        if tile['type'] == scene_props.tile_type:
-            defaults = tile['defaults']
-            for key, value in defaults.items():
-                setattr(scene_props, key, value)
-
-            base_blueprint = scene_props.base_blueprint
-            base_defaults = defaults['base_defaults']
-            for key, value in base_defaults.items():
-                if key == base_blueprint:
-                    for k, v in value.items():
-                        setattr(scene_props, k, v)
-                    break
-
-            main_part_blueprint = scene_props.main_part_blueprint
-            main_part_defaults = defaults['tile_defaults']
-            for key, value in main_part_defaults.items():
-                if key == main_part_blueprint:
-                    for k, v in value.items():
-                        setattr(scene_props, k, v)
-                    break
-            break
-
-
-bpy.app.handlers.depsgraph_update_pre.append(create_properties_on_activation)
-bpy.app.handlers.load_post.append(create_properties_on_load)
-bpy.app.handlers.depsgraph_update_post.append(update_mt_scene_props_handler)
+    tile = get_tile_defaults(context, scene_props.tile_type)
+
+    if tile is not None:
+        defaults = tile['defaults']
+        for key, value in defaults.items():
+            setattr(scene_props, key, value)
+
+        base_blueprint = scene_props.base_blueprint
+        base_defaults = defaults['base_defaults']
+        if base_blueprint in base_defaults:
+            for k, v in base_defaults[base_blueprint].items():
+                setattr(scene_props, k, v)
+
+        main_part_blueprint = scene_props.main_part_blueprint
+        main_part_defaults = defaults['tile_defaults']
+        if main_part_blueprint in main_part_defaults:
+            for k, v in main_part_defaults[main_part_blueprint].items():
+                setattr(scene_props, k, v)
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_pre.append(create_properties_on_activation)
+    bpy.app.handlers.load_post.append(create_properties_on_load)
+    bpy.app.handlers.depsgraph_update_post.append(update_mt_scene_props_handler)
+
+
+def unregister():
+    for handlers, handler in (
+            (bpy.app.handlers.depsgraph_update_pre, create_properties_on_activation),
+            (bpy.app.handlers.load_post, create_properties_on_load),
+            (bpy.app.handlers.depsgraph_update_post, update_mt_scene_props_handler)):
+        if handler in handlers:
+            handlers.remove(handler)
@@ -1,7 +1,10 @@
 import os
 import bpy
 import sys
+import json
+import time
 import typing
+import hashlib
 import inspect
 import pkgutil
 import importlib
@@ -11,6 +14,7 @@ __all__ = (
     "init",
     "register",
     "unregister",
+    "get_startup_report",
 )
 
 blender_version = bpy.app.version
@@ -18,22 +22,68 @@ blender_version = bpy.app.version
 modules = None
 ordered_classes = None
 
+# bump to ignore existing registries when what is stored changes
+registry_version = 1
+
+# seconds spent starting up, filled in by init() and register()
+timings = {
+    "cached": False,
+    "init": 0,
+    "imports": {},
+    "register_classes": 0,
+    "register_modules": {},
+}
+
 def init():
+    """Import the modules that register something and find the classes to register.
+
+    The modules and the order to register classes in are cached in a
+    registry file, keyed by the size and modification time of the source
+    files. When it is up to date only the modules in it are imported and
+    classes aren't inspected again, so other modules are only loaded when
+    something first imports them.
+    """
     global modules
     global ordered_classes
 
-    modules = get_all_submodules(Path(__file__).parent)
-    ordered_classes = get_ordered_classes_to_register(modules)
+    start = time.perf_counter()
+    timings["imports"] = {}
+    directory = Path(__file__).parent
+    source_key = get_source_key(directory)
+    registry = load_registry(source_key)
+
+    modules = ordered_classes = None
+    if registry is not None:
+        try:
+            modules = [import_module(name) for name in registry["modules"]]
+            ordered_classes = [
+                getattr(sys.modules[module_name], class_name)
+                for module_name, class_name in registry["classes"]]
+        except (ImportError, KeyError, AttributeError):
+            modules = ordered_classes = None
+    timings["cached"] = ordered_classes is not None
+
+    if ordered_classes is None:
+        all_modules = get_all_submodules(directory)
+        ordered_classes = get_ordered_classes_to_register(all_modules)
+        modules = get_modules_to_register(all_modules, ordered_classes)
+        save_registry(source_key, modules, ordered_classes)
+    timings["init"] = time.perf_counter() - start
 
 def register():
+    start = time.perf_counter()
     for cls in ordered_classes:
         bpy.utils.register_class(cls)
+    timings["register_classes"] = time.perf_counter() - start
 
+    timings["register_modules"] = {}
     for module in modules:
         if module.__name__ == __name__:
             continue
         if hasattr(module, "register"):
+            start = time.perf_counter()
             module.register()
+            timings["register_modules"][module.__name__] = time.perf_counter() - start
 
 def unregister():
     for cls in reversed(ordered_classes):
@@ -54,7 +104,23 @@ def get_all_submodules(directory):
 
 def iter_submodules(path, package_name):
     for name in sorted(iter_submodule_names(path)):
-        yield importlib.import_module("." + name, package_name)
+        yield import_module(package_name + "." + name)
+
+def import_module(name):
+    """Import a module, recording how long it took including the modules it imports."""
+    already_imported = name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    if not already_imported:
+        timings["imports"][name] = time.perf_counter() - start
+    return module
+
+def get_modules_to_register(modules, classes):
+    """Return the modules that define classes to register or have register functions."""
+    class_modules = set(cls.__module__ for cls in classes)
+    return [
+        module for module in modules
+        if module.__name__ in class_modules or hasattr(module, "register") or hasattr(module, "unregister")]
 
 def iter_submodule_names(path, root=""):
     for _, module_name, is_package in pkgutil.iter_modules([str(path)]):
@@ -154,4 +220,81 @@ def toposort(deps_dict):
             else:
                 unsorted.append(value)
         deps_dict = {value : deps_dict[value] - sorted_values for value in unsorted}
-    return sorted_list
\ No newline at end of file
+    return sorted_list
+
+
+# Cache the modules and classes to register
+#################################################
+
+def get_registry_path():
+    return os.path.join(bpy.utils.user_resource('CONFIG', path='MakeTile', create=True), 'registry.json')
+
+def get_source_key(directory):
+    """Return a hash of the size and modification time of the source files and Blender's version."""
+    h = hashlib.sha1(repr(tuple(blender_version)).encode())
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py"):
+                stat = os.stat(os.path.join(root, name))
+                h.update(repr((os.path.relpath(os.path.join(root, name), directory), stat.st_mtime_ns, stat.st_size)).encode())
+    return h.hexdigest()
+
+def load_registry(source_key):
+    try:
+        with open(get_registry_path()) as f:
+            registry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if registry.get("version") != registry_version or registry.get("key") != source_key:
+        return None
+    return registry
+
+def save_registry(source_key, modules, classes):
+    # only classes that can be found by name again can be cached
+    for cls in classes:
+        if getattr(sys.modules.get(cls.__module__), cls.__name__, None) is not cls:
+            return
+    registry = {
+        "version": registry_version,
+        "key": source_key,
+        "modules": [module.__name__ for module in modules],
+        "classes": [(cls.__module__, cls.__name__) for cls in classes],
+    }
+    try:
+        path = get_registry_path()
+        with open(path + ".tmp", "w") as f:
+            json.dump(registry, f, indent=1)
+        os.replace(path + ".tmp", path)
+    except OSError as err:
+        print(err)
+
+
+# Report startup time
+#################################################
+
+def get_startup_report(top=10):
+    """Return how long the add-on took to start up.
+
+    Args:
+        top (int, optional): number of slowest imports and register functions to list
+
+    Returns:
+        str: report
+    """
+    register_modules = sum(timings["register_modules"].values())
+    lines = [
+        "MakeTile started in {:.1f} ms ({} registry)".format(
+            (timings["init"] + timings["register_classes"] + register_modules) * 1000,
+            "cached" if timings["cached"] else "new"),
+        "  import and find classes: {:.1f} ms, {} modules".format(timings["init"] * 1000, len(timings["imports"])),
+        "  register {} classes: {:.1f} ms".format(len(ordered_classes or ()), timings["register_classes"] * 1000),
+        "  module register functions: {:.1f} ms".format(register_modules * 1000),
+        "Slowest imports, including the modules they import:",
+    ]
+    for name, seconds in sorted(timings["imports"].items(), key=lambda item: -item[1])[:top]:
+        lines.append("  {:8.1f} ms  {}".format(seconds * 1000, name))
+    lines.append("Slowest register functions:")
+    for name, seconds in sorted(timings["register_modules"].items(), key=lambda item: -item[1])[:top]:
+        lines.append("  {:8.1f} ms  {}".format(seconds * 1000, name))
+    return "\n".join(lines)
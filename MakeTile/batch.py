@@ -0,0 +1,236 @@
+"""Generate and export tiles from a manifest without the UI.
+
+Run with batch_generate.py, e.g.
+
+    blender -b -P batch_generate.py -- kit.json --report kit_report.json
+
+A manifest is a JSON (or YAML if PyYAML is installed) file like:
+
+    {
+        "export_path": "/path/to/stls",
+        "defaults": {"base_blueprint": "OPENLOCK"},
+        "scene": {"export_units": "INCHES", "voxelise_on_export": false},
+        "tiles": [
+            {"mt_type": "STRAIGHT_WALL", "main_part_blueprint": "OPENLOCK",
+             "tile_x": 4, "wall_material": "Basic Stone 1", "variants": 3},
+            {"mt_type": "RECT_FLOOR", "name": "floor_2x2", "count": 10}
+        ]
+    }
+
+Each tile spec needs an mt_type. Its other keys, merged over "defaults", are
+passed to the tile generator operator as properties, apart from:
+    name: label used in the report
+    count: number of tiles to generate from the spec. Defaults to 1
+    variants: number of randomised variants to export. Defaults to 1
+    export: whether to export the tile. Defaults to the manifest's "export" or True
+
+"scene" sets mt_scene_props such as the export options. Unless
+"keep_tiles" is true tiles are deleted once exported so large kits don't
+fill up the scene.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+import bpy
+from .tile_creation.create_tile import MT_Tile_Generator
+from .operators.exporter import export_tiles
+from .lib.utils.utils import get_all_subclasses
+from .app_handlers import create_properties_on_activation
+
+_spec_keys = {'mt_type', 'name', 'count', 'variants', 'export'}
+
+
+def load_manifest(filepath):
+    """Load a manifest from a .json or .yaml file.
+
+    Args:
+        filepath (str): path to manifest
+
+    Returns:
+        dict: manifest
+    """
+    with open(filepath) as f:
+        if os.path.splitext(filepath)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError as err:
+                raise ImportError('PyYAML is needed to read YAML manifests. Use JSON instead.') from err
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def get_tile_generator(mt_type):
+    """Return the tile generator operator for a tile type.
+
+    Args:
+        mt_type (str): tile type e.g. 'STRAIGHT_WALL'
+
+    Returns:
+        bpy.ops operator: operator
+    """
+    for subclass in get_all_subclasses(MT_Tile_Generator):
+        if getattr(subclass, 'mt_type', None) == mt_type and 'INTERNAL' not in subclass.bl_options:
+            category, name = subclass.bl_idname.split('.')
+            return getattr(getattr(bpy.ops, category), name)
+    raise KeyError('No tile generator for mt_type ' + str(mt_type))
+
+
+def generate_tile(context, mt_type, **props):
+    """Generate a tile.
+
+    Args:
+        context (bpy.context): context
+        mt_type (str): tile type e.g. 'STRAIGHT_WALL'
+        **props: tile generator operator properties
+
+    Returns:
+        bpy.types.Collection: tile collection
+    """
+    generator = get_tile_generator(mt_type)
+    context.scene.mt_scene_props.tile_type = mt_type
+    tiles = bpy.data.collections.get('Tiles')
+    existing = set(tiles.children) if tiles else set()
+
+    result = generator('EXEC_DEFAULT', refresh=True, **props)
+    if 'FINISHED' not in result:
+        raise RuntimeError(mt_type + ' generator returned ' + ', '.join(result))
+
+    # each tile is a sub collection of the 'Tiles' collection
+    for collection in bpy.data.collections['Tiles'].children:
+        if collection not in existing:
+            return collection
+    raise RuntimeError(mt_type + ' generator did not create a tile')
+
+
+def delete_tile(collection):
+    """Delete a tile collection and the objects in it.
+
+    Args:
+        collection (bpy.types.Collection): tile collection
+    """
+    for obj in list(collection.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+    bpy.data.collections.remove(collection, do_unlink=True)
+
+    # clean up orphan meshes
+    for mesh in bpy.data.meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def run_manifest(manifest, context=None):
+    """Generate and export every tile in a manifest.
+
+    Failures are recorded in the report rather than raised so one bad spec
+    doesn't stop the rest of the kit.
+
+    Args:
+        manifest (dict): manifest
+        context (bpy.context, optional): context. Defaults to bpy.context.
+
+    Returns:
+        dict: run report
+    """
+    if context is None:
+        context = bpy.context
+
+    # MakeTile loads its materials and initialises the scene properties on
+    # the first depsgraph update, which would otherwise happen part way
+    # through generating the first tile.
+    if create_properties_on_activation in bpy.app.handlers.depsgraph_update_pre:
+        create_properties_on_activation(None)
+
+    scene_props = context.scene.mt_scene_props
+    for key, value in manifest.get('scene', {}).items():
+        setattr(scene_props, key, value)
+
+    export_path = manifest.get('export_path')
+    keep_tiles = manifest.get('keep_tiles', False)
+    defaults = manifest.get('defaults', {})
+    start = time.time()
+    results = []
+
+    for index, spec in enumerate(manifest.get('tiles', [])):
+        spec = dict(defaults, **spec)
+        mt_type = spec.get('mt_type')
+        props = {k: v for k, v in spec.items() if k not in _spec_keys}
+        variants = spec.get('variants', 1)
+        export = spec.get('export', manifest.get('export', True))
+
+        for i in range(spec.get('count', 1)):
+            result = {
+                'index': index,
+                'name': spec.get('name', mt_type),
+                'mt_type': mt_type,
+                'status': 'OK',
+                'tile': None,
+                'files': [],
+                'generate_time': 0.0,
+                'export_time': 0.0}
+            results.append(result)
+            collection = None
+            try:
+                t = time.time()
+                collection = generate_tile(context, mt_type, **props)
+                result['tile'] = collection.name
+                result['generate_time'] = round(time.time() - t, 3)
+
+                if export:
+                    t = time.time()
+                    scene_props.randomise_on_export = variants > 1
+                    scene_props.num_variants = variants
+                    result['files'] = export_tiles(context, [collection], export_path)
+                    result['export_time'] = round(time.time() - t, 3)
+            except Exception as err:
+                result['status'] = 'FAILED'
+                result['error'] = repr(err)
+                result['traceback'] = traceback.format_exc()
+            finally:
+                if collection is not None and not keep_tiles:
+                    delete_tile(collection)
+
+    failed = sum(1 for r in results if r['status'] != 'OK')
+    return {
+        'blender_version': bpy.app.version_string,
+        'duration': round(time.time() - start, 3),
+        'tiles': len(results),
+        'succeeded': len(results) - failed,
+        'failed': failed,
+        'results': results}
+
+
+def main(argv=None):
+    """Command line entry point.
+
+    Args:
+        argv (list[str], optional): arguments. Defaults to those after '--' in sys.argv.
+
+    Returns:
+        int: exit code. 1 if any tile failed
+    """
+    if argv is None:
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+    parser = argparse.ArgumentParser(
+        prog='blender -b -P batch_generate.py --',
+        description='Generate and export MakeTile tiles from a manifest.')
+    parser.add_argument('manifest', help='path to .json or .yaml manifest')
+    parser.add_argument('--report', help='path to write the JSON run report to')
+    parser.add_argument('--export-path', help='directory to export to. Overrides the manifest')
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(args.manifest)
+    if args.export_path:
+        manifest['export_path'] = args.export_path
+    report = run_manifest(manifest)
+    report['manifest'] = os.path.abspath(args.manifest)
+
+    report_path = args.report or manifest.get('report') or os.path.splitext(args.manifest)[0] + '.report.json'
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=4)
+
+    print(f"{report['succeeded']} of {report['tiles']} tiles generated. Report written to {report_path}")
+    return 1 if report['failed'] else 0
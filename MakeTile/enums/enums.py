@@ -6,6 +6,11 @@ collection_types = [
     ("BUILDING", "Building", ""),  # a building type prefab consisting of multiple tiles to be printed separately
     ("OTHER", "Other", "")]
 
+displacement_methods = [
+    ("BAKE", "Bake", "Bake displacement maps with Cycles"),
+    ("CPU", "CPU", "Evaluate displacement materials at the vertices without Cycles. Materials with unsupported nodes are baked")
+]
+
 units = [
     ("INCHES", "Inches", "", 1),
     ("CM", "Centimeters", "", 2)
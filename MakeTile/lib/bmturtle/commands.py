@@ -1,25 +1,31 @@
 from math import pi, radians
 import bpy
 import bmesh
-from .helpers import extrude_translate
+from mathutils import Vector
+from .helpers import extrude_translate, add_polyline
+from .turtle import Turtle, get_turtle, set_turtle, selection_changed
 
-def create_turtle(name, vert_groups=None):
+def create_turtle(name, vert_groups=None, turtle=None):
     """Creates a mesh object and associated bmesh to pass to bmturtle functions
 
+    The turtle becomes the one commands use when none is passed to them.
+
     Args:
         name (str): Object name
         vert_groups (list[str], optional): Names of vertex groups to create. Defaults to None.
+        turtle (Turtle, optional): Turtle to draw with. Defaults to a new turtle at the 3D cursor.
 
     Returns:
         tuple: bmesh, object
     """
-    turtle = bpy.context.scene.cursor
+    if turtle is None:
+        turtle = Turtle.from_cursor()
+    turtle.penstate = True
+    set_turtle(turtle)
+
     # create new empty turtle world
     mesh = bpy.data.meshes.new("mesh")
     obj = bpy.data.objects.new(name, mesh)
-    props = obj.mt_object_props
-    props.penstate = True
-    #obj['penstate'] = True
 
     # create vertex groups
     if vert_groups:
@@ -41,248 +47,275 @@ def create_turtle(name, vert_groups=None):
     return bm, obj
 
 
-def add_vert(bm):
+def add_vert(bm, turtle=None):
     """Add a vertice at the turtle location
 
     Args:
         bm (bmesh): bmesh
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    turtle = bpy.context.scene.cursor
+    if turtle is None:
+        turtle = get_turtle()
     vert = bmesh.ops.create_vert(bm, co=turtle.location)
     vert['vert'][0].select = True
 
 
-def pu(bm):
+def pu(bm, turtle=None):
     """Pen Up.
-    Deselect all verts and set bmesh owning object's penstate property to 'False'
+    Deselect all verts and set turtle's penstate to 'False'
 
     Args:
         bm (bmesh): bmesh
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
     for v in bm.verts:
         v.select_set(False)
     bm.select_flush(False)
+    selection_changed()
 
-    bpy.context.view_layer.objects.active.mt_object_props.penstate = False
-    # bpy.context.view_layer.objects.active['penstate'] = False
+    if turtle is None:
+        turtle = get_turtle()
+    turtle.penstate = False
 
 
-def pd(bm):
+def pd(bm, turtle=None):
     """Pen Down.
-    Deselect all verts and set bmesh owning object's penstate property to 'True'
+    Set turtle's penstate to 'True'
 
     Args:
         bm (bmesh): bmesh
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    bpy.context.view_layer.objects.active.mt_object_props.penstate = True
+    if turtle is None:
+        turtle = get_turtle()
+    turtle.penstate = True
 
 
-def fd(bm, distance, del_original=True):
+def fd(bm, distance, del_original=True, turtle=None):
     """Move Forward.
-    Moves turtle forward along its positive local y axis. If object's penstate is down (True) then also extrudes
+    Moves turtle forward along its positive local y axis. If turtle's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
 
     Args:
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    extrude_translate(bm, (0.0, distance, 0.0), del_original)
+    extrude_translate(bm, (0.0, distance, 0.0), del_original, turtle=turtle)
 
 
-def bk(bm, distance, del_original=True):
+def bk(bm, distance, del_original=True, turtle=None):
     """Move Backward.
-    Moves turtle backward along its negative local y axis. If object's penstate is down (True) then also extrudes
+    Moves turtle backward along its negative local y axis. If turtle's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
 
     Args:
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    extrude_translate(bm, (0.0, -distance, 0.0), del_original)
+    extrude_translate(bm, (0.0, -distance, 0.0), del_original, turtle=turtle)
 
 
-def up(bm, distance, del_original=True):
+def up(bm, distance, del_original=True, turtle=None):
     """Move Up.
-    Moves turtle up along its positive local z axis. If object's penstate is down (True) then also extrudes
+    Moves turtle up along its positive local z axis. If turtle's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
 
     Args:
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    extrude_translate(bm, (0.0, 0.0, distance), del_original)
+    extrude_translate(bm, (0.0, 0.0, distance), del_original, turtle=turtle)
 
 
-def dn(bm, distance, del_original=True):
+def dn(bm, distance, del_original=True, turtle=None):
     """Move Down.
-    Moves turtle down along its negative local z axis. If object's penstate is down (True) then also extrudes
+    Moves turtle down along its negative local z axis. If turtle's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
 
     Args:
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    extrude_translate(bm, (0.0, 0.0, -distance), del_original)
+    extrude_translate(bm, (0.0, 0.0, -distance), del_original, turtle=turtle)
 
 
-def ri(bm, distance, del_original=True):
+def ri(bm, distance, del_original=True, turtle=None):
     """Move Right.
-    Moves turtle right along its positive local x axis. If object's penstate is down (True) then also extrudes
+    Moves turtle right along its positive local x axis. If turtle's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
 
     Args:
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    extrude_translate(bm, (distance, 0.0, 0.0), del_original)
+    extrude_translate(bm, (distance, 0.0, 0.0), del_original, turtle=turtle)
 
 
-def lf(bm, distance, del_original=True):
+def lf(bm, distance, del_original=True, turtle=None):
     """Move Left.
-    Moves turtle left along its negative local x axis. If object's penstate is down (True) then also extrudes
+    Moves turtle left along its negative local x axis. If turtle's penstate is down (True) then also extrudes
     any selected vaerts / edges / faces
 
     Args:
         bm (bmesh): bmesh
         distance (float): distance
         del_original (bool, optional): Whether to delete original faces when extruding. Defaults to True.
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    extrude_translate(bm, (-distance, 0.0, 0.0), del_original)
+    extrude_translate(bm, (-distance, 0.0, 0.0), del_original, turtle=turtle)
 
 
-def ylf(degrees):
+def ylf(degrees, turtle=None):
     """Yaw Left.
     Rotates the turtlke around the y axis.
 
     Args:
-        degrees ([type]): [description]
+        degrees (float): degrees
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    yri(-degrees)
+    yri(-degrees, turtle)
 
 
-def yri(degrees):
+def yri(degrees, turtle=None):
     """Yaw Right.
     Rotates the turtle around the y axis.
 
     Args:
-        degrees ([type]): [description]
+        degrees (float): degrees
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    turtle = bpy.context.scene.cursor
-    turtle.rotation_euler = (
-        turtle.rotation_euler[0],
-        turtle.rotation_euler[1] + radians(degrees),
-        turtle.rotation_euler[2])
+    if turtle is None:
+        turtle = get_turtle()
+    turtle.rotation_euler[1] += radians(degrees)
 
 
-def ptu(degrees):
+def ptu(degrees, turtle=None):
     """Pitch Up.
     Rotates the turtle around the X axis.
 
     Args:
         degrees (float): degrees
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    turtle = bpy.context.scene.cursor
-    turtle.rotation_euler = (
-        turtle.rotation_euler[0] + radians(degrees),
-        turtle.rotation_euler[1],
-        turtle.rotation_euler[2])
+    if turtle is None:
+        turtle = get_turtle()
+    turtle.rotation_euler[0] += radians(degrees)
 
-def ptd(degrees):
+def ptd(degrees, turtle=None):
     """Pitch Up.
     Rotates the turtle around the Y axis.
 
     Args:
         degrees (float): degrees
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    ptu(-degrees)
+    ptu(-degrees, turtle)
 
-def lt(degrees):
+def lt(degrees, turtle=None):
     """Left turn.
     Rotates the turtle left around its Z axis
 
     Args:
         degrees (float): degrees
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    turtle = bpy.context.scene.cursor
-    turtle.rotation_euler = (
-        turtle.rotation_euler[0],
-        turtle.rotation_euler[1],
-        turtle.rotation_euler[2] + radians(degrees))
+    if turtle is None:
+        turtle = get_turtle()
+    turtle.rotation_euler[2] += radians(degrees)
 
 
-def rt(degrees):
+def rt(degrees, turtle=None):
     """Right turn.
     Rotates the turtle right around its Z axis
 
     Args:
         degrees (float): degrees
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    lt(-degrees)
+    lt(-degrees, turtle)
 
 
-def arc(bm, radius, degrees, segments):
+def arc(bm, radius, degrees, segments, turtle=None):
     """Draw and arc centered on the turtle.
 
+    Vert locations are worked out the same way moving the turtle along the
+    arc would and the verts and edges are then created in one go.
+    Leaves the turtle where it started with its pen up.
+
     Args:
         radius (float): radius
         degrees (float): degrees of arc to draw
         segments (int): number of segments to draw
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
+
+    Returns:
+        list[bmesh.edges]: new edges
     """
     circ = 2 * pi * radius
     seg_length = circ / ((360 / degrees) * segments)
     rotation = degrees / segments
 
-    turtle = bpy.context.scene.cursor
-    start_loc = turtle.location.copy()
-    start_rot = turtle.rotation_euler.copy()
+    if turtle is None:
+        turtle = get_turtle()
+    pu(bm, turtle)
 
-    pu(bm)
-    edges = [e for e in bm.edges]
-    fd(bm, radius)
-    add_vert(bm)
-    pd(bm)
-    rt(90)
-    rt(rotation / 2)
+    loc = turtle.location.copy()
+    rot = turtle.rotation_euler.copy()
+    loc += rot.to_matrix() @ Vector((0.0, radius, 0.0))
+    rot[2] += radians(-90)
+    rot[2] += radians(-(rotation / 2))
 
+    coords = [loc.copy()]
+    step = Vector((0.0, seg_length, 0.0))
+    turn = radians(-rotation)
     i = 0
     while i < segments:
-        fd(bm, seg_length)
-        rt(rotation)
-
+        loc += rot.to_matrix() @ step
+        coords.append(loc.copy())
+        rot[2] += turn
         i += 1
 
-    pu(bm)
+    verts, edges = add_polyline(bm, coords)
+    return edges
 
-    turtle.location = start_loc
-    turtle.rotation_euler = start_rot
-    return [e for e in bm.edges if e not in edges]
 
-def home(obj):
+def home(obj, turtle=None):
     """Home turtle.
     Returns the turtle to its parent object's origin
 
     Args:
         obj (bpy.types.Object): parent object
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    turtle = bpy.context.scene.cursor
+    if turtle is None:
+        turtle = get_turtle()
     turtle.location = obj.location
     turtle.rotation_euler = obj.rotation_euler
 
 
-def finalise_turtle(bm, obj):
+def finalise_turtle(bm, obj, sync_cursor=False):
     """Copy bmesh to object and free bmesh
 
     Args:
         bm (bmesh): bmesh
         obj (bpy.types.Object): object
+        sync_cursor (bool, optional): Move the 3D cursor to the turtle. Defaults to False.
     """
     # Make face normals consitent
     bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
     mesh = obj.data
     bm.to_mesh(mesh)
     bm.free()
+
+    if sync_cursor:
+        get_turtle().sync_cursor()
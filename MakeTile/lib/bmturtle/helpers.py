@@ -1,9 +1,13 @@
-from math import inf, tan, radians, acos, pi, modf
+from math import inf, tan, radians, pi, modf, ceil
+from heapq import heappush, heappop
+from itertools import compress
+import numpy as np
 import bmesh
 import bpy
-from mathutils import Vector, geometry
+from mathutils import Vector, Matrix, geometry, kdtree
 from mathutils.bvhtree import BVHTree
-from ..utils.selection import in_bbox
+from ..utils.selection import in_bbox_mask, bm_vert_coords
+from .turtle import get_turtle, selection_changed
 
 def bmesh_array(
     source_obj=None,
@@ -23,6 +27,7 @@ def bmesh_array(
 
     Produces a bmesh that has the modifier applied. This is much faster
     than calling depsgraph_update_get() on scenes with more than a few polys.
+    When merging, only verts on the seams between copies and caps are merged.
 
     Args:
         source_obj (bpy.types.Object): Source object to generate bmesh from. Defaults to None.
@@ -70,50 +75,115 @@ def bmesh_array(
         bm = bmesh.new()
         bm.from_mesh(mesh)
 
-    source_geom = bm.verts[:] + bm.edges[:] + bm.faces[:]
-
-    i = 0
-    while i < count:
-        ret = bmesh.ops.duplicate(
+    space = source_obj.matrix_world
+    # per copy offset in bmesh space, as applied by translate
+    delta = (space.inverted() @ Matrix.Translation(offset) @ space) @ Vector()
+
+    source_coords = [v.co.copy() for v in bm.verts]
+    num_verts = len(bm.verts)
+    num_edges = len(bm.edges)
+    num_faces = len(bm.faces)
+
+    # Duplicate all copies made so far in each pass so we only need
+    # log2(count) duplicate calls. Copies keep the source element order so
+    # copy k's verts are bm.verts[k * num_verts:(k + 1) * num_verts]
+    num_copies = max(0, ceil(count)) + 1
+    made = 1
+    while made < num_copies:
+        batch = min(made, num_copies - made)
+        bm.verts.ensure_lookup_table()
+        bm.edges.ensure_lookup_table()
+        bm.faces.ensure_lookup_table()
+        bmesh.ops.duplicate(
             bm,
-            geom=source_geom)
-        geom=ret["geom"]
-        dupe_verts = [ele for ele in geom if isinstance(ele, bmesh.types.BMVert)]
-        del ret
-
+            geom=bm.verts[:batch * num_verts]
+            + bm.edges[:batch * num_edges]
+            + bm.faces[:batch * num_faces])
+        bm.verts.ensure_lookup_table()
         bmesh.ops.translate(
             bm,
-            verts=dupe_verts,
-            vec=offset * (i + 1),
-            space=source_obj.matrix_world)
-        i += 1
+            verts=bm.verts[made * num_verts:],
+            vec=offset * made,
+            space=space)
+        made += batch
+
+    bm.verts.ensure_lookup_table()
+    array_verts = bm.verts[:]
+    targetmap = {}
+
+    if use_merge_vertices and num_verts:
+        kd = kdtree.KDTree(num_verts)
+        for i, co in enumerate(source_coords):
+            kd.insert(co, i)
+        kd.balance()
+
+        # copies are translations of each other so the seam is the same
+        # between every pair of neighbours
+        seam = {}
+        for i, co in enumerate(source_coords):
+            _, j, dist = kd.find(co + delta)
+            if dist is not None and dist <= merge_threshold:
+                seam[i] = j
+
+        # map seam verts to the vert they end up merged with
+        first_roots = list(range(num_verts))
+        roots = first_roots
+        for copy in range(1, num_copies):
+            start = copy * num_verts
+            prev_roots = roots
+            roots = list(range(start, start + num_verts))
+            for i, j in seam.items():
+                roots[i] = prev_roots[j]
+                targetmap[array_verts[start + i]] = array_verts[roots[i]]
+    else:
+        kd = None
 
     if start_cap:
-        me_2 = start_cap.data
-        bm.from_mesh(me_2)
+        cap_start = len(bm.verts)
+        bm.from_mesh(start_cap.data)
+        if kd is not None:
+            bm.verts.ensure_lookup_table()
+            _cap_targetmap(
+                bm.verts[cap_start:], array_verts, first_roots, kd, merge_threshold, targetmap)
 
     if end_cap:
-        me_3 = end_cap.data
-        bm_2 = bmesh.new()
-        bm_2.from_mesh(me_3)
+        cap_start = len(bm.verts)
+        bm.from_mesh(end_cap.data)
+        bm.verts.ensure_lookup_table()
+        cap_verts = bm.verts[cap_start:]
+        if kd is not None:
+            # match before moving the cap so it lines up with the source
+            _cap_targetmap(
+                cap_verts, array_verts, roots, kd, merge_threshold, targetmap)
         bmesh.ops.translate(
-            bm_2,
-            verts=bm_2.verts,
+            bm,
+            verts=cap_verts,
             vec=offset * count,
-            space=source_obj.matrix_world)
+            space=space)
 
-        # create temp mesh because copying from one bmesh to another is fubared
-        temp = bpy.data.meshes.new("temp")
-        bm_2.to_mesh(temp)
-        bm_2.free()
-        bm.from_mesh(temp)
-        bpy.data.meshes.remove(temp)
-
-    if use_merge_vertices:
-        bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=merge_threshold)
+    if targetmap:
+        bmesh.ops.weld_verts(bm, targetmap=targetmap)
 
     return bm
 
+
+def _cap_targetmap(cap_verts, array_verts, roots, kd, threshold, targetmap):
+    """Add cap verts that overlap an array copy to a weld_verts targetmap.
+
+    Args:
+        cap_verts (list[bmesh.verts]): cap verts, positioned relative to the source
+        array_verts (list[bmesh.verts]): verts of all array copies
+        roots (list[int]): index in array_verts each vert of the copy merges into
+        kd (mathutils.kdtree.KDTree): KDTree of source vert locations
+        threshold (float): merge distance
+        targetmap (dict{bmesh.verts: bmesh.verts}): targetmap to add to
+    """
+    for v in cap_verts:
+        _, index, dist = kd.find(v.co)
+        if dist is not None and dist <= threshold:
+            targetmap[v] = array_verts[roots[index]]
+
+
 def bm_select_all(bm):
     """Select all verts.
 
@@ -123,6 +193,7 @@ def bm_select_all(bm):
     for v in bm.verts:
         v.select_set(True)
     bm.select_flush(True)
+    selection_changed()
 
 
 def bm_deselect_all(bm):
@@ -134,9 +205,87 @@ def bm_deselect_all(bm):
     for v in bm.verts:
         v.select_set(False)
     bm.select_flush(False)
+    selection_changed()
+
+
+class BoxIndex:
+    """Answers bounding box queries against a snapshot of a bmesh's verts.
+
+    Building the index costs one pass over the bmesh so pass one to
+    select_verts_in_bounds and select_edges_in_bounds when making several
+    queries against the same mesh. Verts are sorted along x so each query only
+    tests the verts inside the box's x range.
 
+    The snapshot isn't updated so build a new index after adding, removing
+    or moving verts.
+
+    Args:
+        bm (bmesh): bmesh
+    """
 
-def select_verts_in_bounds(lbound, ubound, buffer, bm):
+    def __init__(self, bm):
+        self.bm = bm
+        self.verts = list(bm.verts)
+        self.coords = bm_vert_coords(bm)
+        self.order = np.argsort(self.coords[:, 0], kind='stable')
+        self.sorted_x = self.coords[self.order, 0]
+        self._edges = None
+        self._edge_verts = None
+
+    def is_valid(self, bm):
+        """Return whether the index can be used for bm.
+
+        Args:
+            bm (bmesh): bmesh
+
+        Returns:
+            bool: True if the index was built for bm and its vert count is unchanged
+        """
+        return self.bm is bm and len(bm.verts) == len(self.verts)
+
+    def verts_in_bounds(self, lbound, ubound, buffer):
+        """Return a mask of which verts are within a cubical boundary.
+
+        Args:
+            lbound (tuple[3]): Lower left corner of bounds
+            ubound (tuple[3]): Upper right corner of bounds
+            buffer (float): Buffer around bbox
+
+        Returns:
+            numpy.ndarray[bool]: mask in bm.verts order
+        """
+        start = np.searchsorted(self.sorted_x, lbound[0] - buffer, side='left')
+        end = np.searchsorted(self.sorted_x, ubound[0] + buffer, side='right')
+        candidates = self.order[start:end]
+        inside = in_bbox_mask(lbound, ubound, self.coords[candidates], buffer)
+        mask = np.zeros(len(self.verts), dtype=bool)
+        mask[candidates[inside]] = True
+        return mask
+
+    def edges_in_bounds(self, lbound, ubound, buffer):
+        """Return the edges and a mask of which are within a cubical boundary.
+
+        Args:
+            lbound (tuple[3]): Lower left corner of bounds
+            ubound (tuple[3]): Upper right corner of bounds
+            buffer (float): Buffer around bbox
+
+        Returns:
+            list[bmesh.edges]: edges
+            numpy.ndarray[bool]: mask in edges order
+        """
+        if self._edges is None:
+            self.bm.verts.index_update()
+            self._edges = list(self.bm.edges)
+            self._edge_verts = np.fromiter(
+                (v.index for e in self._edges for v in e.verts),
+                dtype=np.int64,
+                count=len(self._edges) * 2).reshape(-1, 2)
+        vert_mask = self.verts_in_bounds(lbound, ubound, buffer)
+        return self._edges, vert_mask[self._edge_verts].all(axis=1)
+
+
+def select_verts_in_bounds(lbound, ubound, buffer, bm, index=None, select=True):
     """Select vertices within cubical boundary.
 
     Args:
@@ -144,26 +293,133 @@ def select_verts_in_bounds(lbound, ubound, buffer, bm):
         ubound (tuble[3]): Upper left corner of bounds
         buffer (float): Buffer around bbox
         bm (bmesh): bmesh
+        index (BoxIndex, optional): index of bm to reuse. Defaults to a new index.
+        select (bool, optional): Select verts within bounds and deselect the rest. Defaults to True.
 
     Returns:
         list[bmesh.verts]: List of verts
     """
-    vert_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = [in_bbox(lbound, ubound, v, buffer) for v in vert_coords]
+    if index is None or not index.is_valid(bm):
+        index = BoxIndex(bm)
+    to_select = index.verts_in_bounds(lbound, ubound, buffer)
+
+    if select:
+        for vert, in_bounds in zip(index.verts, to_select.tolist()):
+            vert.select = in_bounds
+        selection_changed()
+
+    return list(compress(index.verts, to_select))
+
+def select_edges_in_bounds(lbound, ubound, buffer, bm, index=None):
+    if index is None or not index.is_valid(bm):
+        index = BoxIndex(bm)
+    edges, to_select = index.edges_in_bounds(lbound, ubound, buffer)
+    for edge_obj, select in zip(edges, to_select.tolist()):
+        edge_obj.select = select
+    selection_changed()
+    return list(compress(edges, to_select))
 
-    for vert, select in zip(bm.verts, to_select):
-        vert.select = select
+def add_polyline(bm, coords, cyclic=False):
+    """Add a chain of verts joined by edges.
 
-    return [v for v in bm.verts if v.select]
+    Creates the geometry directly rather than by extruding so is much
+    cheaper than moving the turtle once per segment.
+
+    Args:
+        bm (bmesh): bmesh
+        coords (list[Vector]): vert locations in order
+        cyclic (bool, optional): Join the last vert to the first. Defaults to False.
+
+    Returns:
+        list[bmesh.verts]: new verts
+        list[bmesh.edges]: new edges
+    """
+    new_vert = bm.verts.new
+    new_edge = bm.edges.new
+    verts = [new_vert(co) for co in coords]
+    edges = [new_edge(pair) for pair in zip(verts, verts[1:])]
+    if cyclic and len(verts) > 2:
+        edges.append(new_edge((verts[-1], verts[0])))
+
+    # new elements have no index but bmesh ops leave them indexed and
+    # callers rely on that
+    bm.verts.index_update()
+    bm.edges.index_update()
+    return verts, edges
+
+
+class PointClassifier:
+    """Tests whether points are inside an arbitrary manifold bmesh.
+
+    Builds a BVH of the bmesh once so it can be queried several times, including
+    against moved or mirrored copies of the bmesh by passing a matrix to contains().
+
+    By default a point is inside if it is behind the nearest face. This is fast but
+    can give false positives on low poly meshes. robust mode instead counts how
+    many times rays cast from the point cross the surface.
+
+    Args:
+        bm (bMesh): a manifold bmesh with verts and (edge/faces) for which the normals are calculated already. (add bm.normal_update() otherwise)
+        robust (bool, optional): use ray parity. Defaults to False.
+        epsilon (float, optional): BVH epsilon. Ignored in robust mode. Defaults to 0.001.
+    """
+
+    # skewed so rays don't run along the edges or through the corners
+    # of axis aligned meshes
+    ray_directions = (
+        Vector((1, 2, 3)).normalized(),
+        Vector((-3, 1, 2)).normalized(),
+        Vector((2, -3, 1)).normalized())
+
+    def __init__(self, bm, robust=False, epsilon=0.001):
+        # epsilon widens rays so would make them hit the same face repeatedly
+        self.bvh = BVHTree.FromBMesh(bm, epsilon=0.0 if robust else epsilon)
+        self.robust = robust
+
+    def contains(self, coords, matrix=None):
+        """Return a mask of which points are inside the bmesh.
+
+        Args:
+            coords (numpy.ndarray | list[Vector / tuples /list]): N x 3 point coordinates
+            matrix (Matrix, optional): transforms coords into the bmesh's space. Defaults to None.
+
+        Returns:
+            numpy.ndarray[bool]: a mask that is True if the point is inside the bmesh, False otherwise
+        """
+        points = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        if matrix is not None:
+            matrix = np.array(matrix, dtype=np.float64)
+            points = points @ matrix[:3, :3].T + matrix[:3, 3]
+
+        if self.robust:
+            inside = self._ray_parity
+            return np.fromiter(
+                (inside(Vector(co)) for co in points), dtype=bool, count=len(points))
+
+        find_nearest = self.bvh.find_nearest
+        nearest = np.empty((len(points), 6))
+        for i, co in enumerate(points):
+            fco, normal, _, _ = find_nearest(co)
+            nearest[i, :3] = fco
+            nearest[i, 3:] = normal
+        # point is inside if it's behind the nearest face
+        return np.einsum('ij,ij->i', nearest[:, :3] - points, nearest[:, 3:]) >= 0.0
+
+    def _ray_parity(self, co):
+        ray_cast = self.bvh.ray_cast
+        votes = 0
+        for direction in self.ray_directions:
+            hits = 0
+            origin = co
+            while True:
+                loc, _, _, _ = ray_cast(origin, direction)
+                if loc is None:
+                    break
+                hits += 1
+                origin = loc + direction * 0.00001
+            votes += hits % 2
+        return votes >= 2
 
-def select_edges_in_bounds(lbound, ubound, buffer, bm):
-    vert_coords = []
-    [vert_coords.append([v.co.to_tuple()for v in e.verts]) for e in bm.edges]
-    to_select = []
-    [to_select.append(all(in_bbox(lbound, ubound, v, buffer)for v in e)) for e in vert_coords]
-    for edge_obj, select in zip(bm.edges, to_select):
-        edge_obj.select = select
-    return [e for e in bm.edges if e.select]
 
 def points_are_inside_bmesh(coords, bm):
     """Test whether points are inside an arbitrary manifold bmesh.
@@ -174,22 +430,7 @@ def points_are_inside_bmesh(coords, bm):
     Returns:
         list[bool]: a mask list with True if the point is inside the bmesh, False otherwise
     """
-    coord_mask = []
-    addp = coord_mask.append
-    bvh = BVHTree.FromBMesh(bm, epsilon=0.001)
-
-    # return points on polygons
-    for co in coords:
-        fco, normal, _, _ = bvh.find_nearest(co)
-        p2 = fco - Vector(co)
-        v = p2.dot(normal)
-        # angle = acos(min(max(v, -1), 1)) * 180 / pi
-        # addp(angle > 90 + tolerance)
-        # addp(not v < 0.0)  # addp(v >= 0.0) ?
-        # addp(v >= 0.0)
-        addp(v >= 0.0)
-
-    return coord_mask
+    return PointClassifier(bm).contains(coords).tolist()
 
 
 def assign_verts_to_group(verts, obj, deform_groups, group_name):
@@ -208,101 +449,130 @@ def assign_verts_to_group(verts, obj, deform_groups, group_name):
             groups = v[deform_groups]
             groups[group_index] = 1
 
-def extrude_translate(bm, local_trans, del_original=True, extrude=True):
+def extrude_translate(bm, local_trans, del_original=True, extrude=True, turtle=None):
     """Extrudes and translates selected verts, edges or faces
 
     Args:
         bm (bmesh): bmesh
         local_trans (Vector[3]): Local transform vector
         del_original (bool, optional): Whether to delete original faces. Defaults to True.
+        extrude (bool, optional): Whether to extrude or just translate. Defaults to True.
+        turtle (Turtle, optional): turtle. Defaults to active turtle.
     """
-    # use cursor as turtle
-    turtle = bpy.context.scene.cursor
+    if turtle is None:
+        turtle = get_turtle()
 
     # work out transform in turtle's local space and convert to global
     local_trans = Vector(local_trans)
-    world_trans = turtle.matrix.to_3x3() @ local_trans
-    turtle.location = turtle.matrix.translation + world_trans
+    world_trans = turtle.rotation_euler.to_matrix() @ local_trans
+    turtle.location += world_trans
+
+    if turtle.penstate is not True:
+        return
 
-    if bpy.context.view_layer.objects.active.mt_object_props.penstate is True:
+    active = turtle.get_active(bm)
+    if active is None:
+        # fall back to the selection
+        bm.select_flush(True)
         if bm.select_mode == {'VERT'}:
-            bm.select_flush(True)
-            # get selected verts
-            selected = [v for v in bm.verts if v.select]
-            if extrude:
-                ret = bmesh.ops.extrude_vert_indiv(bm, verts=selected)
-                verts = ret['verts']
-                # translate along turtle's local Y
-                bmesh.ops.translate(bm, vec=(world_trans), verts=verts)
-
-                # deselect original verts
-                for v in bm.verts:
-                    v.select_set(False)
-                bm.select_flush(False)
-
-                # select extruded verts
-                for v in verts:
-                    v.select_set(True)
-                bm.select_flush(True)
-            else:
-                verts = selected
-                bmesh.ops.translate(bm, vec=(world_trans), verts=verts)
-
-
-        if bm.select_mode == {'EDGE'}:
-            bm.select_flush(True)
-            selected = [e for e in bm.edges if e.select]
-            if extrude:
-                ret = bmesh.ops.extrude_edge_only(bm, edges=selected)
-                geom = ret["geom"]
-                edges = [e for e in geom
-                        if isinstance(e, bmesh.types.BMEdge)]
-                verts = [v for v in geom
-                        if isinstance(v, bmesh.types.BMVert)]
-
-                bmesh.ops.translate(bm, vec=(world_trans), verts=verts)
-
-                # deselect original edges
-                for e in bm.edges:
-                    e.select_set(False)
-                for v in bm.verts:
-                    v.select_set(False)
-                bm.select_flush(False)
-
-                # select extruded edges
-                for e in edges:
-                    e.select_set(True)
-                bm.select_flush(True)
+            active = [v for v in bm.verts if v.select]
+        elif bm.select_mode == {'EDGE'}:
+            active = [e for e in bm.edges if e.select]
+        elif bm.select_mode == {'FACE'}:
+            active = [f for f in bm.faces if f.select]
+        else:
+            return
+        if not extrude:
+            # only translating so selection is left alone
+            if bm.select_mode == {'VERT'}:
+                verts = active
             else:
-                bmesh.ops.translate(bm, vec=(world_trans), verts = [v for v in bm.verts if v.select])
+                verts = [v for v in bm.verts if v.select]
+            bmesh.ops.translate(bm, vec=(world_trans), verts=verts)
+            turtle.set_active(bm, active)
+            return
+        old_verts = None
+    elif not extrude:
+        bmesh.ops.translate(bm, vec=(world_trans), verts=_active_verts(active))
+        return
+    else:
+        old_verts = _active_verts(active)
+
+    if bm.select_mode == {'VERT'}:
+        ret = bmesh.ops.extrude_vert_indiv(bm, verts=active)
+        new_active = ret['verts']
+        verts = new_active
+    elif bm.select_mode == {'EDGE'}:
+        ret = bmesh.ops.extrude_edge_only(bm, edges=active)
+        geom = ret["geom"]
+        new_active = [e for e in geom
+                      if isinstance(e, bmesh.types.BMEdge)]
+        verts = [v for v in geom
+                 if isinstance(v, bmesh.types.BMVert)]
+    else:
+        ret = bmesh.ops.extrude_face_region(bm, geom=active)
+        geom = ret["geom"]
+        new_active = [f for f in geom
+                      if isinstance(f, bmesh.types.BMFace)]
+        verts = [v for v in geom
+                 if isinstance(v, bmesh.types.BMVert)]
+
+    # translate along turtle's local axis
+    bmesh.ops.translate(bm, vec=(world_trans), verts=verts)
+
+    if bm.select_mode == {'FACE'} and del_original is True:
+        bmesh.ops.delete(bm, geom=active, context='FACES')
+
+    # deselect original geometry
+    if old_verts is None:
+        bm_deselect_all(bm)
+    else:
+        _deselect_verts(old_verts)
 
-        if bm.select_mode == {'FACE'}:
-            bm.select_flush(True)
-            sel_f = [f for f in bm.faces if f.select]
-            if extrude:
-                ret = bmesh.ops.extrude_face_region(bm, geom=sel_f)
-                geom = ret["geom"]
+    # select extruded geometry
+    for ele in new_active:
+        ele.select_set(True)
+    if bm.select_mode != {'FACE'}:
+        _flush_selected_verts(verts)
 
-                faces = [f for f in geom
-                        if isinstance(f, bmesh.types.BMFace)]
-                edges = [e for e in geom
-                        if isinstance(e, bmesh.types.BMEdge)]
-                verts = [v for v in geom
-                        if isinstance(v, bmesh.types.BMVert)]
+    turtle.set_active(bm, new_active)
 
-                bmesh.ops.translate(bm, vec=(world_trans), verts=verts)
 
-                if del_original is True:
-                    bmesh.ops.delete(bm, geom=sel_f, context='FACES')
+def _active_verts(active):
+    """Return the verts used by a list of verts, edges or faces."""
+    if not active or isinstance(active[0], bmesh.types.BMVert):
+        return active
+    return list({v for ele in active for v in ele.verts})
 
-                # deselect original faces and edges
-                bm_deselect_all(bm)
 
-                # select extruded faces
-                for f in faces:
-                    f.select_set(True)
-            else:
-                bmesh.ops.translate(bm, vec=(world_trans), verts=[v for v in bm.verts if v.select])
+def _deselect_verts(verts):
+    """Deselect verts and any edges and faces that use them.
+
+    Equivalent to deselecting the verts and calling select_flush(False) but only
+    touches the geometry around them.
+    """
+    for v in verts:
+        if v.is_valid:
+            v.select_set(False)
+            for e in v.link_edges:
+                e.select_set(False)
+            for f in v.link_faces:
+                f.select_set(False)
+
+
+def _flush_selected_verts(verts):
+    """Select edges and faces around verts whose verts are all selected.
+
+    Equivalent to select_flush(True) but only touches the geometry around verts.
+    """
+    for v in verts:
+        for e in v.link_edges:
+            if not e.select and all(ev.select for ev in e.verts):
+                e.select_set(True)
+        for f in v.link_faces:
+            if not f.select and all(fv.select for fv in f.verts):
+                f.select_set(True)
+
 
 # https://blender.stackexchange.com/questions/186067/what-is-the-bmesh-equivalent-to-bpy-ops-mesh-shortest-path-select
 class Node:
@@ -313,56 +583,98 @@ class Node:
         dict{vert: BMVert, length: float, shortest_path: list[BMEdge]}: Dict giving shortest path \
         between two verts
     """
-    @property
-    def edges(self):
-        return (e for e in self.vert.link_edges if not e.tag)
-
-    def __init__(self, v):
+    def __init__(self, v, length=inf, edge=None, prev=None):
         self.vert = v
-        self.length = inf
-        self.shortest_path = []
+        self.length = length
+        self.edge = edge
+        self.prev = prev
 
+    @property
+    def shortest_path(self):
+        path = []
+        node = self
+        while node.edge is not None:
+            path.append(node.edge)
+            node = node.prev
+        path.reverse()
+        return path
 
-def bm_shortest_path(bm, v_start, v_target=None):
-    """Return shortest path between two verts.
 
-    Args:
-        bm (bmesh): bmesh
-        v_start (bmesh.vert): start vert
-        v_target (bmesh.vert, optional): end vert. Defaults to None.
+class Nodes(dict):
+    """Nodes reached by bm_shortest_path, keyed by vert.
 
-    Returns:
-        dict{BMVert: Node}: Nodes
+    Verts that weren't reached return a node with an infinite length and no path.
     """
-    for e in bm.edges:
-        e.tag = False
+    def __missing__(self, v):
+        return Node(v)
 
-    d = {v : Node(v) for v in bm.verts}
-    node = d[v_start]
-    node.length = 0
 
-    visiting = [node]
+class BMeshGraph:
+    """Vert adjacency and edge lengths of a bmesh for bm_shortest_path.
 
-    while visiting:
-        node = visiting.pop(0)
+    Build once and pass to bm_shortest_path to run several queries on
+    a bmesh without recalculating them. Only valid while the bmesh's
+    geometry is unchanged.
 
-        if node.vert is v_target:
-            return d
+    Args:
+        bm (bmesh): bmesh
+    """
+    def __init__(self, bm):
+        bm.verts.index_update()
+        self.verts = list(bm.verts)
+        self.links = [
+            [(e.other_vert(v).index, e, e.calc_length()) for e in v.link_edges]
+            for v in self.verts]
 
-        for e in node.edges:
-            e.tag = True
-            length = node.length + e.calc_length()
-            v = e.other_vert(node.vert)
 
-            visit = d[v]
-            visiting.append(visit)
-            if visit.length > length:
-                visit.length = length
-                visit.shortest_path = node.shortest_path + [e]
+def bm_shortest_path(bm, v_start, v_target=None, graph=None):
+    """Return shortest path between two verts.
 
-        visiting.sort(key=lambda n: n.length)
+    Args:
+        bm (bmesh): bmesh
+        v_start (bmesh.vert): start vert
+        v_target (bmesh.vert, optional): end vert. Defaults to None.
+        graph (BMeshGraph, optional): graph of bm to reuse. Defaults to None.
 
-    return d
+    Returns:
+        dict{BMVert: Node}: Nodes
+    """
+    if graph is None:
+        graph = BMeshGraph(bm)
+    verts = graph.verts
+    links = graph.links
+
+    start = v_start.index
+    target = v_target.index if v_target is not None else None
+    lengths = {start: 0}
+    nodes = Nodes()
+    nodes[v_start] = Node(v_start, 0)
+    done = set()
+
+    # counter breaks ties between equal lengths in the order they were found
+    counter = 0
+    heap = [(0, counter, start)]
+    while heap:
+        length, _, index = heappop(heap)
+        if index in done:
+            continue
+        done.add(index)
+        if index == target:
+            break
+
+        node = nodes[verts[index]]
+        for other, e, edge_length in links[index]:
+            if other in done:
+                continue
+            new_length = length + edge_length
+            if new_length < lengths.get(other, inf):
+                lengths[other] = new_length
+                v = verts[other]
+                nodes[v] = Node(v, new_length, e, node)
+                counter += 1
+                heappush(heap, (new_length, counter, other))
+
+    return nodes
 
 
 def add_vertex_to_intersection(bm, edges):
@@ -378,6 +690,7 @@ def add_vertex_to_intersection(bm, edges):
             bm.verts.ensure_lookup_table()
 
             bm.verts[-1].select = True
+            selection_changed()
 
 
 def calculate_corner_wall_triangles(
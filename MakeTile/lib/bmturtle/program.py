@@ -0,0 +1,278 @@
+from collections import OrderedDict, namedtuple
+import bpy
+import bmesh
+from mathutils import Matrix
+from . import commands
+from .helpers import bm_select_all, bm_deselect_all
+from .turtle import Turtle, set_turtle
+
+# Compiled programs are stored as flat lists ready for foreach_set so a
+# cache hit never touches bmesh and survives undo, which invalidates
+# references to mesh datablocks.
+CompiledProgram = namedtuple(
+    'CompiledProgram',
+    ['coords', 'edges', 'loop_verts', 'loop_edges', 'loop_starts', 'loop_totals', 'marks'])
+
+_cache = OrderedDict()
+_cache_size = 64
+
+
+class Program:
+    """A recorded sequence of bmturtle commands.
+
+    Programs record commands and their parameters rather than running them.
+    compile_program() runs a program with a turtle at the origin and build() uses
+    the result to create an object at the turtle, so unchanged programs are
+    only compiled once.
+
+    Commands are recorded with the same names and arguments as in commands.py
+    minus the bmesh and turtle. Methods return the program so calls can be chained.
+    """
+
+    def __init__(self):
+        self.steps = []
+
+    def _record(self, command, *args):
+        self.steps.append((command, args))
+        return self
+
+    def key(self):
+        """Return a hashable key identifying the program.
+
+        Returns:
+            tuple: key
+        """
+        return tuple(self.steps)
+
+    def add_vert(self):
+        return self._record('add_vert')
+
+    def pu(self):
+        return self._record('pu')
+
+    def pd(self):
+        return self._record('pd')
+
+    def fd(self, distance, del_original=True):
+        return self._record('fd', distance, del_original)
+
+    def bk(self, distance, del_original=True):
+        return self._record('bk', distance, del_original)
+
+    def up(self, distance, del_original=True):
+        return self._record('up', distance, del_original)
+
+    def dn(self, distance, del_original=True):
+        return self._record('dn', distance, del_original)
+
+    def ri(self, distance, del_original=True):
+        return self._record('ri', distance, del_original)
+
+    def lf(self, distance, del_original=True):
+        return self._record('lf', distance, del_original)
+
+    def ylf(self, degrees):
+        return self._record('ylf', degrees)
+
+    def yri(self, degrees):
+        return self._record('yri', degrees)
+
+    def ptu(self, degrees):
+        return self._record('ptu', degrees)
+
+    def ptd(self, degrees):
+        return self._record('ptd', degrees)
+
+    def lt(self, degrees):
+        return self._record('lt', degrees)
+
+    def rt(self, degrees):
+        return self._record('rt', degrees)
+
+    def arc(self, radius, degrees, segments):
+        return self._record('arc', radius, degrees, segments)
+
+    def select_mode(self, mode):
+        return self._record('select_mode', tuple(sorted(mode)))
+
+    def select_all(self):
+        return self._record('select_all')
+
+    def deselect_all(self):
+        return self._record('deselect_all')
+
+    def bridge_loops(self):
+        """Bridge all edge loops."""
+        return self._record('bridge_loops')
+
+    def contextual_create(self):
+        """Fill all verts with a face."""
+        return self._record('contextual_create')
+
+    def mark(self, name):
+        """Record the turtle's location under name.
+
+        Args:
+            name (str): name
+        """
+        return self._record('mark', name)
+
+
+_turtle_commands = {
+    'add_vert', 'pu', 'pd',
+    'fd', 'bk', 'up', 'dn', 'ri', 'lf',
+    'ylf', 'yri', 'ptu', 'ptd', 'lt', 'rt', 'arc'}
+
+_bm_commands = {
+    'add_vert', 'pu', 'pd',
+    'fd', 'bk', 'up', 'dn', 'ri', 'lf', 'arc'}
+
+
+def compile_program(program):
+    """Run a program with a turtle at the origin.
+
+    Results are cached by program so compiling an unchanged program just
+    returns the cached result.
+
+    Args:
+        program (Program): program
+
+    Returns:
+        CompiledProgram: mesh data and marks in turtle space
+    """
+    key = program.key()
+    try:
+        compiled = _cache[key]
+        _cache.move_to_end(key)
+        return compiled
+    except KeyError:
+        pass
+
+    compiled = _run(program)
+    _cache[key] = compiled
+    while len(_cache) > _cache_size:
+        _cache.popitem(last=False)
+    return compiled
+
+
+def _run(program):
+    bm = bmesh.new()
+    turtle = Turtle()
+    marks = {}
+
+    for command, args in program.steps:
+        if command in _turtle_commands:
+            func = getattr(commands, command)
+            if command in _bm_commands:
+                func(bm, *args, turtle=turtle)
+            else:
+                func(*args, turtle=turtle)
+        elif command == 'select_mode':
+            bm.select_mode = set(args[0])
+        elif command == 'select_all':
+            bm_select_all(bm)
+        elif command == 'deselect_all':
+            bm_deselect_all(bm)
+        elif command == 'bridge_loops':
+            bmesh.ops.bridge_loops(bm, edges=bm.edges)
+        elif command == 'contextual_create':
+            bmesh.ops.contextual_create(
+                bm,
+                geom=bm.verts,
+                mat_nr=0,
+                use_smooth=False)
+        elif command == 'mark':
+            marks[args[0]] = turtle.location.copy()
+
+    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+    bm.verts.index_update()
+    bm.edges.index_update()
+
+    coords = [c for v in bm.verts for c in v.co]
+    edges = [v.index for e in bm.edges for v in e.verts]
+    loop_verts = []
+    loop_edges = []
+    loop_starts = []
+    loop_totals = []
+    for f in bm.faces:
+        loop_starts.append(len(loop_verts))
+        loop_totals.append(len(f.loops))
+        for loop in f.loops:
+            loop_verts.append(loop.vert.index)
+            loop_edges.append(loop.edge.index)
+    bm.free()
+
+    return CompiledProgram(
+        coords, edges, loop_verts, loop_edges, loop_starts, loop_totals, marks)
+
+
+def build(program, name, turtle=None):
+    """Create an object from a program, drawn at the turtle.
+
+    Equivalent to running the program's commands between create_turtle and
+    finalise_turtle but reuses the cached result when the program has been
+    compiled before.
+
+    Args:
+        program (Program): program
+        name (str): object name
+        turtle (Turtle, optional): turtle to draw at. Defaults to a new turtle at the 3D cursor.
+
+    Returns:
+        bpy.types.Object: object
+        dict{str: Vector}: world locations of the program's marks
+    """
+    if turtle is None:
+        turtle = Turtle.from_cursor()
+    compiled = compile_program(program)
+
+    mesh = bpy.data.meshes.new("mesh")
+    _fill_mesh(mesh, compiled)
+    matrix = turtle.matrix
+    if matrix != Matrix.Identity(4):
+        mesh.transform(matrix)
+    mesh.update()
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.layer_collection.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+
+    # leave the turtle where running the program and homing would have
+    set_turtle(turtle)
+    commands.home(obj, turtle)
+
+    marks = {key: matrix @ loc for key, loc in compiled.marks.items()}
+    return obj, marks
+
+
+def _fill_mesh(mesh, compiled):
+    mesh.vertices.add(len(compiled.coords) // 3)
+    mesh.vertices.foreach_set('co', compiled.coords)
+    mesh.edges.add(len(compiled.edges) // 2)
+    mesh.edges.foreach_set('vertices', compiled.edges)
+    mesh.loops.add(len(compiled.loop_verts))
+    mesh.loops.foreach_set('vertex_index', compiled.loop_verts)
+    mesh.loops.foreach_set('edge_index', compiled.loop_edges)
+    mesh.polygons.add(len(compiled.loop_starts))
+    mesh.polygons.foreach_set('loop_start', compiled.loop_starts)
+    # loop_total is derived from loop_start in newer versions of Blender
+    loop_total = bpy.types.MeshPolygon.bl_rna.properties.get('loop_total')
+    if loop_total is not None and not loop_total.is_readonly:
+        mesh.polygons.foreach_set('loop_total', compiled.loop_totals)
+
+
+def set_cache_size(size):
+    """Set the number of compiled programs to keep.
+
+    Args:
+        size (int): cache size
+    """
+    global _cache_size
+    _cache_size = size
+    while len(_cache) > _cache_size:
+        _cache.popitem(last=False)
+
+
+def clear_cache():
+    """Forget all compiled programs."""
+    _cache.clear()
@@ -21,7 +21,11 @@ from .helpers import (
     bm_deselect_all,
     assign_verts_to_group,
     select_verts_in_bounds,
-    bm_shortest_path)
+    bm_shortest_path,
+    BMeshGraph,
+    BoxIndex)
+from .turtle import Turtle
+from .program import Program, build
 '''
 from line_profiler import LineProfiler
 from os.path import splitext
@@ -38,20 +42,18 @@ def draw_cuboid(dimensions):
     Returns:
         obj: bpy.types.Object
     """
-    bm, obj = create_turtle(name='cuboid')
-    add_vert(bm)
-    bm.select_mode = {'VERT'}
-    fd(bm, dimensions[1])
-    bm.select_mode = {'EDGE'}
-    bm_select_all(bm)
-    ri(bm, dimensions[0])
-    bm.select_mode = {'FACE'}
-    bm_select_all(bm)
-    up(bm, dimensions[2], False)
-    pu(bm)
-
-    home(obj)
-    finalise_turtle(bm, obj)
+    program = Program()
+    program.add_vert()
+    program.select_mode({'VERT'})
+    program.fd(dimensions[1])
+    program.select_mode({'EDGE'})
+    program.select_all()
+    program.ri(dimensions[0])
+    program.select_mode({'FACE'})
+    program.select_all()
+    program.up(dimensions[2], False)
+    program.pu()
+    obj, _ = build(program, 'cuboid')
 
     return obj
 
@@ -84,27 +86,20 @@ def draw_tri_prism(dimensions, ret_dimensions=False):
     B = degrees(acos((c**2 + a**2 - (b**2)) / (2 * c * a)))
     C = 180 - A - B
 
-    turtle = bpy.context.scene.cursor
-
-    bm, obj = create_turtle(name='tri_prism')
-    add_vert(bm)
-    bm.select_mode = {'VERT'}
-    loc_A = turtle.location.copy()
-    fd(bm, c)
-    loc_B = turtle.location.copy()
-    rt(180 - B)
-    fd(bm, a)
-    loc_C = turtle.location.copy()
-    bmesh.ops.contextual_create(
-        bm,
-        geom=bm.verts,
-        mat_nr=0,
-        use_smooth=False)
-    bm.select_mode = {'FACE'}
-    bm_select_all(bm)
-    up(bm, height, False)
-    home(obj)
-    finalise_turtle(bm, obj)
+    program = Program()
+    program.add_vert()
+    program.select_mode({'VERT'})
+    program.mark('A')
+    program.fd(c)
+    program.mark('B')
+    program.rt(180 - B)
+    program.fd(a)
+    program.mark('C')
+    program.contextual_create()
+    program.select_mode({'FACE'})
+    program.select_all()
+    program.up(height, False)
+    obj, marks = build(program, 'tri_prism')
 
     dimensions = {
         'a': a,
@@ -113,9 +108,9 @@ def draw_tri_prism(dimensions, ret_dimensions=False):
         'A': A,
         'B': B,
         'C': C,
-        'loc_A': loc_A,
-        'loc_B': loc_B,
-        'loc_C': loc_C}
+        'loc_A': marks['A'],
+        'loc_B': marks['B'],
+        'loc_C': marks['C']}
 
     if ret_dimensions:
         return obj, dimensions
@@ -150,11 +145,11 @@ def draw_tri_floor_core(dimensions, subdivs, margin=0.001):
     B = degrees(acos((c**2 + a**2 - (b**2)) / (2 * c * a)))
     C = 180 - A - B
 
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
 
     vert_groups = ['Side a', 'Side b', 'Side c', 'Top', 'Bottom']
 
-    bm, obj = create_turtle(name='tri_prism', vert_groups=vert_groups)
+    bm, obj = create_turtle(name='tri_prism', vert_groups=vert_groups, turtle=turtle)
 
     # create vertex group layer
     bm.verts.layers.deform.verify()
@@ -201,6 +196,7 @@ def draw_tri_floor_core(dimensions, subdivs, margin=0.001):
     bm_deselect_all(bm)
 
     buffer = margin / 2
+    box_index = BoxIndex(bm)
 
     # select side c and assign to vert group
     lbound = loc_A
@@ -209,7 +205,7 @@ def draw_tri_floor_core(dimensions, subdivs, margin=0.001):
         loc_B[1],
         loc_B[2] + height)
 
-    side_c_verts = select_verts_in_bounds(lbound, ubound, buffer, bm)
+    side_c_verts = select_verts_in_bounds(lbound, ubound, buffer, bm, box_index)
     assign_verts_to_group(side_c_verts, obj, deform_groups, 'Side c')
     bm_deselect_all(bm)
 
@@ -229,7 +225,8 @@ def draw_tri_floor_core(dimensions, subdivs, margin=0.001):
             turtle.location[0],
             turtle.location[1],
             turtle.location[2] + height)
-        selected_verts = select_verts_in_bounds(lbound, ubound, buffer, bm)
+        selected_verts = select_verts_in_bounds(
+            lbound, ubound, buffer, bm, box_index, select=False)
         side_a_verts.extend(selected_verts)
         fd(bm, a / (subdivs[0] + 1))
         i += 1
@@ -238,7 +235,7 @@ def draw_tri_floor_core(dimensions, subdivs, margin=0.001):
         turtle.location[0],
         turtle.location[1],
         turtle.location[2] + height)
-    selected_verts = select_verts_in_bounds(lbound, ubound, buffer, bm)
+    selected_verts = select_verts_in_bounds(lbound, ubound, buffer, bm, box_index)
     side_a_verts.extend(selected_verts)
 
     assign_verts_to_group(side_a_verts, obj, deform_groups, 'Side a')
@@ -255,7 +252,8 @@ def draw_tri_floor_core(dimensions, subdivs, margin=0.001):
             turtle.location[0],
             turtle.location[1],
             turtle.location[2] + height)
-        selected_verts = select_verts_in_bounds(lbound, ubound, buffer, bm)
+        selected_verts = select_verts_in_bounds(
+            lbound, ubound, buffer, bm, box_index, select=False)
         side_b_verts.extend(selected_verts)
         fd(bm, b / (subdivs[0] + 1))
         i += 1
@@ -264,7 +262,7 @@ def draw_tri_floor_core(dimensions, subdivs, margin=0.001):
         turtle.location[0],
         turtle.location[1],
         turtle.location[2] + height)
-    selected_verts = select_verts_in_bounds(lbound, ubound, buffer, bm)
+    selected_verts = select_verts_in_bounds(lbound, ubound, buffer, bm, box_index)
     side_b_verts.extend(selected_verts)
 
     assign_verts_to_group(side_b_verts, obj, deform_groups, 'Side b')
@@ -283,7 +281,7 @@ def draw_tri_floor_core(dimensions, subdivs, margin=0.001):
         loc_A[2] + height)
 
     side_verts = side_a_verts + side_b_verts + side_c_verts
-    selected_verts = select_verts_in_bounds(lbound, ubound, buffer, bm)
+    selected_verts = select_verts_in_bounds(lbound, ubound, buffer, bm, box_index)
     top_verts = [v for v in selected_verts if v not in side_verts]
 
     assign_verts_to_group(top_verts, obj, deform_groups, 'Top')
@@ -457,11 +455,12 @@ def draw_straight_wall_core(dims, subdivs, margin=0.001):
     home(obj)
 
     # select left side and assign to vert group
+    box_index = BoxIndex(bm)
     lbound = (0, 0, 0)
     ubound = (0, dims[1], dims[2])
     buffer = margin / 2
 
-    left_verts_orig = select_verts_in_bounds(lbound, ubound, buffer, bm)
+    left_verts_orig = select_verts_in_bounds(lbound, ubound, buffer, bm, box_index)
     left_verts = [
         v for v in left_verts_orig if v not in top_verts and v not in bottom_verts]
     assign_verts_to_group(left_verts, obj, deform_groups, 'Left')
@@ -471,7 +470,7 @@ def draw_straight_wall_core(dims, subdivs, margin=0.001):
     ubound = dims
     buffer = margin / 2
 
-    right_verts_orig = select_verts_in_bounds(lbound, ubound, buffer, bm)
+    right_verts_orig = select_verts_in_bounds(lbound, ubound, buffer, bm, box_index)
     right_verts = [
         v for v in right_verts_orig if v not in top_verts and v not in bottom_verts]
     assign_verts_to_group(right_verts, obj, deform_groups, 'Right')
@@ -490,7 +489,7 @@ def draw_straight_wall_core(dims, subdivs, margin=0.001):
     ubound = (dims[0] - margin, 0, dims[2] - margin)
     buffer = margin / 2
 
-    front_verts = select_verts_in_bounds(lbound, ubound, buffer, bm)
+    front_verts = select_verts_in_bounds(lbound, ubound, buffer, bm, box_index)
     assign_verts_to_group(front_verts, obj, deform_groups, 'Front')
 
     # select back side and assign to vert group
@@ -498,7 +497,7 @@ def draw_straight_wall_core(dims, subdivs, margin=0.001):
     ubound = (dims[0] - margin, dims[1], dims[2] - margin)
     buffer = margin / 2
 
-    back_verts = select_verts_in_bounds(lbound, ubound, buffer, bm)
+    back_verts = select_verts_in_bounds(lbound, ubound, buffer, bm, box_index)
     assign_verts_to_group(back_verts, obj, deform_groups, 'Back')
 
     # finalise turtle and release bmesh
@@ -549,7 +548,7 @@ def draw_corner_core(
     base_height = dimensions['base_height']
     height = dimensions['height']
 
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     turtle_start_loc = turtle.location.copy()
     vert_groups = [
         'Leg 1 End',
@@ -563,7 +562,7 @@ def draw_corner_core(
         'Leg 1 Bottom',
         'Leg 2 Bottom']
 
-    bm, obj = create_turtle('L_2D', vert_groups)
+    bm, obj = create_turtle('L_2D', vert_groups, turtle=turtle)
     # create vertex group layer
     bm.verts.layers.deform.verify()
     deform_groups = bm.verts.layers.deform.active
@@ -941,6 +940,11 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
 
     kd.balance()
 
+    # vert adjacency for shortest path queries
+    graph = BMeshGraph(bm)
+    # vert locations for box queries
+    box_index = BoxIndex(bm)
+
     for key, value in sides.items():
         vert_group = []
         for loc in value:
@@ -950,7 +954,9 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
                 ubound=(bottom_vert_co[0], bottom_vert_co[1],
                         bottom_vert_co[2] + height),
                 buffer=margin / 2,
-                bm=bm)
+                bm=bm,
+                index=box_index,
+                select=False)
             vert_group.extend(verts)
         vert_groups[key] = vert_group
 
@@ -970,7 +976,7 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
         v2 = bm.verts[v2_index]
 
         # select shortest path
-        nodes = bm_shortest_path(bm, v1, v2)
+        nodes = bm_shortest_path(bm, v1, v2, graph)
         node = nodes[v2]
 
         for e in node.shortest_path:
@@ -982,7 +988,8 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
 
         for v in verts:
             selected = select_verts_in_bounds(
-                v.co, (v.co[0], v.co[1], v.co[2] + height), margin / 2, bm)
+                v.co, (v.co[0], v.co[1], v.co[2] + height), margin / 2, bm,
+                index=box_index, select=False)
             selected_verts.extend(selected)
 
         vert_groups[key] = selected_verts
@@ -1003,7 +1010,7 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        nodes = bm_shortest_path(bm, v1, v2)
+        nodes = bm_shortest_path(bm, v1, v2, graph)
         node = nodes[v2]
 
         for e in node.shortest_path:
@@ -1031,7 +1038,7 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        nodes = bm_shortest_path(bm, v1, v2)
+        nodes = bm_shortest_path(bm, v1, v2, graph)
         node = nodes[v2]
 
         for e in node.shortest_path:
@@ -1060,7 +1067,8 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
              inner_locs[i][1],
              inner_locs[i][2] + height),
             margin / 2,
-            bm)
+            bm,
+            box_index)
         v2 = select_verts_in_bounds(
             (outer_locs[i][0],
              outer_locs[i][1],
@@ -1069,9 +1077,10 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
              outer_locs[i][1],
              outer_locs[i][2] + height),
             margin / 2,
-            bm)
+            bm,
+            box_index)
 
-        nodes = bm_shortest_path(bm, v1[0], v2[0])
+        nodes = bm_shortest_path(bm, v1[0], v2[0], graph)
         node = nodes[v2[0]]
 
         for e in node.shortest_path:
@@ -1099,7 +1108,8 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
              inner_locs[i][1],
              inner_locs[i][2] + height),
             margin / 2,
-            bm)
+            bm,
+            box_index)
         v2 = select_verts_in_bounds(
             (outer_locs[i][0],
              outer_locs[i][1],
@@ -1108,9 +1118,10 @@ def create_corner_vert_groups_vert_lists(bm, height, margin, vert_locs):
              outer_locs[i][1],
              outer_locs[i][2] + height),
             margin / 2,
-            bm)
+            bm,
+            box_index)
 
-        nodes = bm_shortest_path(bm, v1[0], v2[0])
+        nodes = bm_shortest_path(bm, v1[0], v2[0], graph)
         node = nodes[v2[0]]
 
         for e in node.shortest_path:
@@ -1150,10 +1161,10 @@ def draw_corner_slot_cutter(dimensions):
     thickness = dimensions['thickness']
     thickness_diff = dimensions['thickness_diff']
 
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     orig_rot = turtle.location.copy()
 
-    bm, obj = create_turtle('cutter')
+    bm, obj = create_turtle('cutter', turtle=turtle)
     bm.select_mode = {'VERT'}
 
     # move turtle to slot start loc
@@ -1244,10 +1255,10 @@ def draw_corner_3D(triangles, dimensions, triangles_1=None):
     height = dimensions['height']
     thickness = dimensions['thickness']
 
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     orig_rot = turtle.rotation_euler.copy()
     turtle_origin = turtle.location.copy()
-    bm, obj = create_turtle('L_2D')
+    bm, obj = create_turtle('L_2D', turtle=turtle)
     bm.select_mode = {'VERT'}
     if triangles_1:
         pu(bm)
@@ -1321,18 +1332,17 @@ def draw_curved_cuboid(name, radius, segments, deg, height, width):
     Returns:
         bpy.types.Object: Object
     """
-    bm, obj = create_turtle(name)
-    bm.select_mode = {'VERT'}
-    arc(bm, radius, deg, segments)
-    bm_deselect_all(bm)
-    arc(bm, radius + width, deg, segments)
-    bmesh.ops.bridge_loops(bm, edges=bm.edges)
-    bm.select_mode = {'FACE'}
-    bm_select_all(bm)
-    pd(bm)
-    up(bm, height, False)
-    home(obj)
-    finalise_turtle(bm, obj)
+    program = Program()
+    program.select_mode({'VERT'})
+    program.arc(radius, deg, segments)
+    program.deselect_all()
+    program.arc(radius + width, deg, segments)
+    program.bridge_loops()
+    program.select_mode({'FACE'})
+    program.select_all()
+    program.pd()
+    program.up(height, False)
+    obj, _ = build(program, name)
 
     return obj
 
@@ -1351,11 +1361,11 @@ def draw_rectangular_floor_core(dims, subdivs, margin=0.001, offset=0):
     Returns:
         bpy.types.Object: Floor Core
     """
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     orig_loc = turtle.location.copy()
 
     vert_groups = ['Left', 'Right', 'Front', 'Back', 'Top', 'Bottom']
-    bm, obj = create_turtle('Rectangular Floor', vert_groups)
+    bm, obj = create_turtle('Rectangular Floor', vert_groups, turtle=turtle)
 
     # create vertex group layer
     bm.verts.layers.deform.verify()
@@ -1410,11 +1420,13 @@ def draw_rectangular_floor_core(dims, subdivs, margin=0.001, offset=0):
     top_verts = {v for v in bm.verts if v.select}
 
     # select left
+    box_index = BoxIndex(bm)
     left_verts = select_verts_in_bounds(
         lbound=orig_loc,
         ubound=(orig_loc[0], dims[1] + offset, dims[2]),
         buffer=margin / 2,
-        bm=bm)
+        bm=bm,
+        index=box_index)
 
     assign_verts_to_group(left_verts, obj, deform_groups, 'Left')
 
@@ -1423,7 +1435,8 @@ def draw_rectangular_floor_core(dims, subdivs, margin=0.001, offset=0):
         lbound=(dims[0] + offset, orig_loc[1], orig_loc[2]),
         ubound=(dims[0] + offset, dims[1] + offset, dims[2]),
         buffer=margin / 2,
-        bm=bm)
+        bm=bm,
+        index=box_index)
 
     assign_verts_to_group(right_verts, obj, deform_groups, 'Right')
 
@@ -1432,8 +1445,8 @@ def draw_rectangular_floor_core(dims, subdivs, margin=0.001, offset=0):
         lbound=orig_loc,
         ubound=(dims[0] + offset, orig_loc[1], dims[2]),
         buffer=margin / 2,
-        bm=bm
-    )
+        bm=bm,
+        index=box_index)
 
     assign_verts_to_group(front_verts, obj, deform_groups, 'Front')
 
@@ -1442,8 +1455,8 @@ def draw_rectangular_floor_core(dims, subdivs, margin=0.001, offset=0):
         lbound=(orig_loc[0], dims[1] + offset, orig_loc[2]),
         ubound=(dims[0] + offset, dims[1] + offset, dims[2]),
         buffer=margin / 2,
-        bm=bm
-    )
+        bm=bm,
+        index=box_index)
 
     assign_verts_to_group(back_verts, obj, deform_groups, 'Back')
     # # # Select top
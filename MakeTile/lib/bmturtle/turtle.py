@@ -0,0 +1,167 @@
+import bpy
+from mathutils import Vector, Euler, Matrix
+
+
+class Turtle:
+    """In memory turtle used by the bmturtle commands.
+
+    Mirrors the parts of the 3D cursor the commands used to drive
+    (location, rotation_euler and matrix) and also holds the pen state
+    that used to live on the active object. Because nothing here touches RNA
+    the commands can be called thousands of times per mesh cheaply and
+    can run without a scene.
+
+    location and rotation_euler are updated in place so, like the cursor,
+    references to them stay live.
+
+    The turtle also remembers the geometry it last extruded (its active
+    geometry) so the next move can extrude it without scanning the whole
+    bmesh for selected elements. The active geometry is only trusted while
+    the bmesh, its select mode and its element counts are unchanged. Code
+    that changes the selection without changing any of those should call
+    selection_changed().
+    """
+
+    def __init__(self, location=(0, 0, 0), rotation_euler=(0, 0, 0), penstate=True):
+        self._location = Vector(location)
+        self._rotation_euler = Euler(rotation_euler)
+        self.penstate = penstate
+        self.active = None
+        self._active_key = None
+
+    @property
+    def location(self):
+        return self._location
+
+    @location.setter
+    def location(self, value):
+        self._location[:] = value
+
+    @property
+    def rotation_euler(self):
+        return self._rotation_euler
+
+    @rotation_euler.setter
+    def rotation_euler(self, value):
+        self._rotation_euler[:] = value
+
+    @property
+    def matrix(self):
+        mat = self._rotation_euler.to_matrix().to_4x4()
+        mat.translation = self._location
+        return mat
+
+    @matrix.setter
+    def matrix(self, value):
+        value = Matrix(value)
+        self._location[:] = value.to_translation()
+        self._rotation_euler[:] = value.to_euler(self._rotation_euler.order)
+
+    @classmethod
+    def from_cursor(cls, cursor=None):
+        """Return a turtle positioned at the 3D cursor.
+
+        Falls back to the world origin if there is no scene, e.g. when running headless.
+
+        Args:
+            cursor (bpy.types.View3DCursor, optional): cursor. Defaults to the scene cursor.
+
+        Returns:
+            Turtle: turtle
+        """
+        if cursor is None:
+            scene = getattr(bpy.context, 'scene', None)
+            if scene is None:
+                return cls()
+            cursor = scene.cursor
+        return cls(cursor.location, cursor.rotation_euler)
+
+    def sync_cursor(self, cursor=None):
+        """Move the 3D cursor to the turtle.
+
+        Args:
+            cursor (bpy.types.View3DCursor, optional): cursor. Defaults to the scene cursor.
+        """
+        if cursor is None:
+            cursor = bpy.context.scene.cursor
+        cursor.location = self._location
+        cursor.rotation_euler = self._rotation_euler
+
+    def copy(self):
+        return Turtle(self._location, self._rotation_euler, self.penstate)
+
+    def get_active(self, bm):
+        """Return the turtle's active geometry if it is still valid for bm.
+
+        Args:
+            bm (bmesh): bmesh
+
+        Returns:
+            list[BMVert | BMEdge | BMFace] | None: active geometry
+        """
+        if self.active is None or self._active_key != _geom_key(bm):
+            return None
+        if not all(ele.is_valid and ele.select for ele in self.active):
+            return None
+        return self.active
+
+    def set_active(self, bm, geom):
+        """Set the geometry the turtle will extrude on its next move.
+
+        Args:
+            bm (bmesh): bmesh
+            geom (list[BMVert | BMEdge | BMFace]): geometry
+        """
+        self.active = geom
+        self._active_key = _geom_key(bm)
+
+    def clear_active(self):
+        """Forget the active geometry so the next move uses the selection."""
+        self.active = None
+        self._active_key = None
+
+
+def _geom_key(bm):
+    return (
+        bm,
+        _selection_epoch,
+        tuple(sorted(bm.select_mode)),
+        len(bm.verts),
+        len(bm.edges),
+        len(bm.faces))
+
+
+_active_turtle = None
+_selection_epoch = 0
+
+
+def selection_changed():
+    """Invalidate the active geometry of all turtles.
+
+    Call after changing a bmesh selection directly so the next move
+    extrudes the selection rather than the turtle's active geometry.
+    """
+    global _selection_epoch
+    _selection_epoch += 1
+
+
+def get_turtle():
+    """Return the turtle commands use when none is passed to them.
+
+    Returns:
+        Turtle: turtle
+    """
+    global _active_turtle
+    if _active_turtle is None:
+        _active_turtle = Turtle.from_cursor()
+    return _active_turtle
+
+
+def set_turtle(turtle):
+    """Set the turtle commands use when none is passed to them.
+
+    Args:
+        turtle (Turtle): turtle
+    """
+    global _active_turtle
+    _active_turtle = turtle
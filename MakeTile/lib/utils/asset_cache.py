@@ -0,0 +1,157 @@
+import os
+import bpy
+
+# ID property used to recognise master datablocks. It holds the path of the
+# file the master was loaded from and is removed from instances.
+_KEY = 'mt_asset_cache'
+
+
+class AssetCache:
+    """Session cache of objects and meshes appended from asset .blend files.
+
+    Each named asset is appended once and kept as a hidden master datablock
+    that is not linked to any scene. objects() hands out copies of the
+    masters that share the master's mesh, so callers must copy an instance's
+    mesh before editing it. Masters have no users so they are not saved in
+    the user's file.
+
+    Masters are looked up by name rather than held as references so they
+    survive undo, and are reloaded when they no longer exist (e.g. after
+    loading a new file) or when the asset file's modification time changes.
+    """
+
+    def __init__(self):
+        # {filepath: {'mtime': float, 'objects': {asset_name: master_name}, 'meshes': {...}}}
+        self._files = {}
+        self.hits = 0
+        self.misses = 0
+
+    def objects(self, filepath, names):
+        """Return new, unlinked instances of the named objects.
+
+        Objects loaded together keep pointing at each other's instances in
+        their modifiers and parents.
+
+        Args:
+            filepath (str): path to .blend file
+            names (list[str]): object names
+
+        Returns:
+            list[bpy.types.Object]: instances in the same order as names
+        """
+        masters = self._get(filepath, names, 'objects')
+        instances = {}
+        for master in masters:
+            if master not in instances:
+                instance = master.copy()
+                del instance[_KEY]
+                instances[master] = instance
+        for instance in instances.values():
+            _remap_object_pointers(instance, instances)
+        return [instances[master] for master in masters]
+
+    def meshes(self, filepath, names):
+        """Return the named master meshes.
+
+        Masters are shared, so copy them before use.
+
+        Args:
+            filepath (str): path to .blend file
+            names (list[str]): mesh names
+
+        Returns:
+            list[bpy.types.Mesh]: meshes in the same order as names
+        """
+        return self._get(filepath, names, 'meshes')
+
+    def stats(self):
+        """Return cache hit and miss counts.
+
+        Returns:
+            dict: hits, misses and number of cached assets
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'assets': sum(len(f['objects']) + len(f['meshes']) for f in self._files.values())}
+
+    def clear(self):
+        """Remove all masters and reset the counts."""
+        for filepath in list(self._files):
+            self._invalidate(filepath)
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, filepath, names, data_type):
+        mtime = os.path.getmtime(filepath)
+        entry = self._files.get(filepath)
+        if entry is not None and entry['mtime'] != mtime:
+            self._invalidate(filepath)
+            entry = None
+        if entry is None:
+            entry = self._files[filepath] = {'mtime': mtime, 'objects': {}, 'meshes': {}}
+
+        cached = entry[data_type]
+        collection = getattr(bpy.data, data_type)
+        found = {}
+        missing = []
+        for name in names:
+            if name in found or name in missing:
+                continue
+            master = _lookup(collection, cached.get(name), filepath)
+            if master is None:
+                missing.append(name)
+            else:
+                found[name] = master
+        self.hits += len(found)
+        self.misses += len(missing)
+
+        if missing:
+            # Blender replaces the names in the assigned list with datablocks
+            with bpy.data.libraries.load(filepath) as (data_from, data_to):
+                setattr(data_to, data_type, list(missing))
+            for name, master in zip(missing, getattr(data_to, data_type)):
+                if master is None:
+                    raise KeyError(name + ' not found in ' + filepath)
+                master[_KEY] = filepath
+                cached[name] = master.name
+                found[name] = master
+        return [found[name] for name in names]
+
+    def _invalidate(self, filepath):
+        entry = self._files.pop(filepath, None)
+        if entry is None:
+            return
+        for data_type in ('objects', 'meshes'):
+            collection = getattr(bpy.data, data_type)
+            for master_name in entry[data_type].values():
+                master = _lookup(collection, master_name, filepath)
+                # master objects are only used by each other but leave
+                # master meshes still used by instances alone
+                if master is not None and (data_type == 'objects' or master.users == 0):
+                    collection.remove(master)
+
+
+def _lookup(collection, master_name, filepath):
+    if master_name is None:
+        return None
+    master = collection.get(master_name)
+    if master is None or master.get(_KEY) != filepath:
+        return None
+    return master
+
+
+def _remap_object_pointers(obj, instances):
+    """Point obj's parent and modifiers at instances rather than masters."""
+    if obj.parent in instances:
+        obj.parent = instances[obj.parent]
+    for mod in obj.modifiers:
+        for prop in mod.bl_rna.properties:
+            if prop.type != 'POINTER' or prop.is_readonly or prop.fixed_type.identifier != 'Object':
+                continue
+            target = getattr(mod, prop.identifier)
+            if target in instances:
+                setattr(mod, prop.identifier, instances[target])
+
+
+cutter_cache = AssetCache()
@@ -0,0 +1,239 @@
+import os
+import hashlib
+import numpy as np
+import bpy
+from .hashing import hash_node_tree, update_hash
+
+# bump to invalidate cached maps when how they are baked changes
+_bake_version = 2
+
+
+class BakeCache:
+    """Disk cache of baked displacement maps.
+
+    Maps are saved as .png files named by a hash of everything that affects
+    the bake: the values of the displacement materials' nodes (including the
+    Seed node), the bake resolution, and the UVs and geometry of the object.
+    When the directory grows beyond max_bytes the least recently used maps
+    are deleted.
+
+    By default the directory and size are read from the addon preferences.
+
+    Several processes can share a cache: maps are written to a temporary
+    file and moved into place, loaded maps are packed so eviction can't
+    delete them from under an image, and a map that disappears before it is
+    read is a miss. Set evict to False in processes that shouldn't delete
+    maps others may be reading.
+    """
+
+    def __init__(self, directory=None, max_bytes=None, evict=True):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self.evict = evict
+        # size and number of cached maps, read from the directory when first needed
+        self._size = None
+        self._count = None
+        self._scanned_directory = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def directory(self):
+        if self._directory is not None:
+            return self._directory
+        from ...utils.registration import get_prefs
+        return get_prefs().bake_cache_path
+
+    @property
+    def max_bytes(self):
+        if self._max_bytes is not None:
+            return self._max_bytes
+        from ...utils.registration import get_prefs
+        return get_prefs().bake_cache_size * 1024 * 1024
+
+    def get_key(self, obj, materials, resolution):
+        """Return the cache key of a displacement bake.
+
+        Call before the materials are rewired for baking.
+
+        Args:
+            obj (bpy.types.Object): object being baked
+            materials (list[bpy.types.Material]): displacement materials
+            resolution (int): image resolution
+
+        Returns:
+            str: key
+        """
+        h = hashlib.sha1()
+        update_hash(h, _bake_version, resolution, [tuple(row) for row in obj.matrix_world])
+
+        mesh = obj.data
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', loop_verts)
+        material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get('material_index', material_indices)
+        h.update(co.tobytes())
+        h.update(loop_verts.tobytes())
+        h.update(material_indices.tobytes())
+
+        uv_layer = mesh.uv_layers.active
+        if uv_layer is not None:
+            uvs = np.empty(len(uv_layer.data) * 2, dtype=np.float32)
+            uv_layer.data.foreach_get('uv', uvs)
+            h.update(uvs.tobytes())
+
+        # which displacement material is in each slot. Materials are hashed by
+        # content so the temporary copies used when baking share keys
+        update_hash(h, [
+            materials.index(slot.material) if slot.material in materials else None
+            for slot in obj.material_slots])
+        seen = set()
+        for material in materials:
+            hash_node_tree(h, material.node_tree, seen)
+        return h.hexdigest()
+
+    def load(self, key, name):
+        """Return the cached map for a key as a new image.
+
+        Args:
+            key (str): key from get_key
+            name (str): image name
+
+        Returns:
+            bpy.types.Image | None: image or None on a miss
+        """
+        path = self._path(key)
+        try:
+            # mark as recently used
+            os.utime(path)
+            image = bpy.data.images.load(path)
+            image.pack()
+        except (OSError, RuntimeError):
+            # not cached, or evicted by another process
+            self.misses += 1
+            return None
+        self.hits += 1
+        image.name = name
+        image.colorspace_settings.is_data = True
+        return image
+
+    def save(self, key, image):
+        """Save a baked map to the cache.
+
+        The image is saved as a .png and becomes backed by the cached file.
+
+        Args:
+            key (str): key from get_key
+            image (bpy.types.Image): baked image
+        """
+        directory = self.directory
+        os.makedirs(directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        image.filepath_raw = temp_path
+        image.file_format = 'PNG'
+        existed = os.path.exists(path)
+        image.save()
+        os.replace(temp_path, path)
+        image.filepath_raw = path
+        if self._size is None or self._directory_changed():
+            self._scan()
+        elif not existed:
+            self._size += os.path.getsize(path)
+            self._count += 1
+        if self.evict:
+            self._evict()
+
+    def trim(self):
+        """Delete least recently used maps until the cache fits in max_bytes."""
+        self._scan()
+        self._evict()
+
+    def stats(self):
+        """Return cache statistics.
+
+        Returns:
+            dict: hits, misses, evictions, number of cached maps and their size in bytes
+        """
+        if self._size is None or self._directory_changed():
+            self._scan()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'maps': self._count,
+            'bytes': self._size}
+
+    def clear(self):
+        """Delete all cached maps and reset the counts."""
+        for path, size, mtime in self._files():
+            _remove(path)
+        self._size = None
+        self._count = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.png')
+
+    def _files(self):
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return []
+        files = []
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith('.png'):
+                stat = entry.stat()
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _scan(self):
+        files = self._files()
+        self._scanned_directory = self.directory
+        self._size = sum(size for path, size, mtime in files)
+        self._count = len(files)
+
+    def _directory_changed(self):
+        return self._scanned_directory != self.directory
+
+    def _evict(self):
+        max_bytes = self.max_bytes
+        if self._size <= max_bytes:
+            return
+        files = sorted(self._files(), key=lambda f: f[2])
+        # always keep the most recent map
+        for path, size, mtime in files[:-1]:
+            if self._size <= max_bytes:
+                break
+            _remove(path)
+            self._size -= size
+            self._count -= 1
+            self.evictions += 1
+
+
+def _remove(path):
+    # another process may have removed it already
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+bake_cache = BakeCache()
+
+
+def get_bake_cache_stats_text():
+    """Return a one line summary of the bake cache for the UI.
+
+    Returns:
+        str: summary
+    """
+    stats = bake_cache.stats()
+    return (
+        f"Bake cache: {stats['maps']} maps, {stats['bytes'] / (1024 * 1024):.1f} MB. "
+        f"{stats['hits']} hits, {stats['misses']} misses this session")
@@ -0,0 +1,82 @@
+"""Hashing of datablock contents for keys that don't depend on datablock names."""
+import bpy
+
+
+def update_hash(h, *values):
+    """Add values to a hash by their repr.
+
+    Args:
+        h (hashlib hash): hash to update
+        values: values made hashable with hashable_value
+    """
+    h.update(repr(values).encode())
+
+
+def hashable_value(value):
+    """Return a property value as plain python values with a stable repr.
+
+    Args:
+        value: property value
+
+    Returns:
+        str | int | float | bool | None | tuple: value
+    """
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    # enum flags
+    if isinstance(value, set):
+        return tuple(sorted(value))
+    try:
+        return tuple(hashable_value(v) for v in value)
+    except TypeError:
+        return str(value)
+
+
+# properties all nodes have. Those that don't affect a node's output aren't hashed
+_node_base_props = {prop.identifier for prop in bpy.types.Node.bl_rna.properties} - {'mute'}
+
+
+def hash_node_tree(h, tree, seen=None):
+    """Add the nodes, links, settings and input values of a node tree and its groups to a hash.
+
+    Trees are identified by content rather than name, so copies of a material
+    hash the same.
+
+    Args:
+        h (hashlib hash): hash to update
+        tree (bpy.types.NodeTree): node tree
+        seen (set[int], optional): pointers of trees already hashed. Node groups are only hashed once.
+    """
+    if seen is None:
+        seen = set()
+    if tree is None or tree.as_pointer() in seen:
+        return
+    seen.add(tree.as_pointer())
+    for node in sorted(tree.nodes, key=lambda node: node.name):
+        values = [hashable_value(socket.default_value) for socket in node.inputs if hasattr(socket, 'default_value')]
+        # value nodes such as the Seed node keep their value in their output
+        if node.type == 'VALUE':
+            values.append(node.outputs[0].default_value)
+        for prop in node.bl_rna.properties:
+            if prop.identifier in _node_base_props:
+                continue
+            if prop.type != 'POINTER':
+                values.append((prop.identifier, hashable_value(getattr(node, prop.identifier))))
+        color_ramp = getattr(node, 'color_ramp', None)
+        if color_ramp is not None:
+            values.append((
+                color_ramp.interpolation,
+                color_ramp.color_mode,
+                [(element.position, tuple(element.color)) for element in color_ramp.elements]))
+        image = getattr(node, 'image', None)
+        if image is not None and node.name != 'disp_texture_node':
+            values.append(image.filepath or image.name)
+        obj = getattr(node, 'object', None)
+        if obj is not None:
+            values.append([tuple(row) for row in obj.matrix_world])
+        update_hash(h, node.name, node.bl_idname, values)
+        if getattr(node, 'node_tree', None) is not None:
+            hash_node_tree(h, node.node_tree, seen)
+    update_hash(h, sorted(
+        (link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+        for link in tree.links if not getattr(link, 'is_muted', False)))
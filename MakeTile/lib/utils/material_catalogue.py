@@ -0,0 +1,94 @@
+"""Catalogue of the materials in material library .blend files.
+
+Listing the materials in a .blend means opening it, so the names are kept
+in a .json file in the user config directory along with each file's
+modification time and size. Only files that have changed since the
+catalogue was saved are opened again.
+"""
+import os
+import json
+import bpy
+
+# bump to ignore existing catalogues when what is stored changes
+_catalogue_version = 1
+
+
+def get_catalogue_path():
+    """Return the path the material catalogue is saved to.
+
+    Returns:
+        str: path to .json file
+    """
+    return os.path.join(bpy.utils.user_resource('CONFIG', path='MakeTile', create=True), 'material_catalogue.json')
+
+
+def get_material_catalogue(directories, catalogue_path=None):
+    """Return the materials in each .blend file in directories.
+
+    Args:
+        directories (Iterable[str]): directories to search. Missing directories are skipped.
+        catalogue_path (str, optional): catalogue file. Defaults to get_catalogue_path().
+
+    Returns:
+        dict{str: list[str]}: material names by file path
+    """
+    if catalogue_path is None:
+        catalogue_path = get_catalogue_path()
+    cached = _load(catalogue_path)
+
+    files = {}
+    changed = False
+    for path, stat in _blend_files(directories):
+        entry = cached.get(path)
+        if entry is None or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            entry = {
+                'mtime': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'materials': _read_material_names(path)}
+            changed = True
+        files[path] = entry
+
+    if changed or files.keys() != cached.keys():
+        _save(catalogue_path, files)
+    return {path: entry['materials'] for path, entry in files.items()}
+
+
+def _blend_files(directories):
+    for directory in directories:
+        try:
+            entries = sorted(os.scandir(os.path.abspath(directory)), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith('.blend'):
+                yield entry.path, entry.stat()
+
+
+def _read_material_names(path):
+    try:
+        with bpy.data.libraries.load(path) as (data_from, data_to):
+            return list(data_from.materials)
+    except OSError as err:
+        print(err)
+        return []
+
+
+def _load(catalogue_path):
+    try:
+        with open(catalogue_path) as f:
+            catalogue = json.load(f)
+        if catalogue['version'] != _catalogue_version:
+            return {}
+        return catalogue['files']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def _save(catalogue_path, files):
+    temp_path = catalogue_path + '.tmp'
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump({'version': _catalogue_version, 'files': files}, f, indent=1)
+        os.replace(temp_path, catalogue_path)
+    except OSError as err:
+        print(err)
@@ -1,3 +1,5 @@
+from itertools import chain, compress
+import numpy as np
 import bpy
 import bmesh
 from mathutils import Vector
@@ -73,6 +75,74 @@ def in_bbox(lbound, ubound, vert, buffer=0.001):
         lbound[2] - buffer <= vert[2] <= ubound[2] + buffer
 
 
+def in_bbox_mask(lbound, ubound, coords, buffer=0.001):
+    """Checks which of an array of vertex coordinates are within a bounding cube
+
+    Vectorised version of in_bbox.
+
+    Keyword arguments:
+    lbound -- VECTOR lower left of cuboid
+    ubound -- VECTOR upper right of cuboid
+    coords -- numpy.ndarray N x 3 vertex coordinates
+    buffer -- FLOAT buffer distance to add to cuboid
+    """
+    lower = np.asarray(lbound, dtype=np.float64) - buffer
+    upper = np.asarray(ubound, dtype=np.float64) + buffer
+    return np.all((coords >= lower) & (coords <= upper), axis=1)
+
+
+def bm_vert_coords(bm, matrix=None):
+    """Returns the coordinates of a bmesh's verts as an N x 3 numpy.ndarray
+
+    Keyword arguments:
+    bm -- bmesh
+    matrix -- MATRIX optional matrix to transform coordinates by
+    """
+    coords = np.fromiter(
+        chain.from_iterable(v.co for v in bm.verts),
+        dtype=np.float64,
+        count=len(bm.verts) * 3).reshape(-1, 3)
+    if matrix is not None:
+        matrix = np.array(matrix, dtype=np.float64)
+        coords = coords @ matrix[:3, :3].T + matrix[:3, 3]
+    return coords
+
+
+def _elements_in_bbox(bm, lbound, ubound, select_mode, coords, buffer):
+    """Returns the bmesh elements for select_mode and a mask of which are
+    wholly within a bounding cuboid"""
+    world = bpy.context.object.matrix_world if coords == 'GLOBAL' else None
+    vert_mask = in_bbox_mask(lbound, ubound, bm_vert_coords(bm, world), buffer)
+
+    if select_mode == 'VERT':
+        return bm.verts, vert_mask
+
+    bm.verts.index_update()
+    if select_mode == 'EDGE':
+        indices = np.fromiter(
+            (v.index for e in bm.edges for v in e.verts),
+            dtype=np.int64,
+            count=len(bm.edges) * 2).reshape(-1, 2)
+        return bm.edges, vert_mask[indices].all(axis=1)
+
+    # FACE
+    if not len(bm.faces):
+        return bm.faces, np.zeros(0, dtype=bool)
+    totals = np.fromiter((len(f.verts) for f in bm.faces), dtype=np.int64, count=len(bm.faces))
+    indices = np.fromiter((v.index for f in bm.faces for v in f.verts), dtype=np.int64, count=totals.sum())
+    starts = np.concatenate(([0], np.cumsum(totals[:-1])))
+    return bm.faces, np.logical_and.reduceat(vert_mask[indices], starts)
+
+
+def _set_selection(elements, mask, additive):
+    if additive:
+        for ele in compress(elements, mask):
+            ele.select = True
+    else:
+        for ele, select in zip(elements, mask.tolist()):
+            ele.select = select
+
+
 def select_by_loc(
         lbound=(0, 0, 0),
         ubound=(0, 0, 0),
@@ -94,64 +164,13 @@ def select_by_loc(
 
     # set selection mode
     bpy.ops.mesh.select_mode(type=select_mode)
-    # grab the transformation matrix
-    world = bpy.context.object.matrix_world
 
-    # instantiate a bmesh object and ensure lookup table (bm.faces.ensure... works for all)
     bm = bmesh.from_edit_mesh(bpy.context.object.data)
-    bm.faces.ensure_lookup_table()
-
-    # initialise list of verts and parts to be selected
-    verts = []
-    to_select = []
-
-    # for VERT, EDGE or FACE
-    # grab list of global or local coords
-    # test if the piece is entirely within the rectangular
-    # prism defined by lbound and ubound
-    # select each piece that returned TRUE and deselect each piece that returned FALSE
-
-    if select_mode == 'VERT':
-        if coords == 'GLOBAL':
-            [verts.append((world @ v.co).to_tuple())for v in bm.verts]
-        elif coords == 'LOCAL':
-            [verts.append(v.co.to_tuple())for v in bm.verts]
-
-        [to_select.append(in_bbox(lbound, ubound, v, buffer))for v in verts]
-
-        for vert_obj, select in zip(bm.verts, to_select):
-            if additive:
-                vert_obj.select |= select
-            else:
-                vert_obj.select = select
 
-    if select_mode == 'EDGE':
-        if coords == 'GLOBAL':
-            [verts.append([(world @ v.co).to_tuple() for v in e.verts]) for e in bm.edges]
-        elif coords == 'LOCAL':
-            [verts.append([v.co.to_tuple()for v in e.verts]) for e in bm.edges]
-
-        [to_select.append(all(in_bbox(lbound, ubound, v, buffer)for v in e)) for e in verts]
-
-        for edge_obj, select in zip(bm.edges, to_select):
-            if additive:
-                edge_obj.select |= select
-            else:
-                edge_obj.select = select
-
-    if select_mode == 'FACE':
-        if coords == 'GLOBAL':
-            [verts.append([(world @ v.co).to_tuple() for v in f.verts])for f in bm.faces]
-        elif coords == 'LOCAL':
-            [verts.append([v.co.to_tuple()for v in f.verts]) for f in bm.faces]
-
-        [to_select.append(all(in_bbox(lbound, ubound, v, buffer) for v in f))for f in verts]
-
-        for face_obj, select in zip(bm.faces, to_select):
-            if additive:
-                face_obj.select |= select
-            else:
-                face_obj.select = select
+    # test if each piece is entirely within the rectangular prism defined by
+    # lbound and ubound, select each piece that passes and deselect the rest
+    elements, to_select = _elements_in_bbox(bm, lbound, ubound, select_mode, coords, buffer)
+    _set_selection(elements, to_select, additive)
 
     # update the edit mesh so we get live highlighting
     bmesh.update_edit_mesh(bpy.context.object.data)
@@ -178,81 +197,13 @@ def select_inverse_by_loc(
 
     # set selection mode
     bpy.ops.mesh.select_mode(type=select_mode)
-    # grab the transformation matrix
-    world = bpy.context.object.matrix_world
 
-    # instantiate a bmesh object and ensure lookup table (bm.faces.ensure... works for all)
     bm = bmesh.from_edit_mesh(bpy.context.object.data)
-    bm.faces.ensure_lookup_table()
-
-    # initialise list of verts and parts to be selected
-    verts = []
-    to_select = []
-
-    # for VERT, EDGE or FACE
-    # grab list of global or local coords
-    # test if the piece is entirely within the rectangular
-    # prism defined by lbound and ubound
-    # select each piece that returned TRUE and deselect each piece that returned FALSE
-
-    if select_mode == 'VERT':
-        if coords == 'GLOBAL':
-            [verts.append((world @ v.co).to_tuple())for v in bm.verts]
-        elif coords == 'LOCAL':
-            [verts.append(v.co.to_tuple())for v in bm.verts]
-
-        [to_select.append(in_bbox(lbound, ubound, v, buffer))for v in verts]
-
-        for vert_obj, select in zip(bm.verts, to_select):
-            if select is True:
-                select = False
-            else:
-                select = True
-
-            if additive:
-                vert_obj.select |= select
-            else:
-                vert_obj.select = select
-
-    if select_mode == 'EDGE':
-        if coords == 'GLOBAL':
-            [verts.append([(world @ v.co).to_tuple() for v in e.verts]) for e in bm.edges]
-        elif coords == 'LOCAL':
-            [verts.append([v.co.to_tuple()for v in e.verts]) for e in bm.edges]
-
-        [to_select.append(all(in_bbox(lbound, ubound, v, buffer)for v in e)) for e in verts]
-
-        for edge_obj, select in zip(bm.edges, to_select):
-
-            if select is True:
-                select = False
-            else:
-                select = True
-
-            if additive:
-                edge_obj.select |= select
-            else:
-                edge_obj.select = select
-
-    if select_mode == 'FACE':
-        if coords == 'GLOBAL':
-            [verts.append([(world @ v.co).to_tuple() for v in f.verts])for f in bm.faces]
-        elif coords == 'LOCAL':
-            [verts.append([v.co.to_tuple()for v in f.verts]) for f in bm.faces]
-
-        [to_select.append(all(in_bbox(lbound, ubound, v, buffer) for v in f))for f in verts]
-
-        for face_obj, select in zip(bm.faces, to_select):
-
-            if select is True:
-                select = False
-            else:
-                select = True
 
-            if additive:
-                face_obj.select |= select
-            else:
-                face_obj.select = select
+    # select each piece that is not entirely within the rectangular prism
+    # defined by lbound and ubound and deselect the rest
+    elements, in_bounds = _elements_in_bbox(bm, lbound, ubound, select_mode, coords, buffer)
+    _set_selection(elements, ~in_bounds, additive)
 
     # update the edit mesh so we get live highlighting
     bmesh.update_edit_mesh(bpy.context.object.data)
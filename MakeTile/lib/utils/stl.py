@@ -0,0 +1,81 @@
+import numpy as np
+
+# binary STL facet: normal, 3 vertices and an unused attribute byte count
+_facet = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2')])
+
+_header = b'Binary STL exported by MakeTile'.ljust(80, b' ')
+
+
+def get_world_triangles(obj, depsgraph):
+    """Return the world space vertices and triangles of an object's evaluated mesh.
+
+    Args:
+        obj (bpy.types.Object): mesh object
+        depsgraph (bpy.types.Depsgraph): evaluated depsgraph
+
+    Returns:
+        numpy.ndarray: (n, 3) float64 vertex coordinates
+        numpy.ndarray: (m, 3) int32 vertex indices of triangles
+    """
+    object_eval = obj.evaluated_get(depsgraph)
+    mesh = object_eval.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('vertices', tris)
+    finally:
+        object_eval.to_mesh_clear()
+
+    matrix = np.array(object_eval.matrix_world, dtype=np.float64)
+    co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    return co, tris.reshape(-1, 3)
+
+
+def write_stl(filepath, objects, depsgraph, scale=1.0, centre=True):
+    """Write the evaluated meshes of objects to a single binary .stl file.
+
+    Reads the meshes straight from the depsgraph so no temporary objects or
+    meshes are created.
+
+    Args:
+        filepath (str): path to .stl file
+        objects (Iterable[bpy.types.Object]): mesh objects
+        depsgraph (bpy.types.Depsgraph): evaluated depsgraph
+        scale (float, optional): scale applied after centring
+        centre (bool, optional): move the median of the vertices to the origin, as origin_set does
+
+    Returns:
+        int: number of triangles written
+    """
+    verts = []
+    tris = []
+    offset = 0
+    for obj in objects:
+        co, obj_tris = get_world_triangles(obj, depsgraph)
+        verts.append(co)
+        tris.append(obj_tris + offset)
+        offset += len(co)
+
+    verts = np.concatenate(verts) if verts else np.empty((0, 3))
+    tris = np.concatenate(tris) if tris else np.empty((0, 3), dtype=np.int32)
+
+    if centre and len(verts):
+        verts -= verts.mean(axis=0)
+    verts *= scale
+
+    facets = np.zeros(len(tris), dtype=_facet)
+    tri_co = verts[tris]
+    normals = np.cross(tri_co[:, 1] - tri_co[:, 0], tri_co[:, 2] - tri_co[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    facets['normal'] = normals
+    facets['vertices'] = tri_co
+
+    with open(filepath, 'wb') as f:
+        f.write(b''.join((_header, np.array(len(tris), dtype='<u4').tobytes(), facets.tobytes())))
+    return len(tris)
@@ -68,17 +68,22 @@ def delete_object(obj_name):
 
 def view3d_find(return_area=False):
     """Returns first 3d view, Normally we get this from context
-    need it for loopcut override"""
-    for area in bpy.context.window.screen.areas:
-        if area.type == 'VIEW_3D':
-            v3d = area.spaces[0]
-            rv3d = v3d.region_3d
-            for region in area.regions:
-                if region.type == 'WINDOW':
-                    if return_area:
-                        return region, rv3d, v3d, area
-                    return region, rv3d, v3d
-    return None, None
+    need it for loopcut override. Returns Nones if there is no 3d view,
+    e.g. when running in background mode"""
+    window = bpy.context.window
+    if window is not None:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                v3d = area.spaces[0]
+                rv3d = v3d.region_3d
+                for region in area.regions:
+                    if region.type == 'WINDOW':
+                        if return_area:
+                            return region, rv3d, v3d, area
+                        return region, rv3d, v3d
+    if return_area:
+        return None, None, None, None
+    return None, None, None
 
 
 def add_circle_array(obj, tile_name, circle_center, item_count, axis, degrees_of_arc):
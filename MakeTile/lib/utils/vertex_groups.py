@@ -1,3 +1,4 @@
+import numpy as np
 import bpy
 import bmesh
 from . selection import (
@@ -26,11 +27,37 @@ def get_verts_with_material(obj, material_name):
     return verts
 
 
+def get_vert_group_mask(vert_group_name, obj):
+    '''returns a numpy bool array that is True for verts in a vert group'''
+    vg_index = obj.vertex_groups[vert_group_name].index
+    verts = obj.data.vertices
+    # vertex group membership isn't exposed to foreach_get so this needs one pass
+    return np.fromiter(
+        (any(vg.group == vg_index for vg in v.groups) for v in verts),
+        dtype=bool,
+        count=len(verts))
+
+
+def get_poly_mask(obj, vert_mask):
+    '''returns a numpy bool array that is True for polys whose verts are all in vert_mask'''
+    mesh = obj.data
+    if not len(mesh.polygons):
+        return np.zeros(0, dtype=bool)
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loop_verts)
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_start', loop_starts)
+    # polygons aren't guaranteed to be stored in loop order
+    order = np.argsort(loop_starts, kind='stable')
+    in_group = np.logical_and.reduceat(vert_mask[loop_verts], loop_starts[order])
+    poly_mask = np.empty_like(in_group)
+    poly_mask[order] = in_group
+    return poly_mask
+
+
 def get_vert_indexes_in_vert_group(vert_group_name, obj):
     '''returns a list of vert indexes in a vert group'''
-    vg_index = obj.vertex_groups[vert_group_name].index
-    vert_indices = [v.index for v in obj.data.vertices if vg_index in [vg.group for vg in v.groups]]
-    return vert_indices
+    return np.flatnonzero(get_vert_group_mask(vert_group_name, obj)).tolist()
 
 
 def get_verts_in_vert_group(vert_group_name, obj):
@@ -1,4 +1,6 @@
 import os
+import hashlib
+import numpy as np
 import bpy
 from pathlib import Path
 from .. utils.registration import get_prefs
@@ -6,7 +8,8 @@ from ..lib.utils.utils import slugify
 from ..lib.utils.file_handling import find_and_rename
 from .. lib.utils.vertex_groups import (
     get_verts_in_vert_group,
-    get_vert_indexes_in_vert_group)
+    get_vert_group_mask,
+    get_poly_mask)
 
 
 def load_materials(filepath):
@@ -18,10 +21,12 @@ def load_materials(filepath):
     with bpy.data.libraries.load(filepath) as (data_from, data_to):
         data_to.materials = data_from.materials
 
+    # the loaded materials are indexed too, so duplicates within the file are found
+    signature_index.sync()
     for new_mat in data_to.materials:
-        existing_mats = [mat for mat in bpy.data.materials if mat != new_mat]
-        unique, matched = material_is_unique(new_mat, existing_mats)
-        if not unique:
+        matched = signature_index.find(new_mat)
+        if matched is not None:
+            signature_index.discard(new_mat)
             bpy.data.materials.remove(new_mat)
 
 
@@ -33,6 +38,46 @@ def get_blend_filenames(directory_path):
     return blend_filenames
 
 
+def get_material(name):
+    """Return a material, linking it from the default material list on first use.
+
+    Args:
+        name (str): material name
+
+    Raises:
+        KeyError: if the material isn't in the file or the default material list
+
+    Returns:
+        bpy.types.Material: material
+    """
+    try:
+        return bpy.data.materials[name]
+    except KeyError:
+        link_default_materials([name])
+    return bpy.data.materials[name]
+
+
+def link_default_materials(names):
+    """Link materials in the default material list that aren't already in the file.
+
+    Args:
+        names (Iterable[str]): material names
+    """
+    prefs = get_prefs()
+    names = set(names)
+    by_path = {}
+    for mat in prefs.default_materials:
+        if mat.name in names and mat.name not in bpy.data.materials:
+            by_path.setdefault(mat.filepath, set()).add(mat.name)
+
+    for path, mats in by_path.items():
+        try:
+            with bpy.data.libraries.load(path, link=True) as (data_from, data_to):
+                data_to.materials = [mat for mat in data_from.materials if mat in mats]
+        except OSError as err:
+            print(err)
+
+
 def load_secondary_material():
     '''Adds a blank material to the passed in object.'''
     prefs = get_prefs()
@@ -57,15 +102,12 @@ def assign_mat_to_vert_group(vert_group, obj, material):
         obj (bpy.types.Object): Owning object
         material (bpy.types.Material): material
     """
-    vert_group = get_vert_indexes_in_vert_group(vert_group, obj)
-    material_index = get_material_index(obj, material)
-    for poly in obj.data.polygons:
-        count = 0
-        for vert in poly.vertices:
-            if vert in vert_group:
-                count += 1
-        if count == len(poly.vertices):
-            poly.material_index = material_index
+    polys = obj.data.polygons
+    poly_mask = get_poly_mask(obj, get_vert_group_mask(vert_group, obj))
+    material_indices = np.empty(len(polys), dtype=np.int32)
+    polys.foreach_get('material_index', material_indices)
+    material_indices[poly_mask] = get_material_index(obj, material)
+    polys.foreach_set('material_index', material_indices)
 
 
 def get_vert_group_material(vert_group, obj):
@@ -78,14 +120,46 @@ def get_vert_group_material(vert_group, obj):
     Returns:
         bpy.types.Material: material
     """
-    vert_group = get_vert_indexes_in_vert_group(vert_group.name, obj)
-    for poly in obj.data.polygons:
-        count = 0
-        for vert in poly.vertices:
-            if vert in vert_group:
-                count += 1
-        if count == len(poly.vertices):
-            return obj.material_slots[poly.material_index].material
+    poly_mask = get_poly_mask(obj, get_vert_group_mask(vert_group.name, obj))
+    polys = np.flatnonzero(poly_mask)
+    if len(polys):
+        poly = obj.data.polygons[int(polys[0])]
+        return obj.material_slots[poly.material_index].material
+
+
+def store_preview_materials(obj):
+    """Store which material is assigned to each vertex group of obj.
+
+    Args:
+        obj (bpy.types.Object): object
+    """
+    preview_materials = obj.mt_object_props.preview_materials
+    preview_materials.clear()
+
+    for group in obj.vertex_groups:
+        mat = preview_materials.add()
+        mat.vertex_group = group.name
+        mat.material = get_vert_group_material(group, obj)
+
+
+def assign_secondary_material(obj):
+    """Assign the secondary material to the whole of obj's mesh.
+
+    Args:
+        obj (bpy.types.Object): object
+    """
+    prefs = get_prefs()
+    secondary_material = get_material(prefs.secondary_material)
+    try:
+        sec_mat_index = get_material_index(obj, secondary_material)
+    except ValueError:
+        # we may need to add in ther secondary material if the user has used Blender's internal
+        # asset browser or linked the collection in manually
+        obj.data.materials.append(secondary_material)
+        sec_mat_index = get_material_index(obj, secondary_material)
+
+    polys = obj.data.polygons
+    polys.foreach_set('material_index', np.full(len(polys), sec_mat_index, dtype=np.int32))
 
 
 def add_preview_mesh_subsurf(obj):
@@ -98,7 +172,7 @@ def add_preview_mesh_subsurf(obj):
 
 
 def update_displacement_material_2(obj, primary_material_name):
-    primary_material = bpy.data.materials[primary_material_name]
+    primary_material = get_material(primary_material_name)
     obj['primary_material'] = primary_material
     obj.data.materials.append(primary_material)
 
@@ -106,7 +180,7 @@ def update_displacement_material_2(obj, primary_material_name):
 def update_preview_material_2(obj, primary_material_name):
     textured_groups = obj['textured_groups']
 
-    primary_material = bpy.data.materials[primary_material_name]
+    primary_material = get_material(primary_material_name)
     obj['primary_material'] = primary_material
     secondary_material = obj['secondary_material']
     obj.data.materials.append(secondary_material)
@@ -170,74 +244,120 @@ def assign_texture_to_areas(obj, primary_material, secondary_material):
     textured_vert_groups = obj.mt_textured_areas_coll
 
     if secondary_material not in material_slots:
-        obj.data.materials.append(bpy.data.materials[secondary_material])
+        obj.data.materials.append(get_material(secondary_material))
     if primary_material not in material_slots:
-        obj.data.materials.append(bpy.data.materials[primary_material])
+        obj.data.materials.append(get_material(primary_material))
 
     for group in textured_vert_groups:
         if group.value is False:
             assign_mat_to_vert_group(
-                group.name, obj, bpy.data.materials[secondary_material])
+                group.name, obj, get_material(secondary_material))
         else:
             assign_mat_to_vert_group(
-                group.name, obj, bpy.data.materials[primary_material])
+                group.name, obj, get_material(primary_material))
 
 # TODO Ensure this works for custom image material. I think we also need
 # to check whether image is unique otherwise it won't work
 
 
-def material_is_unique(material, materials):
+def material_is_unique(material, materials=None):
     """Check whether the passed in material already exists.
 
-    Parameters
-    material : bpy.types.Material
-        material to check for uniqueness
-    materials[list]: List of bpy.types.Material
-    Returns
-    Boolean
-        True if material is unique
+    Materials match if their names are the same apart from a numeric suffix
+    and they have the same nodes and VALUE node values.
+
+    Args:
+        material (bpy.types.Material): material to check for uniqueness
+        materials (list[bpy.types.Material], optional): materials to compare against.
+            Defaults to all other materials in the file, looked up in the signature index.
+
+    Returns:
+        bool: True if material is unique
+        bpy.types.Material | None: matching material. None if material is unique
+    """
+    if materials is None:
+        signature_index.sync()
+        matched = signature_index.find(material)
+    else:
+        signature = get_material_signature(material)
+        matched = next(
+            (mat for mat in materials if mat != material and get_material_signature(mat) == signature),
+            None)
+    return matched is None, matched
 
-    matched_material : bpy.types.Material
-        Matching material. None if material is unique
 
+def get_material_signature(material):
+    """Return a hash of what makes a material a duplicate of another.
+
+    Covers the material's name without any numeric suffix, the names and
+    types of its nodes and the value of each of its VALUE nodes.
+
+    Args:
+        material (bpy.types.Material): material
+
+    Returns:
+        str: hex digest
     """
-    found = []
-    # slugify material name and strip digits
-    mat_name = slugify(material.name.rstrip('0123456789. '))
-
-    # check if material shares a name with another material (minus numeric suffix)
-    for mat in materials:
-        stripped_name = slugify(mat.name.rstrip('0123456789. '))
-        if stripped_name == mat_name:
-            found.append(mat)
-
-    if len(found) == 0:
-        return True, None
-
-    # check if materials that share the same name share the same node tree by comparing names of nodes
-    mat_node_keys = material.node_tree.nodes.keys()
-
-    found_2 = []
-    for mat in found:
-        found_mat_node_keys = mat.node_tree.nodes.keys()
-        if mat_node_keys.sort() == found_mat_node_keys.sort():
-            found_2.append(mat)
-
-    if len(found_2) == 0:
-        return True, None
-
-    # check if all nodes of type 'VALUE' have the same default values on their outputs
-    mat_node_values = []
-    for node in material.node_tree.nodes:
-        if node.type == 'VALUE':
-            mat_node_values.append(node.outputs[0].default_value)
-
-    for mat in found_2:
-        found_mat_node_values = []
-        for node in mat.node_tree.nodes:
-            if node.type == 'VALUE':
-                found_mat_node_values.append(node.outputs[0].default_value)
-        if mat_node_values.sort() == found_mat_node_values.sort():
-            return False, mat
-
-    return True, None
+    nodes = material.node_tree.nodes if material.node_tree else []
+    h = hashlib.sha1()
+    h.update(repr((
+        slugify(material.name.rstrip('0123456789. ')),
+        sorted((node.name, node.bl_idname) for node in nodes),
+        sorted((node.name, node.outputs[0].default_value) for node in nodes if node.type == 'VALUE'))).encode())
+    return h.hexdigest()
+
+
+class MaterialSignatureIndex:
+    """Index of the materials in the file by their signature.
+
+    Deduplicating n materials against the m in the file takes one sync() and
+    n calls to find(), rather than comparing every pair. Materials can be
+    edited at any time so sync() signs every material again, and find()
+    checks a match against a fresh signature. Entries are keyed by
+    as_pointer() so materials with the same name from different libraries
+    are kept apart.
+    """
+
+    def __init__(self):
+        # {material.as_pointer(): (material, signature)}
+        self._entries = {}
+        # {signature: {material.as_pointer()}}
+        self._by_signature = {}
+
+    def sync(self):
+        """Index the materials in the file. Call before find()."""
+        self._entries.clear()
+        self._by_signature.clear()
+        for mat in bpy.data.materials:
+            signature = get_material_signature(mat)
+            self._entries[mat.as_pointer()] = (mat, signature)
+            self._by_signature.setdefault(signature, set()).add(mat.as_pointer())
+
+    def discard(self, material):
+        """Remove a material from the index, e.g. before deleting it.
+
+        Args:
+            material (bpy.types.Material): material
+        """
+        entry = self._entries.pop(material.as_pointer(), None)
+        if entry is not None:
+            self._by_signature[entry[1]].discard(material.as_pointer())
+
+    def find(self, material):
+        """Return an indexed material that duplicates material.
+
+        Args:
+            material (bpy.types.Material): material
+
+        Returns:
+            bpy.types.Material | None: matching material
+        """
+        signature = get_material_signature(material)
+        for pointer in self._by_signature.get(signature, ()):
+            mat = self._entries[pointer][0]
+            if mat != material and get_material_signature(mat) == signature:
+                return mat
+        return None
+
+
+signature_index = MaterialSignatureIndex()
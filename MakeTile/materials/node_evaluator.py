@@ -0,0 +1,903 @@
+"""Evaluate MakeTile displacement materials on the CPU.
+
+The displacement of a MakeTile material is the Color x Strength of its
+disp_emission node, which is normally baked to an image with Cycles.
+DisplacementEvaluator evaluates that node tree with NumPy at any number of
+points instead, so a tile can be made 3D without Cycles.
+
+Only the nodes used by the default materials are supported. The texture
+nodes are ports of their Cycles implementations so the heights match a
+baked map. Any other node raises UnsupportedNodeError and the material
+has to be baked.
+"""
+from collections import namedtuple
+from itertools import product
+import numpy as np
+import bpy
+
+# where a material is evaluated. All (n, 3) float arrays in object space
+# except matrix_world, the (4, 4) world matrix of the object
+ShadingPoints = namedtuple('ShadingPoints', ['position', 'normal', 'generated', 'uv', 'matrix_world'])
+
+# texture nodes use generated coordinates if their vector input isn't linked
+_texture_nodes = {
+    'ShaderNodeTexNoise',
+    'ShaderNodeTexVoronoi',
+    'ShaderNodeTexBrick',
+    'ShaderNodeTexChecker'}
+
+_luminance = np.array((0.2126729, 0.7151522, 0.0721750))
+
+# Cycles hashes voronoi cells with PCG rather than by the bits of their float coordinates from 4.2
+_pcg_voronoi = bpy.app.version >= (4, 2, 0)
+
+
+class UnsupportedNodeError(Exception):
+    """Raised when a material uses a node or setting the evaluator can't evaluate."""
+
+
+class DisplacementEvaluator:
+    """Evaluates the displacement of a MakeTile material.
+
+    Raises UnsupportedNodeError on creation if the material can't be
+    evaluated on the CPU.
+
+    Args:
+        material (bpy.types.Material): material with a disp_emission node
+    """
+
+    def __init__(self, material):
+        tree = material.node_tree
+        if tree is None or 'disp_emission' not in tree.nodes:
+            raise UnsupportedNodeError(material.name + ' has no disp_emission node')
+        self.material = material
+        self.node = tree.nodes['disp_emission']
+        # evaluating at a single point checks every node the output depends on
+        point = np.zeros((1, 3))
+        self.evaluate(ShadingPoints(point, point, point, point, np.identity(4)))
+
+    def evaluate(self, points):
+        """Return the displacement at points.
+
+        Matches a baked 8 bit map, whose channels are clamped to 0 - 1.
+
+        Args:
+            points (ShadingPoints): where to evaluate
+
+        Returns:
+            numpy.ndarray: (n,) heights
+        """
+        tree = _TreeEvaluator(points)
+        color = tree.input(self.node.inputs['Color'])
+        strength = tree.input(self.node.inputs['Strength'])
+        # the displace modifier uses the mean of the baked colour
+        return np.clip(color * strength[:, None], 0, 1).mean(axis=1)
+
+
+class _TreeEvaluator:
+    """Evaluates the sockets of a node tree, remembering node outputs.
+
+    Args:
+        points (ShadingPoints): where to evaluate
+        group_node (bpy.types.ShaderNodeGroup, optional): group node whose tree is evaluated
+        parent (_TreeEvaluator, optional): evaluator of the tree containing group_node
+    """
+
+    def __init__(self, points, group_node=None, parent=None):
+        self.points = points
+        self.size = len(points.position)
+        self.group_node = group_node
+        self.parent = parent
+        self._outputs = {}
+
+    def input(self, socket):
+        """Return the value of an input socket as an (n,) or (n, 3) array."""
+        kind = _socket_kind(socket)
+        links = [link for link in socket.links if not getattr(link, 'is_muted', False)]
+        if links:
+            from_socket = links[0].from_socket
+            return _convert(self.output(from_socket), _socket_kind(_trace_reroutes(from_socket)), kind)
+        if socket.name == 'Vector' and socket.node.bl_idname in _texture_nodes:
+            return self.points.generated
+        return self.constant(socket.default_value, kind)
+
+    def input_named(self, node, name):
+        """Return the value of the first enabled input of a node with an identifier or name of name."""
+        for socket in node.inputs:
+            if socket.enabled and name in {socket.identifier, socket.name}:
+                return self.input(socket)
+        raise UnsupportedNodeError(f'{node.name} has no input {name}')
+
+    def output(self, socket):
+        """Return the value of an output socket."""
+        node = socket.node
+        key = (node.name, socket.identifier)
+        if key not in self._outputs:
+            self._outputs[key] = self._evaluate(node, socket)
+        return self._outputs[key]
+
+    def constant(self, value, kind):
+        if kind == 'FLOAT':
+            return np.full(self.size, float(value))
+        return np.tile(np.array(value[:3], dtype=float), (self.size, 1))
+
+    def _evaluate(self, node, socket):
+        if node.mute:
+            for link in node.internal_links:
+                if link.to_socket == socket:
+                    return self.input(link.from_socket)
+            return self.constant(0.0, _socket_kind(socket))
+        if node.bl_idname == 'NodeReroute':
+            return self.input(node.inputs[0])
+        if node.bl_idname == 'NodeGroupInput':
+            if self.parent is None:
+                raise UnsupportedNodeError('Group input outside a group')
+            index = list(node.outputs).index(socket)
+            return self.parent.input(self.group_node.inputs[index])
+        if node.bl_idname == 'ShaderNodeGroup':
+            return _evaluate_group(self, node, socket)
+        try:
+            evaluate = _node_evaluators[node.bl_idname]
+        except KeyError:
+            raise UnsupportedNodeError(f'{node.bl_idname} nodes are not supported') from None
+        return evaluate(self, node, socket.identifier)
+
+
+def _trace_reroutes(socket):
+    while socket.node.bl_idname == 'NodeReroute' and socket.node.inputs[0].is_linked:
+        socket = socket.node.inputs[0].links[0].from_socket
+    return socket
+
+
+def _socket_kind(socket):
+    if socket.type in {'VALUE', 'INT', 'BOOLEAN'}:
+        return 'FLOAT'
+    if socket.type == 'VECTOR':
+        return 'VECTOR'
+    if socket.type == 'RGBA':
+        return 'COLOR'
+    raise UnsupportedNodeError(f'{socket.type} sockets are not supported')
+
+
+def _convert(value, from_kind, to_kind):
+    """Convert between socket types as Cycles does for links."""
+    if from_kind == to_kind or (from_kind != 'FLOAT' and to_kind != 'FLOAT'):
+        return value
+    if from_kind == 'FLOAT':
+        return np.repeat(value[:, None], 3, axis=1)
+    if from_kind == 'COLOR':
+        return value @ _luminance
+    return value.mean(axis=1)
+
+
+def _evaluate_group(tree, node, socket):
+    if node.node_tree is None:
+        raise UnsupportedNodeError(node.name + ' has no node tree')
+    outputs = [n for n in node.node_tree.nodes if n.bl_idname == 'NodeGroupOutput']
+    output_node = next((n for n in outputs if n.is_active_output), outputs[0] if outputs else None)
+    if output_node is None:
+        raise UnsupportedNodeError(node.node_tree.name + ' has no group output')
+    index = list(node.outputs).index(socket)
+    group = _TreeEvaluator(tree.points, node, tree)
+    value = group.input(output_node.inputs[index])
+    return _convert(value, _socket_kind(output_node.inputs[index]), _socket_kind(socket))
+
+
+# Input nodes
+
+def _tex_coord(tree, node, output):
+    points = tree.points
+    if output == 'Generated':
+        return points.generated
+    if output == 'Normal':
+        return points.normal
+    if output == 'UV':
+        return points.uv
+    if output == 'Object':
+        if node.object is None:
+            return points.position
+        matrix = np.linalg.inv(np.array(node.object.matrix_world)) @ np.array(points.matrix_world)
+        return points.position @ matrix[:3, :3].T + matrix[:3, 3]
+    raise UnsupportedNodeError(f'Texture coordinate {output} output is not supported')
+
+
+def _value(tree, node, output):
+    return tree.constant(node.outputs[0].default_value, 'FLOAT')
+
+
+def _rgb(tree, node, output):
+    return tree.constant(node.outputs[0].default_value, 'COLOR')
+
+
+# Vector nodes
+
+def _mapping(tree, node, output):
+    vector = tree.input_named(node, 'Vector')
+    rotation = tree.input_named(node, 'Rotation')
+    scale = tree.input_named(node, 'Scale')
+    mapping = node.vector_type
+    if mapping == 'POINT':
+        return _rotate(rotation, vector * scale) + tree.input_named(node, 'Location')
+    if mapping == 'TEXTURE':
+        location = tree.input_named(node, 'Location')
+        return _safe_divide(_rotate(rotation, vector - location, transpose=True), scale)
+    if mapping == 'VECTOR':
+        return _rotate(rotation, vector * scale)
+    return _normalize(_rotate(rotation, _safe_divide(vector, scale)))
+
+
+def _rotate(rotation, vector, transpose=False):
+    """Rotate vectors by XYZ euler rotations."""
+    c1, c2, c3 = np.cos(rotation).T
+    s1, s2, s3 = np.sin(rotation).T
+    matrix = np.array([
+        [c2 * c3, s1 * s2 * c3 - c1 * s3, c1 * s2 * c3 + s1 * s3],
+        [c2 * s3, s1 * s2 * s3 + c1 * c3, c1 * s2 * s3 - s1 * c3],
+        [-s2, s1 * c2, c1 * c2]])
+    if transpose:
+        matrix = matrix.transpose(1, 0, 2)
+    return np.einsum('ijn,nj->ni', matrix, vector)
+
+
+def _separate(tree, node, output):
+    if getattr(node, 'mode', 'RGB') != 'RGB':
+        raise UnsupportedNodeError(f'{node.mode} colour mode is not supported')
+    value = tree.input(node.inputs[0])
+    index = [socket.identifier for socket in node.outputs].index(output)
+    return value[:, index].copy()
+
+
+def _combine(tree, node, output):
+    if getattr(node, 'mode', 'RGB') != 'RGB':
+        raise UnsupportedNodeError(f'{node.mode} colour mode is not supported')
+    return np.stack([tree.input(socket) for socket in node.inputs[:3]], axis=1)
+
+
+def _vector_math(tree, node, output):
+    operation = node.operation
+    a = tree.input(node.inputs[0])
+    if operation in _vector_operations:
+        b = tree.input(node.inputs[1])
+        result = _vector_operations[operation](a, b)
+    elif operation == 'SCALE':
+        result = a * tree.input_named(node, 'Scale')[:, None]
+    elif operation == 'NORMALIZE':
+        result = _normalize(a)
+    elif operation == 'LENGTH':
+        result = np.linalg.norm(a, axis=1)
+    elif operation == 'DISTANCE':
+        result = np.linalg.norm(a - tree.input(node.inputs[1]), axis=1)
+    elif operation == 'DOT_PRODUCT':
+        result = (a * tree.input(node.inputs[1])).sum(axis=1)
+    elif operation == 'CROSS_PRODUCT':
+        result = np.cross(a, tree.input(node.inputs[1]))
+    elif operation == 'WRAP':
+        result = _wrap(a, tree.input(node.inputs[1]), tree.input(node.inputs[2]))
+    elif operation in _unary_operations:
+        result = _unary_operations[operation](a)
+    else:
+        raise UnsupportedNodeError(f'Vector math {operation} is not supported')
+
+    if output == 'Value':
+        return result if result.ndim == 1 else np.zeros(tree.size)
+    return result if result.ndim == 2 else np.zeros((tree.size, 3))
+
+
+# Converter nodes
+
+def _math(tree, node, output):
+    operation = node.operation
+    a, b, c = (tree.input(socket) for socket in node.inputs[:3])
+    if operation in _binary_operations:
+        result = _binary_operations[operation](a, b)
+    elif operation in _unary_operations:
+        result = _unary_operations[operation](a)
+    elif operation == 'MULTIPLY_ADD':
+        result = a * b + c
+    elif operation == 'COMPARE':
+        result = (np.abs(a - b) <= np.maximum(c, np.finfo(np.float32).eps)).astype(float)
+    elif operation == 'WRAP':
+        result = _wrap(a, b, c)
+    elif operation == 'SMOOTH_MIN':
+        result = _smooth_min(a, b, c)
+    elif operation == 'SMOOTH_MAX':
+        result = -_smooth_min(-a, -b, c)
+    else:
+        raise UnsupportedNodeError(f'Math {operation} is not supported')
+    if node.use_clamp:
+        result = np.clip(result, 0, 1)
+    return result
+
+
+def _safe_divide(a, b):
+    b = np.broadcast_to(b[:, None] if b.ndim < a.ndim else b, a.shape)
+    return np.divide(a, b, out=np.zeros(a.shape), where=b != 0)
+
+
+def _safe_modulo(a, b):
+    b = np.broadcast_to(b, a.shape)
+    return np.fmod(a, b, out=np.zeros(a.shape), where=b != 0)
+
+
+def _power(a, b):
+    valid = ~((a < 0) & (b != np.trunc(b)))
+    with np.errstate(all='ignore'):
+        return np.where(valid, np.power(a, b), 0.0)
+
+
+def _logarithm(a, b):
+    valid = (a > 0) & (b > 0)
+    return _safe_divide(np.log(np.where(valid, a, 1)), np.log(np.where(valid, b, 1)))
+
+
+def _inverse_sqrt(a):
+    return np.divide(1, np.sqrt(np.maximum(a, 0)), out=np.zeros(a.shape), where=a > 0)
+
+
+def _wrap(value, maximum, minimum):
+    value_range = maximum - minimum
+    with np.errstate(all='ignore'):
+        return np.where(value_range != 0, value - value_range * np.floor((value - minimum) / value_range), minimum)
+
+
+def _ping_pong(a, b):
+    with np.errstate(all='ignore'):
+        scaled = (a - b) / (b * 2)
+        return np.where(b != 0, np.abs((scaled - np.floor(scaled)) * b * 2 - b), 0.0)
+
+
+def _smooth_min(a, b, c):
+    with np.errstate(all='ignore'):
+        h = np.maximum(c - np.abs(a - b), 0) / c
+        return np.where(c != 0, np.minimum(a, b) - h * h * h * c / 6, np.minimum(a, b))
+
+
+def _normalize(a):
+    length = np.linalg.norm(a, axis=1, keepdims=True)
+    return np.divide(a, length, out=np.zeros(a.shape), where=length != 0)
+
+
+# operations shared by the math and vector math nodes
+_binary_operations = {
+    'ADD': np.add,
+    'SUBTRACT': np.subtract,
+    'MULTIPLY': np.multiply,
+    'DIVIDE': _safe_divide,
+    'POWER': _power,
+    'LOGARITHM': _logarithm,
+    'MINIMUM': np.minimum,
+    'MAXIMUM': np.maximum,
+    'LESS_THAN': lambda a, b: (a < b).astype(float),
+    'GREATER_THAN': lambda a, b: (a > b).astype(float),
+    'MODULO': _safe_modulo,
+    'FLOORED_MODULO': lambda a, b: np.where(b != 0, a - np.floor(_safe_divide(a, b)) * b, 0.0),
+    'SNAP': lambda a, b: np.floor(_safe_divide(a, b)) * b,
+    'PINGPONG': _ping_pong,
+    'ARCTAN2': np.arctan2}
+
+_vector_operations = {
+    name: _binary_operations[name]
+    for name in ('ADD', 'SUBTRACT', 'MULTIPLY', 'DIVIDE', 'MINIMUM', 'MAXIMUM', 'MODULO', 'SNAP')}
+
+_unary_operations = {
+    'SQRT': lambda a: np.sqrt(np.maximum(a, 0)),
+    'INVERSE_SQRT': _inverse_sqrt,
+    'ABSOLUTE': np.abs,
+    'EXPONENT': np.exp,
+    'SIGN': np.sign,
+    'ROUND': lambda a: np.floor(a + 0.5),
+    'FLOOR': np.floor,
+    'CEIL': np.ceil,
+    'TRUNC': np.trunc,
+    'FRACT': lambda a: a - np.floor(a),
+    'FRACTION': lambda a: a - np.floor(a),
+    'SINE': np.sin,
+    'COSINE': np.cos,
+    'TANGENT': np.tan,
+    'SINH': np.sinh,
+    'COSH': np.cosh,
+    'TANH': np.tanh,
+    'ARCSINE': lambda a: np.arcsin(np.clip(a, -1, 1)),
+    'ARCCOSINE': lambda a: np.arccos(np.clip(a, -1, 1)),
+    'ARCTANGENT': np.arctan,
+    'RADIANS': np.radians,
+    'DEGREES': np.degrees}
+
+
+def _map_range(tree, node, output):
+    if getattr(node, 'data_type', 'FLOAT') != 'FLOAT':
+        raise UnsupportedNodeError('Only float map range nodes are supported')
+    value = tree.input_named(node, 'Value')
+    from_min = tree.input_named(node, 'From Min')
+    from_max = tree.input_named(node, 'From Max')
+    to_min = tree.input_named(node, 'To Min')
+    to_max = tree.input_named(node, 'To Max')
+    interpolation = node.interpolation_type
+
+    if interpolation in {'LINEAR', 'STEPPED'}:
+        factor = _safe_divide(value - from_min, from_max - from_min)
+        if interpolation == 'STEPPED':
+            steps = tree.input_named(node, 'Steps')
+            factor = _safe_divide(np.floor(factor * (steps + 1)), steps)
+    else:
+        step = _smoothstep if interpolation == 'SMOOTHSTEP' else _smootherstep
+        reverse = from_min > from_max
+        factor = np.where(
+            reverse,
+            1 - step(from_max, from_min, value),
+            step(from_min, from_max, value))
+
+    result = np.where(from_max != from_min, to_min + factor * (to_max - to_min), 0.0)
+    if node.clamp and interpolation in {'LINEAR', 'STEPPED'}:
+        result = np.clip(result, np.minimum(to_min, to_max), np.maximum(to_min, to_max))
+    return result
+
+
+def _smoothstep(edge0, edge1, x):
+    t = np.clip(_safe_divide(x - edge0, edge1 - edge0), 0, 1)
+    return np.where(x < edge0, 0.0, np.where(x >= edge1, 1.0, t * t * (3 - 2 * t)))
+
+
+def _smootherstep(edge0, edge1, x):
+    x = np.clip(_safe_divide(x - edge0, edge1 - edge0), 0, 1)
+    return x * x * x * (x * (x * 6 - 15) + 10)
+
+
+def _clamp(tree, node, output):
+    value = tree.input_named(node, 'Value')
+    minimum = tree.input_named(node, 'Min')
+    maximum = tree.input_named(node, 'Max')
+    if node.clamp_type == 'RANGE':
+        minimum, maximum = np.minimum(minimum, maximum), np.maximum(minimum, maximum)
+    return np.minimum(np.maximum(value, minimum), maximum)
+
+
+def _color_ramp(tree, node, output):
+    # Cycles looks the ramp up in a table of 256 entries
+    ramp = node.color_ramp
+    table = np.array([ramp.evaluate(i / 255) for i in range(256)])
+    f = np.clip(tree.input_named(node, 'Fac'), 0, 1) * 255
+    i = np.clip(f.astype(int), 0, 255)
+    t = (f - i)[:, None]
+    result = table[i]
+    if ramp.interpolation != 'CONSTANT':
+        result = np.where(t > 0, (1 - t) * result + t * table[np.minimum(i + 1, 255)], result)
+    if output == 'Alpha':
+        return result[:, 3]
+    return result[:, :3]
+
+
+def _rgb_to_bw(tree, node, output):
+    return tree.input(node.inputs[0]) @ _luminance
+
+
+def _invert(tree, node, output):
+    factor = tree.input_named(node, 'Fac')[:, None]
+    color = tree.input_named(node, 'Color')
+    return factor * (1 - color) + (1 - factor) * color
+
+
+def _mix_rgb(tree, node, output):
+    factor = np.clip(tree.input_named(node, 'Fac'), 0, 1)
+    result = _blend(node.blend_type, factor, tree.input_named(node, 'Color1'), tree.input_named(node, 'Color2'))
+    return np.clip(result, 0, 1) if node.use_clamp else result
+
+
+def _mix(tree, node, output):
+    data_type = node.data_type
+    inputs = {socket.identifier: socket for socket in node.inputs}
+    if data_type == 'RGBA':
+        factor = tree.input(inputs['Factor_Float'])
+        if node.clamp_factor:
+            factor = np.clip(factor, 0, 1)
+        result = _blend(node.blend_type, factor, tree.input(inputs['A_Color']), tree.input(inputs['B_Color']))
+        return np.clip(result, 0, 1) if node.clamp_result else result
+
+    if data_type == 'FLOAT':
+        factor = tree.input(inputs['Factor_Float'])
+        a, b = tree.input(inputs['A_Float']), tree.input(inputs['B_Float'])
+    elif data_type == 'VECTOR':
+        if node.factor_mode == 'UNIFORM':
+            factor = tree.input(inputs['Factor_Float'])[:, None]
+        else:
+            factor = tree.input(inputs['Factor_Vector'])
+        a, b = tree.input(inputs['A_Vector']), tree.input(inputs['B_Vector'])
+    else:
+        raise UnsupportedNodeError(f'Mixing {data_type} is not supported')
+    if node.clamp_factor:
+        factor = np.clip(factor, 0, 1)
+    return (1 - factor) * a + factor * b
+
+
+def _blend(blend_type, factor, a, b):
+    t = factor[:, None]
+    tm = 1 - t
+    if blend_type == 'MIX':
+        return tm * a + t * b
+    if blend_type == 'ADD':
+        return tm * a + t * (a + b)
+    if blend_type == 'MULTIPLY':
+        return tm * a + t * (a * b)
+    if blend_type == 'SUBTRACT':
+        return tm * a + t * (a - b)
+    if blend_type == 'SCREEN':
+        return 1 - (tm + t * (1 - b)) * (1 - a)
+    if blend_type == 'DIFFERENCE':
+        return tm * a + t * np.abs(a - b)
+    if blend_type == 'DARKEN':
+        return tm * a + t * np.minimum(a, b)
+    if blend_type == 'LIGHTEN':
+        return tm * a + t * np.maximum(a, b)
+    if blend_type == 'DIVIDE':
+        return np.where(b != 0, tm * a + t * np.divide(a, b, out=np.zeros(a.shape), where=b != 0), a)
+    if blend_type == 'OVERLAY':
+        return np.where(a < 0.5, a * (tm + 2 * t * b), 1 - (tm + 2 * t * (1 - b)) * (1 - a))
+    raise UnsupportedNodeError(f'{blend_type} blending is not supported')
+
+
+# Hashes. Ports of the Jenkins lookup3 hashes used by Cycles
+
+def _rot(x, k):
+    return (x << np.uint32(k)) | (x >> np.uint32(32 - k))
+
+
+def _final(a, b, c):
+    c ^= b
+    c -= _rot(b, 14)
+    a ^= c
+    a -= _rot(c, 11)
+    b ^= a
+    b -= _rot(a, 25)
+    c ^= b
+    c -= _rot(b, 16)
+    a ^= c
+    a -= _rot(c, 4)
+    b ^= a
+    b -= _rot(a, 14)
+    c ^= b
+    c -= _rot(b, 24)
+    return c
+
+
+def _mix_hash(a, b, c):
+    a -= c
+    a ^= _rot(c, 4)
+    c += b
+    b -= a
+    b ^= _rot(a, 6)
+    a += c
+    c -= b
+    c ^= _rot(b, 8)
+    b += a
+    a -= c
+    a ^= _rot(c, 16)
+    c += b
+    b -= a
+    b ^= _rot(a, 19)
+    a += c
+    c -= b
+    c ^= _rot(b, 4)
+    b += a
+
+
+def _hash_uint(*keys):
+    """hash_uint, hash_uint2, hash_uint3 and hash_uint4 of uint32 arrays."""
+    keys = [np.asarray(key, dtype=np.uint32) for key in keys]
+    shape = np.broadcast(*keys).shape
+    a = np.full(shape, 0xdeadbeef + (len(keys) << 2) + 13, dtype=np.uint32)
+    b = a.copy()
+    c = a.copy()
+    if len(keys) == 4:
+        a += keys[0]
+        b += keys[1]
+        c += keys[2]
+        _mix_hash(a, b, c)
+        a += keys[3]
+    else:
+        for register, key in zip((a, b, c), keys):
+            register += key
+    return _final(a, b, c)
+
+
+def _hash_float(*keys):
+    """hash_floatN_to_float. Hashes the bits of float32 keys to a float in 0 - 1."""
+    bits = [np.ascontiguousarray(key, dtype=np.float32).view(np.uint32) for key in keys]
+    return _hash_uint(*bits).astype(np.float32) / np.float32(0xFFFFFFFF)
+
+
+def _hash_float3_to_float3(x, y, z):
+    return np.stack((
+        _hash_float(x, y, z),
+        _hash_float(x, y, z, np.ones_like(x)),
+        _hash_float(x, y, z, np.full_like(x, 2.0))), axis=1).astype(float)
+
+
+def _hash_int3(x, y, z):
+    """hash_int3_to_float3. Hashes int32 keys with PCG to floats in 0 - 1."""
+    with np.errstate(over='ignore'):
+        v = [np.asarray(k, dtype=np.int32) * np.int32(1664525) + np.int32(1013904223) for k in (x, y, z)]
+        for i in range(2):
+            v[0] += v[1] * v[2]
+            v[1] += v[2] * v[0]
+            v[2] += v[0] * v[1]
+            if i == 0:
+                v = [k ^ (k >> 16) for k in v]
+    return np.stack([(k & 0x7FFFFFFF).astype(np.float32) * np.float32(1 / 0x7FFFFFFF) for k in v], axis=1).astype(float)
+
+
+def _hash_cells(cells):
+    """Hash (n, 3) integer valued voronoi cell coordinates to (n, 3) floats in 0 - 1."""
+    if _pcg_voronoi:
+        return _hash_int3(*cells.astype(np.int64).astype(np.int32).T)
+    return _hash_float3_to_float3(*cells.T)
+
+
+def _int_to_uint(i):
+    return i.astype(np.int64).astype(np.uint32)
+
+
+# Noise texture
+
+_noise_scales = {1: 0.2500, 2: 0.6616, 3: 0.9820, 4: 0.8344}
+
+
+def _fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def _grad(h, p):
+    """The gradient functions grad1 to grad4 of Cycles' perlin noise."""
+    if len(p) == 1:
+        h = h & 15
+        return np.where(h & 8, -1.0, 1.0) * (1 + (h & 7)) * p[0]
+    if len(p) == 2:
+        h = h & 7
+        x, y = p
+        u = np.where(h < 4, x, y)
+        v = 2 * np.where(h < 4, y, x)
+        return np.where(h & 1, -u, u) + np.where(h & 2, -v, v)
+    if len(p) == 3:
+        h = h & 15
+        x, y, z = p
+        u = np.where(h < 8, x, y)
+        vt = np.where((h == 12) | (h == 14), x, z)
+        v = np.where(h < 4, y, vt)
+        return np.where(h & 1, -u, u) + np.where(h & 2, -v, v)
+    h = h & 31
+    x, y, z, w = p
+    u = np.where(h < 24, x, y)
+    v = np.where(h < 16, y, z)
+    s = np.where(h < 8, z, w)
+    return np.where(h & 1, -u, u) + np.where(h & 2, -v, v) + np.where(h & 4, -s, s)
+
+
+def _perlin(p):
+    """Perlin noise of 1 to 4 dimensional points given as a list of coordinate arrays."""
+    cells = [np.floor(x) for x in p]
+    fracts = [x - cell for x, cell in zip(p, cells)]
+    cells = [_int_to_uint(cell) for cell in cells]
+
+    # corners ordered with x changing fastest
+    values = []
+    for corner in product((0, 1), repeat=len(p)):
+        corner = corner[::-1]
+        h = _hash_uint(*(cell + np.uint32(offset) for cell, offset in zip(cells, corner)))
+        values.append(_grad(h, [f - offset for f, offset in zip(fracts, corner)]))
+
+    for f in fracts:
+        t = _fade(f)
+        values = [(1 - t) * values[i] + t * values[i + 1] for i in range(0, len(values), 2)]
+    return values[0]
+
+
+def _snoise(p):
+    """Signed perlin noise, repeated every 100000 to avoid precision problems."""
+    p = [np.fmod(x, 100000.0) + 0.5 * (np.abs(x) >= 1000000.0) for x in p]
+    return _noise_scales[len(p)] * _perlin(p)
+
+
+def _fractal_noise(p, detail, roughness, lacunarity, normalize):
+    """fBM noise. Parameters are scalars so every point has the same number of octaves."""
+    scale = 1.0
+    amp = 1.0
+    max_amp = 0.0
+    total = np.zeros_like(p[0])
+    for i in range(int(detail) + 1):
+        total = total + _snoise([x * scale for x in p]) * amp
+        max_amp += amp
+        amp *= roughness
+        scale *= lacunarity
+    remainder = detail - np.floor(detail)
+    if remainder != 0:
+        total2 = total + _snoise([x * scale for x in p]) * amp
+        if normalize:
+            return (1 - remainder) * (0.5 * total / max_amp + 0.5) + remainder * (0.5 * total2 / (max_amp + amp) + 0.5)
+        return (1 - remainder) * total + remainder * total2
+    if normalize:
+        return 0.5 * total / max_amp + 0.5
+    return total
+
+
+def _random_offset(seed, dimensions):
+    """random_floatN_offset. Offsets noise so each channel is different."""
+    if dimensions == 1:
+        return [100 + _hash_float(np.float32(seed)).item() * 100]
+    return [100 + _hash_float(np.float32(seed), np.float32(i)).item() * 100 for i in range(dimensions)]
+
+
+def _uniform(tree, node, name):
+    """Return the value of an input that must be the same at every point."""
+    value = tree.input_named(node, name)
+    if np.ptp(value) != 0:
+        raise UnsupportedNodeError(f'{node.name} {name} must not vary')
+    return float(value[0])
+
+
+def _noise_texture(tree, node, output):
+    if getattr(node, 'noise_type', 'FBM') != 'FBM':
+        raise UnsupportedNodeError(f'{node.noise_type} noise is not supported')
+    dimensions = int(node.noise_dimensions[0])
+    scale = tree.input_named(node, 'Scale')
+    vector = tree.input_named(node, 'Vector') * scale[:, None] if dimensions > 1 else None
+    w = tree.input_named(node, 'W') * scale if dimensions in {1, 4} else None
+    p = {1: lambda: [w], 2: lambda: list(vector.T[:2]), 3: lambda: list(vector.T), 4: lambda: list(vector.T) + [w]}[dimensions]()
+
+    detail = np.clip(_uniform(tree, node, 'Detail'), 0, 15)
+    roughness = max(_uniform(tree, node, 'Roughness'), 0)
+    lacunarity = _uniform(tree, node, 'Lacunarity') if 'Lacunarity' in node.inputs else 2.0
+    normalize = getattr(node, 'normalize', True)
+    if 'Lacunarity' not in node.inputs:
+        # before Blender 4.0 roughness was clamped to 1
+        roughness = min(roughness, 1)
+    distortion = tree.input_named(node, 'Distortion')
+
+    if np.any(distortion != 0):
+        p = [
+            x + _snoise([y + offset for y, offset in zip(p, _random_offset(i, dimensions))]) * distortion
+            for i, x in enumerate(p)]
+
+    fac = _fractal_noise(p, detail, roughness, lacunarity, normalize)
+    if output == 'Fac':
+        return fac
+    seed = dimensions if dimensions > 1 else 1
+    channels = [
+        _fractal_noise([x + offset for x, offset in zip(p, _random_offset(seed + i, dimensions))], detail, roughness, lacunarity, normalize)
+        for i in range(2)]
+    return np.stack([fac] + channels, axis=1)
+
+
+# Voronoi texture
+
+def _voronoi_texture(tree, node, output):
+    if node.voronoi_dimensions != '3D':
+        raise UnsupportedNodeError(f'{node.voronoi_dimensions} voronoi is not supported')
+    if node.feature not in {'F1', 'F2'}:
+        raise UnsupportedNodeError(f'Voronoi {node.feature} is not supported')
+    if 'Detail' in node.inputs and (_uniform(tree, node, 'Detail') != 0 or getattr(node, 'normalize', False)):
+        raise UnsupportedNodeError('Fractal voronoi is not supported')
+
+    scale = tree.input_named(node, 'Scale')
+    coord = tree.input_named(node, 'Vector') * scale[:, None]
+    randomness = np.clip(tree.input_named(node, 'Randomness'), 0, 1)[:, None]
+    metric = node.distance
+    exponent = tree.input_named(node, 'Exponent') if metric == 'MINKOWSKI' else None
+
+    cell = np.floor(coord)
+    local = coord - cell
+    n = len(coord)
+    # distance, cell offset and position of the closest and second closest points
+    d1, d2 = np.full(n, 8.0), np.full(n, 8.0)
+    o1, o2, p1, p2 = (np.zeros((n, 3)) for i in range(4))
+    for k, j, i in product((-1, 0, 1), repeat=3):
+        offset = np.array((i, j, k), dtype=float)
+        point = offset + _hash_cells(cell + offset) * randomness
+        distance = _voronoi_distance(point - local, metric, exponent)
+
+        closer = distance < d1
+        second = ~closer & (distance < d2)
+        d2 = np.where(closer, d1, np.where(second, distance, d2))
+        o2 = np.where(closer[:, None], o1, np.where(second[:, None], offset, o2))
+        p2 = np.where(closer[:, None], p1, np.where(second[:, None], point, p2))
+        d1 = np.where(closer, distance, d1)
+        o1 = np.where(closer[:, None], offset, o1)
+        p1 = np.where(closer[:, None], point, p1)
+
+    distance, offset, position = (d1, o1, p1) if node.feature == 'F1' else (d2, o2, p2)
+    if output == 'Distance':
+        return distance
+    if output == 'Color':
+        return _hash_cells(cell + offset)
+    if output == 'Position':
+        return _safe_divide(position + cell, scale)
+    raise UnsupportedNodeError(f'Voronoi {output} output is not supported')
+
+
+def _voronoi_distance(d, metric, exponent):
+    if metric == 'EUCLIDEAN':
+        return np.linalg.norm(d, axis=1)
+    if metric == 'MANHATTAN':
+        return np.abs(d).sum(axis=1)
+    if metric == 'CHEBYCHEV':
+        return np.abs(d).max(axis=1)
+    return (np.abs(d) ** exponent[:, None]).sum(axis=1) ** (1 / exponent)
+
+
+# Brick texture
+
+def _brick_noise(n):
+    n = (n.astype(np.int64).astype(np.uint32) + np.uint32(1013)) & np.uint32(0x7fffffff)
+    n = (n >> np.uint32(13)) ^ n
+    nn = (n * (n * n * np.uint32(60493) + np.uint32(19990303)) + np.uint32(1376312589)) & np.uint32(0x7fffffff)
+    return 0.5 * (nn / 1073741824.0)
+
+
+def _brick_texture(tree, node, output):
+    scale = tree.input_named(node, 'Scale')
+    p = tree.input_named(node, 'Vector') * scale[:, None]
+    mortar_size = tree.input_named(node, 'Mortar Size')
+    mortar_smooth = tree.input_named(node, 'Mortar Smooth')
+    bias = tree.input_named(node, 'Bias')
+    brick_width = tree.input_named(node, 'Brick Width')
+    row_height = tree.input_named(node, 'Row Height')
+
+    row = np.floor(p[:, 1] / row_height).astype(np.int64)
+    offset = np.zeros(len(p))
+    if node.offset_frequency and node.squash_frequency:
+        brick_width = np.where(row % node.squash_frequency, brick_width, brick_width * node.squash)
+        offset = np.where(row % node.offset_frequency, 0.0, brick_width * node.offset)
+    brick = np.floor((p[:, 0] + offset) / brick_width).astype(np.int64)
+    x = (p[:, 0] + offset) - brick_width * brick
+    y = p[:, 1] - row_height * row
+
+    tint = np.clip(_brick_noise((row << 16) + (brick & 0xFFFF)) + bias, 0, 1)
+    min_dist = np.minimum(np.minimum(x, y), np.minimum(brick_width - x, row_height - y))
+    with np.errstate(all='ignore'):
+        smooth_dist = 1 - min_dist / mortar_size
+        t = smooth_dist / mortar_smooth
+        smoothed = np.where(smooth_dist < mortar_smooth, 3 * t * t - 2 * t * t * t, 1.0)
+    mortar = np.where(min_dist >= mortar_size, 0.0, np.where(mortar_smooth == 0, 1.0, smoothed))
+
+    if output == 'Fac':
+        return mortar
+    color1 = tree.input_named(node, 'Color1')
+    color2 = tree.input_named(node, 'Color2')
+    brick_color = (1 - tint)[:, None] * color1 + tint[:, None] * color2
+    return np.where((mortar == 1)[:, None], tree.input_named(node, 'Mortar'), brick_color)
+
+
+# Checker texture
+
+def _checker_texture(tree, node, output):
+    p = tree.input_named(node, 'Vector') * tree.input_named(node, 'Scale')[:, None]
+    p = (p + 0.000001) * 0.999999
+    xi, yi, zi = np.abs(np.floor(p)).astype(np.int64).T
+    fac = ((xi % 2 == yi % 2) == (zi % 2)).astype(float)
+    if output == 'Fac':
+        return fac
+    return np.where(fac[:, None] == 1, tree.input_named(node, 'Color1'), tree.input_named(node, 'Color2'))
+
+
+_node_evaluators = {
+    'ShaderNodeTexCoord': _tex_coord,
+    'ShaderNodeValue': _value,
+    'ShaderNodeRGB': _rgb,
+    'ShaderNodeMapping': _mapping,
+    'ShaderNodeSeparateXYZ': _separate,
+    'ShaderNodeSeparateRGB': _separate,
+    'ShaderNodeSeparateColor': _separate,
+    'ShaderNodeCombineXYZ': _combine,
+    'ShaderNodeCombineRGB': _combine,
+    'ShaderNodeCombineColor': _combine,
+    'ShaderNodeVectorMath': _vector_math,
+    'ShaderNodeMath': _math,
+    'ShaderNodeMapRange': _map_range,
+    'ShaderNodeClamp': _clamp,
+    'ShaderNodeValToRGB': _color_ramp,
+    'ShaderNodeRGBToBW': _rgb_to_bw,
+    'ShaderNodeInvert': _invert,
+    'ShaderNodeMixRGB': _mix_rgb,
+    'ShaderNodeMix': _mix,
+    'ShaderNodeTexNoise': _noise_texture,
+    'ShaderNodeTexVoronoi': _voronoi_texture,
+    'ShaderNodeTexBrick': _brick_texture,
+    'ShaderNodeTexChecker': _checker_texture}
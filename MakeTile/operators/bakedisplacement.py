@@ -2,13 +2,15 @@
 import bpy
 from .. materials.materials import (
     assign_mat_to_vert_group,
-    get_vert_group_material,
-    get_material_index)
+    store_preview_materials,
+    assign_secondary_material)
 from .. lib.utils.vertex_groups import (
     get_verts_with_material,
     clear_vert_group)
 from .. utils.registration import get_prefs
 from ..lib.utils.selection import deselect_all, select, activate
+from ..lib.utils.bake_cache import bake_cache
+from .vertex_displacement import displace_on_cpu, displace_with_image
 
 class MT_OT_Assign_Material_To_Vert_Group(bpy.types.Operator):
     """Assigns the active material to the selected vertex group"""
@@ -128,32 +130,45 @@ class MT_OT_Make_3D(bpy.types.Operator):
         selected_objects = context.selected_objects
         orig_render_settings = set_cycles_to_bake_mode()
 
-        for obj in selected_objects:
+        disp_objects = [
+            obj for obj in selected_objects
+            if obj.mt_object_props.is_displacement and not obj.mt_object_props.is_displaced]
+        if context.scene.mt_scene_props.displacement_method == 'CPU':
+            # objects whose materials can't be evaluated on the CPU are baked
+            to_bake = displace_on_cpu(disp_objects)
+            for obj, reason in to_bake.items():
+                self.report({'INFO'}, f'{obj.name} will be baked. {reason}')
+            disp_objects = list(to_bake)
+        disp_images = bake_displacement_maps(disp_objects)
+
+        for obj in disp_objects:
             obj_props = obj.mt_object_props
+            # tile = bpy.data.collections[obj_props.tile_name]
+            disp_strength = obj_props.displacement_strength
+            # disp_strength = context.scene.mt_scene_props.displacement_strength
+
+            disp_image = disp_images[obj]
 
-            # if obj_props.geometry_type == 'PREVIEW':
-            if obj_props.is_displacement and not obj_props.is_displaced:
-                # tile = bpy.data.collections[obj_props.tile_name]
-                disp_strength = obj_props.displacement_strength
-                # disp_strength = context.scene.mt_scene_props.displacement_strength
+            disp_texture = obj_props.disp_texture
+            disp_texture.image = disp_image
 
-                disp_image = bake_displacement_map(obj)
+            if context.scene.mt_scene_props.apply_displacement:
+                displace_with_image(obj, disp_image)
+                continue
 
-                disp_texture = obj_props.disp_texture
-                disp_texture.image = disp_image
-                disp_mod = obj.modifiers[obj_props.disp_mod_name]
-                disp_mod.texture = disp_texture
-                disp_mod.strength = disp_strength
-                subsurf_mod = obj.modifiers[obj_props.subsurf_mod_name]
-                #subsurf_mod.levels = bpy.context.scene.mt_scene_props.subdivisions
-                subsurf_mod.show_viewport = True
+            disp_mod = obj.modifiers[obj_props.disp_mod_name]
+            disp_mod.texture = disp_texture
+            disp_mod.strength = disp_strength
+            subsurf_mod = obj.modifiers[obj_props.subsurf_mod_name]
+            #subsurf_mod.levels = bpy.context.scene.mt_scene_props.subdivisions
+            subsurf_mod.show_viewport = True
 
-                with context.temp_override(selected_objects=[obj],selected_editable_objects=[obj],active_object=obj,object=obj):
-                    bpy.ops.object.modifier_move_to_index(
-                       modifier=subsurf_mod.name, index=0)
+            with context.temp_override(selected_objects=[obj],selected_editable_objects=[obj],active_object=obj,object=obj):
+                bpy.ops.object.modifier_move_to_index(
+                   modifier=subsurf_mod.name, index=0)
 
-                # obj_props.geometry_type = 'DISPLACEMENT'
-                obj_props.is_displaced = True
+            # obj_props.geometry_type = 'DISPLACEMENT'
+            obj_props.is_displaced = True
 
         reset_renderer_from_bake(orig_render_settings)
         return {'FINISHED'}
@@ -194,6 +209,17 @@ def reset_renderer_from_bake(orig_settings):
     context.scene.render.engine = orig_settings['orig_engine']
 
 
+class MT_OT_Clear_Bake_Cache(bpy.types.Operator):
+    """Delete all cached displacement maps"""
+    bl_idname = "scene.mt_clear_bake_cache"
+    bl_label = "Clear Bake Cache"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        bake_cache.clear()
+        return {'FINISHED'}
+
+
 def bake_displacement_map(obj):
     """Bake a displacement map for an object with MakeTile displacement materials.
 
@@ -203,54 +229,101 @@ def bake_displacement_map(obj):
     Returns:
         bpy.types.image: Displacement Map
     """
-    hide_render = obj.hide_render
-    obj.hide_render = False
-    context = bpy.context
-    prefs = get_prefs()
-    image_resolution = context.scene.mt_scene_props.tile_resolution
-    disp_image = bpy.data.images.new(
-        obj.name + '.image',
-        width=image_resolution,
-        height=image_resolution,
-        alpha=True,
-        float_buffer=False,
-        is_data=True
-    )
-    disp_image.file_format = 'PNG'
+    return bake_displacement_maps([obj])[obj]
 
-    disp_materials = []
-    mat_set = set()
-    for item in obj.material_slots.items():
-        if item[0]:
-            material = bpy.data.materials[item[0]]
-            tree = material.node_tree
 
-            if 'disp_emission' in tree.nodes and material not in mat_set:
-                # plug emission node into output for baking
-                disp_materials.append(material)
-                mat_set.add(material)
-                displacement_emission_node = tree.nodes['disp_emission']
-                mat_output_node = tree.nodes['Material Output']
+def bake_displacement_maps(objects, prepare=None):
+    """Bake displacement maps for several objects in a single Cycles bake.
 
-                tree.links.new(
-                    displacement_emission_node.outputs['Emission'],
-                    mat_output_node.inputs['Surface'])
+    Each object is baked into its own image, so Cycles only syncs the scene
+    once. A material's texture node can only bake to one image at a time, so
+    objects that share a displacement material with an object already in the
+    bake are given temporary copies of their materials, which are swapped
+    back once they are baked. Maps in the bake cache aren't baked at all.
 
-                # sever displacement node link because otherwise it screws up baking
-                displacement_node = tree.nodes['final_disp']
-                link = displacement_node.outputs[0].links[0]
-                tree.links.remove(link)
+    Args:
+        objects (list[bpy.types.Object]): objects with MakeTile displacement materials
+        prepare (function, optional): called with each object before it is baked,
+            e.g. to randomise its material
 
-                # save displacement strength
-                strength_node = tree.nodes['Strength']
+    Returns:
+        dict{bpy.types.Object: bpy.types.Image}: displacement map of each object
+    """
+    resolution = bpy.context.scene.mt_scene_props.tile_resolution
+    images = {}
+    # objects to bake together, as (object, materials, cache key, material copies)
+    batch = []
+    batch_materials = set()
+
+    for obj in objects:
+        disp_materials = _get_disp_materials(obj)
+
+        # copy before prepare so it doesn't change materials already in the batch
+        copies = []
+        if batch_materials.intersection(disp_materials):
+            copies = _use_material_copies(obj, disp_materials)
+            disp_materials = _get_disp_materials(obj)
+
+        if prepare is not None:
+            prepare(obj)
+
+        _add_uv_layer(obj)
+
+        # reuse a previous bake if nothing that affects it has changed
+        cache_key = bake_cache.get_key(obj, disp_materials, resolution)
+        disp_image = bake_cache.load(cache_key, obj.name + '.image')
+        if disp_image is None:
+            batch.append((obj, disp_materials, cache_key, copies))
+            batch_materials.update(disp_materials)
+        else:
+            _restore_materials(obj, copies)
+            for material in _get_disp_materials(obj):
+                material.node_tree.nodes['disp_texture_node'].image = disp_image
+            _finish_bake(obj, disp_image)
+            images[obj] = disp_image
 
-                # assign image to image node
-                texture_node = tree.nodes['disp_texture_node']
-                texture_node.image = disp_image
+    images.update(_bake_batch(batch, resolution))
+    return images
 
-    context.scene.render.bake_type = 'DISPLACEMENT'
-    context.scene.render.bake_margin = 10
 
+def _use_material_copies(obj, materials):
+    """Assign copies of materials to obj's material slots.
+
+    Returns:
+        list[tuple(int, bpy.types.Material)]: slot index and original material of each copied slot
+    """
+    copies = {}
+    swapped = []
+    for index, slot in enumerate(obj.material_slots):
+        if slot.material in materials:
+            if slot.material not in copies:
+                copies[slot.material] = slot.material.copy()
+            swapped.append((index, slot.material))
+            slot.material = copies[slot.material]
+    return swapped
+
+
+def _restore_materials(obj, swapped):
+    """Swap the original materials back into obj's slots and delete the copies."""
+    for index, material in swapped:
+        slot = obj.material_slots[index]
+        copy = slot.material
+        slot.material = material
+        if copy is not None and copy.users == 0:
+            bpy.data.materials.remove(copy)
+
+
+def _get_disp_materials(obj):
+    disp_materials = []
+    for item in obj.material_slots.items():
+        if item[0]:
+            material = bpy.data.materials[item[0]]
+            if 'disp_emission' in material.node_tree.nodes and material not in disp_materials:
+                disp_materials.append(material)
+    return disp_materials
+
+
+def _add_uv_layer(obj):
     # check to see if there is a UV layer and if not make one. Can't get context override to work.
     if len(obj.data.uv_layers) == 0:
         deselect_all()
@@ -264,15 +337,95 @@ def bake_displacement_map(obj):
         bpy.ops.mesh.select_all(action='DESELECT')
         bpy.ops.object.editmode_toggle()
 
+
+def _new_disp_image(name, resolution):
+    disp_image = bpy.data.images.new(
+        name,
+        width=resolution,
+        height=resolution,
+        alpha=True,
+        float_buffer=False,
+        is_data=True
+    )
+    disp_image.file_format = 'PNG'
+    return disp_image
+
+
+def _bake_batch(batch, resolution):
+    """Bake the objects in batch in a single Cycles bake.
+
+    Args:
+        batch (list[tuple(bpy.types.Object, list[bpy.types.Material], str, list)]): objects,
+            their displacement materials, cache keys and material copies from _use_material_copies.
+            Objects mustn't share materials.
+        resolution (int): image resolution
+
+    Returns:
+        dict{bpy.types.Object: bpy.types.Image}: displacement map of each object
+    """
+    if not batch:
+        return {}
+
+    images = {}
+    material_images = {}
+    for obj, materials, cache_key, copies in batch:
+        images[obj] = _new_disp_image(obj.name + '.image', resolution)
+        for material in materials:
+            material_images[material] = images[obj]
+
+    _bake([obj for obj, materials, cache_key, copies in batch], material_images)
+
+    for obj, materials, cache_key, copies in batch:
+        bake_cache.save(cache_key, images[obj])
+        if copies:
+            _restore_materials(obj, copies)
+            for material in _get_disp_materials(obj):
+                material.node_tree.nodes['disp_texture_node'].image = images[obj]
+        _finish_bake(obj, images[obj])
+    return images
+
+
+def _bake(objects, material_images):
+    """Bake the displacement of objects with a single Cycles bake.
+
+    Args:
+        objects (list[bpy.types.Object]): objects
+        material_images (dict{bpy.types.Material: bpy.types.Image}): image to bake each material to
+    """
+    context = bpy.context
+    hide_render = [obj.hide_render for obj in objects]
+    for obj in objects:
+        obj.hide_render = False
+
+    for material, disp_image in material_images.items():
+        tree = material.node_tree
+
+        # plug emission node into output for baking
+        displacement_emission_node = tree.nodes['disp_emission']
+        mat_output_node = tree.nodes['Material Output']
+
+        tree.links.new(
+            displacement_emission_node.outputs['Emission'],
+            mat_output_node.inputs['Surface'])
+
+        # sever displacement node link because otherwise it screws up baking
+        displacement_node = tree.nodes['final_disp']
+        link = displacement_node.outputs[0].links[0]
+        tree.links.remove(link)
+
+        # assign image to image node
+        texture_node = tree.nodes['disp_texture_node']
+        texture_node.image = disp_image
+
+    context.scene.render.bake_type = 'DISPLACEMENT'
+    context.scene.render.bake_margin = 10
+
     # bake
-    with bpy.context.temp_override(selected_objects=[obj],selected_editable_objects=[obj],selectable_objects=[obj],active_object=obj,object=obj,visible_objects=[obj],editable_objects=[obj],objects_in_mode=[obj]):
+    with bpy.context.temp_override(selected_objects=objects,selected_editable_objects=objects,selectable_objects=objects,active_object=objects[0],object=objects[0],visible_objects=objects,editable_objects=objects,objects_in_mode=objects):
         bpy.ops.object.bake(type='EMIT')
 
-    # pack image
-    disp_image.pack()
-
     # reset shaders
-    for material in disp_materials:
+    for material in material_images:
         tree = material.node_tree
         surface_shader_node = tree.nodes['surface_shader']
         displacement_node = tree.nodes['final_disp']
@@ -282,29 +435,16 @@ def bake_displacement_map(obj):
         tree.links.new(
             displacement_node.outputs['Displacement'], mat_output_node.inputs['Displacement'])
 
-    preview_materials = obj.mt_object_props.preview_materials
-    preview_materials.clear()
-
-    # store which material is assigned to which vertex group
-    for group in obj.vertex_groups:
-        mat = preview_materials.add()
-        mat.vertex_group = group.name
-        mat.material = get_vert_group_material(group, obj)
-
-    # assign secondary material to entire mesh
-    # We do this because when the mesh is being displaced we want to see what the actual geometry is without any texture
-    try:
-        sec_mat_index = get_material_index(
-            obj, bpy.data.materials[prefs.secondary_material])
-    except ValueError:
-        # we may need to add in ther secondary material if the user has used Blender's internal
-        # asset browser or linked the collection in manually
-        obj.data.materials.append(bpy.data.materials[prefs.secondary_material])
-        sec_mat_index = get_material_index(
-            obj, bpy.data.materials[prefs.secondary_material])
-
-    for poly in obj.data.polygons:
-        poly.material_index = sec_mat_index
-
-    obj.hide_render = hide_render
-    return disp_image
+    for obj, hidden in zip(objects, hide_render):
+        obj.hide_render = hidden
+
+
+def _finish_bake(obj, disp_image):
+    """Pack the map and switch obj to its secondary material."""
+    # pack image
+    disp_image.pack()
+
+    # We assign the secondary material to the entire mesh because when the mesh is being
+    # displaced we want to see what the actual geometry is without any texture
+    store_preview_materials(obj)
+    assign_secondary_material(obj)
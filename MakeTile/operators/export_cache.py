@@ -0,0 +1,242 @@
+"""Content hashes of tile variants so unchanged variants aren't exported again.
+
+A variant's hash covers its tile's properties, the geometry, modifiers and
+material node trees of the objects that are exported, the variant's seed and
+the export settings. Datablocks are hashed by content rather than name, so
+identical tiles have the same hash. Exported variants are recorded in a manifest in the export
+directory, and a variant whose hash is in the manifest and whose file still
+exists is reused rather than exported again.
+"""
+import os
+import json
+import time
+import hashlib
+import numpy as np
+import bpy
+from ..lib.utils.hashing import hash_node_tree, hashable_value, update_hash
+
+MANIFEST_NAME = 'maketile_exports.json'
+
+# bump to invalidate existing manifests when what is hashed changes
+_hash_version = 2
+
+# scene settings that change the exported mesh
+_export_settings = (
+    'export_units',
+    'export_subdivs',
+    'tile_resolution',
+    'voxelise_on_export',
+    'voxel_size',
+    'voxel_adaptivity',
+    'decimate_on_export',
+    'decimation_ratio',
+    'planar_decimation',
+    'planar_decimation_angle',
+    'fix_non_manifold',
+    'displacement_method',
+    'apply_displacement')
+
+# properties that change during export or only affect the UI
+_volatile_props = {
+    'rna_type',
+    'is_active',
+    'is_displaced',
+    'is_override_data',
+    'show_expanded',
+    'show_viewport',
+    'show_in_editmode',
+    'show_on_cage',
+    'execution_time',
+    'preview_mesh',
+    'persistent_uid',
+    # names don't change the exported mesh
+    'name',
+    'tile_name'}
+
+
+def get_tile_hash(context, collection, objects):
+    """Return a hash of everything about a tile that affects its exported mesh.
+
+    Args:
+        context (bpy.context): context
+        collection (bpy.types.Collection): tile collection
+        objects (list[bpy.types.Object]): objects that are exported
+
+    Returns:
+        str: hex digest
+    """
+    h = hashlib.sha1()
+    update_hash(h, _hash_version, _rna_values(collection.mt_tile_props))
+    seen = set()
+    for obj in sorted(objects, key=lambda obj: obj.name):
+        _hash_object(h, obj, seen)
+    return h.hexdigest()
+
+
+def get_variant_hash(context, tile_hash, seed):
+    """Return the hash of a tile variant.
+
+    Args:
+        context (bpy.context): context
+        tile_hash (str): hash returned by get_tile_hash
+        seed (float | None): variant seed
+
+    Returns:
+        str: hex digest
+    """
+    scene_props = context.scene.mt_scene_props
+    h = hashlib.sha1()
+    update_hash(h, tile_hash, seed, [getattr(scene_props, name) for name in _export_settings])
+    return h.hexdigest()
+
+
+def get_variant_seed(tile_hash, variant):
+    """Return a seed for a variant that is the same each time the tile is exported.
+
+    Args:
+        tile_hash (str): hash returned by get_tile_hash
+        variant (int): variant number
+
+    Returns:
+        float: seed between 0 and 1
+    """
+    digest = hashlib.sha1(f'{tile_hash}:{variant}'.encode()).hexdigest()
+    return int(digest[:13], 16) / 16 ** 13
+
+
+def load_manifest(export_path):
+    """Load the export manifest of a directory.
+
+    Args:
+        export_path (str): export directory
+
+    Returns:
+        dict: {hash: {'file': file name, 'collection': str, 'variant': int, 'seed': float, 'time': float}}
+    """
+    try:
+        with open(os.path.join(export_path, MANIFEST_NAME)) as f:
+            return json.load(f)['exports']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_manifest(export_path, exports):
+    """Save the export manifest of a directory.
+
+    Args:
+        export_path (str): export directory
+        exports (dict): manifest entries as returned by load_manifest
+    """
+    manifest_path = os.path.join(export_path, MANIFEST_NAME)
+    temp_path = manifest_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump({'version': _hash_version, 'exports': exports}, f, indent=1)
+    os.replace(temp_path, manifest_path)
+
+
+def split_reused_jobs(jobs):
+    """Separate jobs that have already been exported from those that need exporting.
+
+    Args:
+        jobs (list[ExportJob]): jobs
+
+    Returns:
+        list[ExportJob]: jobs to export
+        list[str]: paths of files reused for the other jobs
+    """
+    manifests = {}
+    to_export = []
+    reused = []
+    for job in jobs:
+        export_path = os.path.dirname(job.file_path)
+        if export_path not in manifests:
+            manifests[export_path] = load_manifest(export_path)
+        entry = manifests[export_path].get(job.hash) if job.hash else None
+        file_path = os.path.join(export_path, entry['file']) if entry else None
+        if file_path is not None and os.path.exists(file_path):
+            reused.append(file_path)
+        else:
+            to_export.append(job)
+    return to_export, reused
+
+
+def record_exports(jobs):
+    """Add exported jobs to the manifests of their export directories.
+
+    Jobs without a hash or whose file doesn't exist are ignored.
+
+    Args:
+        jobs (Iterable[ExportJob]): exported jobs
+    """
+    by_path = {}
+    for job in jobs:
+        if job.hash and os.path.exists(job.file_path):
+            by_path.setdefault(os.path.dirname(job.file_path), []).append(job)
+
+    for export_path, path_jobs in by_path.items():
+        exports = load_manifest(export_path)
+        for job in path_jobs:
+            exports[job.hash] = {
+                'file': os.path.basename(job.file_path),
+                'collection': job.collection,
+                'variant': job.variant,
+                'seed': job.seed,
+                'time': time.time()}
+        save_manifest(export_path, exports)
+
+
+def _hash_object(h, obj, seen):
+    """Add an object and the objects its modifiers use to a hash."""
+    if obj.as_pointer() in seen:
+        return
+    seen.add(obj.as_pointer())
+    update_hash(h, obj.type, [tuple(row) for row in obj.matrix_world])
+    if hasattr(obj, 'mt_object_props'):
+        update_hash(h, _rna_values(obj.mt_object_props))
+
+    props = getattr(obj, 'mt_object_props', None)
+    if obj.type == 'MESH':
+        # objects displaced on the CPU keep their undisplaced mesh
+        mesh = props.preview_mesh if props and props.preview_mesh else obj.data
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', co)
+        loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', loop_verts)
+        h.update(co.tobytes())
+        h.update(loop_verts.tobytes())
+
+    # the exporter sets up the displacement and subsurf modifiers itself
+    # from the object props and export settings
+    export_mods = (props.disp_mod_name, props.subsurf_mod_name) if props and props.is_displacement else ()
+    for mod in obj.modifiers:
+        if mod.name in export_mods:
+            continue
+        update_hash(h, mod.type, _rna_values(mod))
+        for prop in mod.bl_rna.properties:
+            if prop.type == 'POINTER' and prop.fixed_type.identifier == 'Object':
+                target = getattr(mod, prop.identifier)
+                if target is not None:
+                    _hash_object(h, target, seen)
+
+    for slot in obj.material_slots:
+        mat = slot.material
+        update_hash(h, mat is not None)
+        if mat is not None:
+            hash_node_tree(h, mat.node_tree)
+
+
+def _rna_values(struct):
+    """Return the property values of a bpy struct.
+
+    Pointers are only given by whether they are set. Objects used by modifiers
+    and materials are hashed by content elsewhere.
+    """
+    values = []
+    for prop in struct.bl_rna.properties:
+        if prop.identifier in _volatile_props or prop.type == 'COLLECTION':
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if prop.type == 'POINTER':
+            value = value is not None
+        values.append((prop.identifier, hashable_value(value)))
+    return values
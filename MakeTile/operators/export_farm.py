@@ -0,0 +1,224 @@
+"""Export tile variants in parallel in background Blender processes."""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import traceback
+import subprocess
+from collections import deque
+import bpy
+from ..utils.registration import get_addon_name
+from .exporter import ExportJob, plan_export, run_export_jobs
+from .export_cache import split_reused_jobs, record_exports
+from ..lib.utils.bake_cache import bake_cache
+
+
+class ExportFarm:
+    """Run export jobs in a pool of background Blender processes.
+
+    The current file is saved to a temporary .blend. Each worker opens that
+    file, exports one job with run_export_jobs() and writes its result to a
+    .json file. Jobs carry their file path and seed, so the farm writes the
+    same files as exporting the plan serially. Workers share the bake cache
+    but don't evict maps from it. Failed jobs are retried up to
+    retries times.
+
+    Call poll() regularly to collect results and start workers, or call run()
+    to block until every job has finished.
+    """
+
+    def __init__(self, jobs, max_workers=None, retries=1, blender_path=None):
+        self.jobs = list(jobs)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.retries = retries
+        self.blender_path = blender_path or bpy.app.binary_path
+        self.results = []
+        self.temp_dir = None
+        self.blend_path = None
+        self._pending = deque((job, 0) for job in self.jobs)
+        self._running = {}
+        self._launched = 0
+
+    @property
+    def done(self):
+        return not self._pending and not self._running
+
+    def start(self):
+        """Save the current file for the workers to open."""
+        self.temp_dir = tempfile.mkdtemp(prefix='maketile_export_')
+        self.blend_path = os.path.join(self.temp_dir, 'export.blend')
+        bpy.ops.wm.save_as_mainfile(filepath=self.blend_path, copy=True)
+
+    def poll(self):
+        """Collect results of finished workers and start new ones.
+
+        Returns:
+            list[dict]: results of jobs that finished since the last call
+        """
+        if self.blend_path is None:
+            self.start()
+
+        finished = []
+        for proc, (job, attempt, result_path, log_path) in list(self._running.items()):
+            if proc.poll() is None:
+                continue
+            del self._running[proc]
+            result = _read_result(job, result_path, log_path)
+            if result['status'] != 'OK' and attempt < self.retries:
+                self._pending.append((job, attempt + 1))
+                continue
+            result['attempts'] = attempt + 1
+            self.results.append(result)
+            finished.append(result)
+
+        while self._pending and len(self._running) < self.max_workers:
+            job, attempt = self._pending.popleft()
+            self._launch(job, attempt)
+        return finished
+
+    def run(self, callback=None, interval=0.1):
+        """Run all jobs, blocking until they have finished.
+
+        Args:
+            callback (function, optional): called with each result as it arrives
+            interval (float, optional): seconds between polls
+
+        Returns:
+            list[dict]: results
+        """
+        try:
+            while True:
+                for result in self.poll():
+                    if callback is not None:
+                        callback(result)
+                if self.done:
+                    break
+                time.sleep(interval)
+        finally:
+            self.cancel()
+            self.cleanup()
+        return self.results
+
+    def cancel(self):
+        """Stop all workers and forget any jobs that haven't started."""
+        self._pending.clear()
+        for proc in self._running:
+            proc.kill()
+            proc.wait()
+        self._running.clear()
+
+    def cleanup(self):
+        """Delete the temporary files."""
+        if self.temp_dir is not None:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+
+    def _launch(self, job, attempt):
+        n = self._launched
+        self._launched += 1
+        job_path = os.path.join(self.temp_dir, f'job_{n}.json')
+        result_path = os.path.join(self.temp_dir, f'result_{n}.json')
+        log_path = os.path.join(self.temp_dir, f'log_{n}.txt')
+
+        with open(job_path, 'w') as f:
+            json.dump({'job': job._asdict(), 'result_path': result_path}, f)
+
+        cmd = [
+            self.blender_path,
+            '--background',
+            '--addons', get_addon_name(),
+            self.blend_path,
+            '--python-expr', f'import {__name__}; {__name__}.run_worker()',
+            '--', job_path]
+
+        with open(log_path, 'w') as log:
+            proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+        self._running[proc] = (job, attempt, result_path, log_path)
+
+
+def _read_result(job, result_path, log_path):
+    try:
+        with open(result_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # the worker died before writing its result
+        try:
+            with open(log_path) as f:
+                log = f.read()[-2000:]
+        except OSError:
+            log = ''
+        return dict(job._asdict(), status='FAILED', files=[], error='Worker exited without a result', log=log)
+
+
+def run_worker():
+    """Export the job passed after '--'. Called in each worker process."""
+    argv = sys.argv[sys.argv.index('--') + 1:]
+    with open(argv[0]) as f:
+        spec = json.load(f)
+
+    job = ExportJob(**spec['job'])
+    # other workers may be reading maps this one would evict
+    bake_cache.evict = False
+    result = dict(job._asdict(), status='OK', files=[])
+    start = time.time()
+    try:
+        # the farm records exports itself so workers don't race to write the manifest
+        result['files'] = run_export_jobs(bpy.context, [job], record=False)
+    except Exception as err:
+        result['status'] = 'FAILED'
+        result['error'] = repr(err)
+        result['traceback'] = traceback.format_exc()
+    result['time'] = round(time.time() - start, 3)
+
+    with open(spec['result_path'], 'w') as f:
+        json.dump(result, f)
+
+
+def export_tiles_in_background(context, tile_collections, export_path=None, max_workers=None, retries=1, callback=None):
+    """Export tiles using an ExportFarm.
+
+    Writes the same files as exporter.export_tiles() would, but leaves the
+    current scene untouched. Variants already in the export manifest are
+    reused.
+
+    Args:
+        context (bpy.context): context
+        tile_collections (Iterable[bpy.types.Collection]): tile collections
+        export_path (str, optional): directory to export to. Defaults to the default_export_path preference.
+        max_workers (int, optional): number of workers. Defaults to the number of CPUs.
+        retries (int, optional): number of times to retry a failed job
+        callback (function, optional): called with each result as it arrives
+
+    Returns:
+        list[str]: paths of the exported files
+        list[str]: paths of the reused files
+        list[dict]: results of jobs that failed
+    """
+    jobs, reused = split_reused_jobs(plan_export(context, tile_collections, export_path))
+    if not jobs:
+        return [], reused, []
+    farm = ExportFarm(jobs, max_workers, retries)
+
+    wm = context.window_manager
+    wm.progress_begin(0, len(jobs))
+
+    def on_result(result):
+        wm.progress_update(len(farm.results))
+        if callback is not None:
+            callback(result)
+
+    try:
+        results = farm.run(on_result)
+    finally:
+        wm.progress_end()
+        bake_cache.trim()
+
+    by_job = {(r['collection'], r['variant']): r for r in results}
+    file_paths = []
+    for job in jobs:
+        file_paths.extend(by_job[job.collection, job.variant]['files'])
+    record_exports(job for job in jobs if by_job[job.collection, job.variant]['status'] == 'OK')
+    failed = [r for r in results if r['status'] != 'OK']
+    return file_paths, reused, failed
@@ -0,0 +1,252 @@
+"""Export tile variants in the background of the UI using bpy.app.timers.
+
+One variant is exported per timer tick so Blender stays responsive and the
+export panel can show progress. The queue is saved to the user config
+directory after each step so an export interrupted by Blender closing or
+crashing can be resumed.
+"""
+import os
+import json
+import traceback
+import bpy
+from bpy.app.handlers import persistent
+from .exporter import ExportQueue
+
+# the running ExportQueue
+_queue = None
+_last_error = None
+_last_result = None
+# blend file of the saved queue, cached as can_resume() is called on every panel redraw
+_saved_queue_cache = {'mtime': None, 'blend_file': None}
+
+
+def get_queue_path():
+    """Return the path the running export queue is saved to.
+
+    Returns:
+        str: path to .json file
+    """
+    return os.path.join(bpy.utils.user_resource('CONFIG', path='MakeTile', create=True), 'export_queue.json')
+
+
+def get_running_queue():
+    """Return the running export queue.
+
+    Returns:
+        ExportQueue | None: queue
+    """
+    return _queue
+
+
+def get_last_error():
+    """Return the error that stopped the last export, if any.
+
+    Returns:
+        str | None: error
+    """
+    return _last_error
+
+
+def get_last_result():
+    """Return a summary of the last export that finished, if any.
+
+    Exports run on a timer after the operator that started them has
+    returned, so the result is shown in the export panel instead of being
+    reported by the operator.
+
+    Returns:
+        str | None: summary
+    """
+    return _last_result
+
+
+def can_resume():
+    """Return whether there is a saved export queue that belongs to this file.
+
+    Returns:
+        bool: whether the saved queue can be offered for resuming
+    """
+    try:
+        mtime = os.stat(get_queue_path()).st_mtime_ns
+    except OSError:
+        return False
+    if _saved_queue_cache['mtime'] != mtime:
+        try:
+            with open(get_queue_path()) as f:
+                blend_file = json.load(f).get('blend_file')
+        except (OSError, ValueError, AttributeError):
+            blend_file = None
+        _saved_queue_cache['mtime'] = mtime
+        _saved_queue_cache['blend_file'] = blend_file
+    return _saved_queue_cache['blend_file'] == bpy.data.filepath
+
+
+def start_export(jobs):
+    """Start exporting jobs on a timer.
+
+    Args:
+        jobs (list[ExportJob]): jobs
+    """
+    _start(ExportQueue(jobs))
+
+
+def cancel_export(keep_saved_queue=False):
+    """Stop the running export, restoring renderer settings and tiles.
+
+    Args:
+        keep_saved_queue (bool, optional): keep the saved queue so the export can be resumed
+    """
+    global _queue
+    if _queue is None:
+        return
+    if bpy.app.timers.is_registered(_tick):
+        bpy.app.timers.unregister(_tick)
+    _queue.finish()
+    _queue = None
+    if not keep_saved_queue:
+        _delete_saved_queue()
+    _redraw()
+
+
+@persistent
+def cancel_export_on_load(dummy):
+    """Stop the running export before another file is loaded.
+
+    The queue refers to collections in the file being closed, so it is
+    stopped while they still exist. The saved queue is kept so the export
+    can be resumed when the file is opened again.
+    """
+    cancel_export(keep_saved_queue=True)
+
+
+def load_saved_queue():
+    """Return the saved export queue if it can be resumed in this file.
+
+    Returns:
+        ExportQueue | None: queue
+    """
+    try:
+        with open(get_queue_path()) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('blend_file') != bpy.data.filepath:
+        return None
+    queue = ExportQueue.from_dict(data['queue'])
+    if any(job.collection not in bpy.data.collections for job in queue.jobs[queue.next_job:]):
+        return None
+    return queue
+
+
+def resume_export():
+    """Resume the saved export queue.
+
+    Returns:
+        bool: whether there was a queue to resume
+    """
+    queue = load_saved_queue()
+    if queue is None or queue.done:
+        return False
+    _start(queue)
+    return True
+
+
+def _start(queue):
+    global _queue, _last_error, _last_result
+    if _queue is not None:
+        cancel_export()
+    _queue = queue
+    _last_error = None
+    _last_result = None
+    _queue.start()
+    _save_queue()
+    bpy.app.timers.register(_tick)
+
+
+def _tick():
+    global _queue, _last_error, _last_result
+    if _queue is None:
+        return None
+
+    try:
+        _queue.step(bpy.context)
+    except Exception as err:
+        traceback.print_exc()
+        _last_error = repr(err)
+        cancel_export()
+        return None
+
+    if _queue.done:
+        _queue.finish()
+        _last_result = f'{len(_queue.file_paths)} tiles exported.'
+        _queue = None
+        _delete_saved_queue()
+        _redraw()
+        return None
+
+    _save_queue()
+    _redraw()
+    return 0.01
+
+
+def _save_queue():
+    with open(get_queue_path(), 'w') as f:
+        json.dump({'blend_file': bpy.data.filepath, 'queue': _queue.to_dict()}, f)
+
+
+def _delete_saved_queue():
+    try:
+        os.remove(get_queue_path())
+    except OSError:
+        pass
+
+
+def _redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+class MT_OT_Cancel_Export(bpy.types.Operator):
+    bl_idname = "scene.mt_cancel_export"
+    bl_label = "Cancel Export"
+    bl_options = {'REGISTER'}
+    bl_description = "Stop exporting tile variants."
+
+    @classmethod
+    def poll(cls, context):
+        return _queue is not None
+
+    def execute(self, context):
+        exported = len(_queue.file_paths)
+        cancel_export()
+        self.report({'INFO'}, f'Export cancelled. {exported} tiles exported.')
+        return {'FINISHED'}
+
+
+class MT_OT_Resume_Export(bpy.types.Operator):
+    bl_idname = "scene.mt_resume_export"
+    bl_label = "Resume Export"
+    bl_options = {'REGISTER'}
+    bl_description = "Carry on with an interrupted export."
+
+    @classmethod
+    def poll(cls, context):
+        return _queue is None and can_resume()
+
+    def execute(self, context):
+        if not resume_export():
+            self.report({'WARNING'}, 'The interrupted export cannot be resumed in this file.')
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+def register():
+    """Stop the running export when another file is loaded."""
+    bpy.app.handlers.load_pre.append(cancel_export_on_load)
+
+
+def unregister():
+    if cancel_export_on_load in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(cancel_export_on_load)
@@ -1,6 +1,8 @@
 import os
+import time
 import textwrap
-from random import random
+from collections import namedtuple
+from random import random, Random
 import bpy
 import addon_utils
 from bpy.types import Panel
@@ -13,9 +15,18 @@ from .. lib.utils.collections import get_objects_owning_collections
 from . bakedisplacement import (
     set_cycles_to_bake_mode,
     reset_renderer_from_bake,
-    bake_displacement_map)
+    bake_displacement_maps)
 from . return_to_preview import set_to_preview
+from .vertex_displacement import displace_on_cpu, displace_with_image
 from ..enums.enums import units
+from ..lib.utils.stl import write_stl
+from ..lib.utils.bake_cache import get_bake_cache_stats_text
+from .export_cache import (
+    get_tile_hash,
+    get_variant_hash,
+    get_variant_seed,
+    split_reused_jobs,
+    record_exports)
 
 # TODO: Currently if you select an architectural element rather than a tile the exporter fails.
 class MT_PT_Export_Panel(Panel):
@@ -54,7 +65,28 @@ class MT_PT_Export_Panel(Panel):
 
         layout = self.layout
 
-        layout.operator('scene.mt_export_tile', text='Export Tile')
+        from .export_queue import get_running_queue, get_last_error, get_last_result, can_resume
+        queue = get_running_queue()
+        if queue is not None:
+            text = f'Exporting {queue.next_job + 1} of {len(queue.jobs)}'
+            if queue.eta is not None:
+                minutes, seconds = divmod(int(queue.eta), 60)
+                text += f' - {minutes}m {seconds}s left'
+            # UILayout.progress was added in Blender 4.0
+            if hasattr(layout, 'progress'):
+                layout.progress(factor=queue.next_job / len(queue.jobs), text=text)
+            else:
+                layout.label(text=text)
+            layout.operator('scene.mt_cancel_export', text='Cancel Export')
+        else:
+            layout.operator('scene.mt_export_tile', text='Export Tile')
+            if can_resume():
+                layout.operator('scene.mt_resume_export', text='Resume Export')
+        if get_last_error() is not None:
+            layout.label(text='Export failed: ' + get_last_error(), icon='ERROR')
+        elif get_last_result() is not None:
+            layout.label(text=get_last_result(), icon='INFO')
+
         op = layout.operator('scene.mt_export_object', text='Export Active Object')
         op.voxelise = scene_props.voxelise_on_export
         op.decimate = scene_props.decimate_on_export
@@ -70,6 +102,9 @@ class MT_PT_Export_Panel(Panel):
         layout.prop(scene_props, 'randomise_on_export')
         layout.prop(scene_props, 'decimate_on_export')
         layout.prop(scene_props, 'export_subdivs')
+        layout.prop(scene_props, 'export_workers')
+        layout.prop(scene_props, 'reuse_exports')
+        layout.label(text=get_bake_cache_stats_text())
 
         if scene_props.randomise_on_export is True:
             layout.prop(scene_props, 'num_variants')
@@ -205,46 +240,16 @@ class MT_OT_Export_Tile_Variants(bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
+        from .export_queue import get_running_queue
+        if get_running_queue() is not None:
+            return False
         obj = context.object
         return obj is not None and obj.mode == 'OBJECT' and obj.mt_object_props.is_mt_object is True
 
     def execute(self, context):
-        # set up exporter options
         prefs = get_prefs()
         scene_props = context.scene.mt_scene_props
 
-        # number of variants we will generate
-        if scene_props.randomise_on_export:
-            num_variants = scene_props.num_variants
-        else:
-            num_variants = 1
-
-        # set cycles to bake mode and store original settings
-        orig_settings = set_cycles_to_bake_mode()
-
-        # voxelise options
-        voxelise_on_export = scene_props.voxelise_on_export
-
-        # decimate options
-        decimate_on_export = scene_props.decimate_on_export
-
-        # ensure export path exists
-        export_path = prefs.default_export_path
-        if not os.path.exists(export_path):
-            os.mkdir(export_path)
-
-        # Controls if we rescale on export
-        blend_units = scene_props.export_units
-        if blend_units == 'CM':
-            unit_multiplier = 10
-        elif blend_units == 'INCHES':
-            unit_multiplier = 25.4
-        else:
-            unit_multiplier = 1
-
-        objects = bpy.data.objects
-        visible_objects = []
-
         # get list of tile collections our selected objects are in. We export
         # all visible objects in the collections
         tile_collections = set()
@@ -256,150 +261,456 @@ class MT_OT_Export_Tile_Variants(bpy.types.Operator):
                 if collection.mt_tile_props.is_mt_collection is True:
                     tile_collections.add(collection)
 
-        for collection in tile_collections:
-            visible_objects = []
+        if scene_props.export_workers > 1:
+            from .export_farm import export_tiles_in_background
+            file_paths, reused, failed = export_tiles_in_background(
+                context, tile_collections, max_workers=scene_props.export_workers)
+            if failed:
+                self.report(
+                    {'WARNING'},
+                    f'{len(failed)} tile variants failed to export. First error: {failed[0]["error"]}')
+            self.report(
+                {'INFO'},
+                f'{len(file_paths)} tiles exported and {len(reused)} reused in {prefs.default_export_path}.')
+            return {'FINISHED'}
+
+        jobs, reused = split_reused_jobs(plan_export(context, tile_collections))
+        if not jobs:
+            self.report({'INFO'}, f'All {len(reused)} tiles are already exported to {prefs.default_export_path}.')
+            return {'FINISHED'}
+
+        if bpy.app.background:
+            # timers don't run in background mode
+            file_paths = run_export_jobs(context, jobs)
+            self.report(
+                {'INFO'},
+                f'{len(file_paths)} tiles exported and {len(reused)} reused in {prefs.default_export_path}.')
+        else:
+            from .export_queue import start_export
+            start_export(jobs)
+            self.report(
+                {'INFO'},
+                f'Exporting {len(jobs)} tile variants to {prefs.default_export_path}. {len(reused)} reused.')
+
+        return {'FINISHED'}
+
+
+# A single tile variant to export. seed is None if the variant keeps the
+# current Seed node values, otherwise it seeds the random values the Seed
+# nodes are set to. hash is the variant's content hash if reuse_exports is set.
+ExportJob = namedtuple('ExportJob', ['collection', 'variant', 'file_path', 'seed', 'hash'], defaults=(None,))
 
-            for obj in collection.objects:
-                if obj.type == 'MESH' and obj.visible_get() is True and obj.display_type in ['SOLID', 'TEXTURED']:
-                    visible_objects.append(obj)
 
-            #generate variants of displacement obs equal to num_variants
-            displacement_obs = []
-            for obj in visible_objects:
-                if obj.mt_object_props.is_displacement:
-                    displacement_obs.append((obj, obj.mt_object_props.is_displaced))
+def plan_export(context, tile_collections, export_path=None):
+    """Return the tile variants to export using the scene's export settings.
 
-            i = 0
-            while i < num_variants:
-                # construct a random name for our variant
+    Each tile is exported num_variants times if randomise_on_export is set.
+    File names and seeds are chosen here so a plan exports the same files
+    wherever it is run.
+
+    If reuse_exports is set variants are named by their content hash and
+    seeded from the tile's hash, so exporting an unchanged tile again plans
+    the same files. Use export_cache.split_reused_jobs to skip them. As
+    without reuse_exports, the first of several variants keeps the current
+    seeds so the tile as previewed is exported, and changing a Seed node
+    changes the tile's hash and so the other variants.
+
+    Args:
+        context (bpy.context): context
+        tile_collections (Iterable[bpy.types.Collection]): tile collections
+        export_path (str, optional): directory to export to. Defaults to the default_export_path preference.
+
+    Returns:
+        list[ExportJob]: jobs
+    """
+    prefs = get_prefs()
+    scene_props = context.scene.mt_scene_props
+
+    if export_path is None:
+        export_path = prefs.default_export_path
+
+    # number of variants we will generate
+    if scene_props.randomise_on_export:
+        num_variants = scene_props.num_variants
+    else:
+        num_variants = 1
+
+    if scene_props.reuse_exports:
+        # make sure object matrices are up to date before they're hashed
+        context.view_layer.update()
+
+    jobs = []
+    for collection in tile_collections:
+        if scene_props.reuse_exports:
+            tile_hash = get_tile_hash(context, collection, get_visible_objects(collection))
+            for i in range(num_variants):
+                if scene_props.randomise_on_export and (num_variants == 1 or i > 0):
+                    seed = get_variant_seed(tile_hash, i)
+                else:
+                    seed = None
+                variant_hash = get_variant_hash(context, tile_hash, seed)
                 file_path = os.path.join(
                     export_path,
-                    collection.name + '.' + str(random()) + '.stl')
-
-                for ob in displacement_obs:
-                    obj = ob[0]
-                    obj_props = obj.mt_object_props
-
-                    # check if displacement modifier exists. If it doesn't user has removed it.
-                    if obj_props.disp_mod_name in obj.modifiers:
-
-                        if obj_props.is_displacement and obj_props.is_displaced and scene_props.randomise_on_export:
-                            set_to_preview(obj)
-
-                        if obj_props.is_displacement and not obj_props.is_displaced:
-
-                            for item in obj.material_slots.items():
-                                if item[0]:
-                                    material = bpy.data.materials[item[0]]
-                                    tree = material.node_tree
-
-                                    # generate a random variant for each displacement object
-                                    if scene_props.randomise_on_export:
-                                        if num_variants == 1:
-                                            if 'Seed' in tree.nodes:
-                                                rand = random()
-                                                seed_node = tree.nodes['Seed']
-                                                seed_node.outputs[0].default_value = rand * 1000
-                                        else:
-                                            # only generate a random variant on second iteration
-                                            if i > 0:
-                                                if 'Seed' in tree.nodes:
-                                                    rand = random()
-                                                    seed_node = tree.nodes['Seed']
-                                                    seed_node.outputs[0].default_value = rand * 1000
-
-                            disp_image = bake_displacement_map(obj)
-                            disp_strength = obj_props.displacement_strength
-                            disp_texture = obj_props.disp_texture
-
-                            disp_texture.image = disp_image
-                            disp_mod = obj.modifiers[obj_props.disp_mod_name]
-                            disp_mod.texture = disp_texture
-                            disp_mod.mid_level = 0
-                            disp_mod.strength = disp_strength
-                            subsurf_mod = obj.modifiers[obj_props.subsurf_mod_name]
-                            subsurf_mod.levels = scene_props.export_subdivs
-                            subsurf_mod.show_viewport = True
-                            with bpy.context.temp_override(
-                                    selected_objects=[obj],
-                                    selected_editable_objects=[obj],
-                                    active_object=obj,object=obj
-                                    ):
-                                bpy.ops.object.modifier_move_to_index(
-                                    modifier=subsurf_mod.name,
-                                    index=0
-                                    )
-                            obj_props.is_displaced = True
-
-                depsgraph = context.evaluated_depsgraph_get()
-                dupes = []
-
-                for obj in visible_objects:
-                    object_eval = obj.evaluated_get(depsgraph)
-                    mesh_from_eval = bpy.data.meshes.new_from_object(object_eval)
-                    dup_obj = bpy.data.objects.new('dupe', mesh_from_eval)
-                    dup_obj.data.transform(obj.matrix_world)
-                    collection.objects.link(dup_obj)
-                    dupes.append(dup_obj)
-
-                context.view_layer.update()
-                # join dupes together
-                if len(dupes) > 0:
-
-                    bpy.ops.object.select_all(action='DESELECT')
-                    for obj in dupes:
-                        obj.select_set(True)
-                        bpy.context.view_layer.objects.active = dupes[0]
-                    #with bpy.context.temp_override(active_object=dupes[0],selected_objects=[dupes[0]]):
-                        bpy.ops.object.join()
-
-                    if voxelise_on_export:
-                        voxelise(context, dupes[0])
-                    if decimate_on_export:
-                        decimate(context, dupes[0])
-                    if scene_props.fix_non_manifold:
-                        make_manifold(context, dupes[0])
-
-                    # set origin to center
-                    with bpy.context.temp_override(object=dupes[0],active_object=dupes[0],selected_objects=[dupes[0]],selected_editable_objects=[dupes[0]]):
-                        bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY')
-                        dupes[0].location = (0, 0, 0)
-
-                    # export our object
-                    if (4, 1, 0) < bpy.app.version:
-                        #Use the newer, faster bpy.ops.wm.stl_export function 
-                        bpy.ops.wm.stl_export(
-                            filepath=file_path,
-                            check_existing=True,
-                            filter_glob="*.stl",
-                            export_selected_objects=True,
-                            global_scale=unit_multiplier,
-                            apply_modifiers=True)
-                    else:
-                        bpy.ops.export_mesh.stl(
-                            filepath=file_path,
-                            check_existing=True,
-                            filter_glob="*.stl",
-                            use_selection=True,
-                            global_scale=unit_multiplier,
-                            use_mesh_modifiers=True)
-
-                    objects.remove(dupes[0], do_unlink=True)
-
-                    # clean up orphaned meshes
-                    for mesh in bpy.data.meshes:
-                        if mesh.users == 0:
-                            bpy.data.meshes.remove(mesh)
-                    i += 1
-
-            # reset displacement obs
-            for ob in displacement_obs:
-                obj, is_displaced = ob
-                if is_displaced is False:
-                    set_to_preview(obj)
-
-        reset_renderer_from_bake(orig_settings)
-
-        self.report({'INFO'}, f'{num_variants * len(tile_collections)} tiles exported to {prefs.default_export_path}.')
+                    collection.name + '.' + variant_hash[:12] + '.stl')
+                jobs.append(ExportJob(collection.name, i, file_path, seed, variant_hash))
+            continue
+
+        for i in range(num_variants):
+            # construct a random name for our variant
+            file_path = os.path.join(
+                export_path,
+                collection.name + '.' + str(random()) + '.stl')
+
+            # the first of several variants keeps the current seeds
+            if scene_props.randomise_on_export and (num_variants == 1 or i > 0):
+                seed = random()
+            else:
+                seed = None
+            jobs.append(ExportJob(collection.name, i, file_path, seed))
+    return jobs
+
+
+def export_tiles(context, tile_collections, export_path=None):
+    """Export tiles as .stl files using the scene's export settings.
+
+    Args:
+        context (bpy.context): context
+        tile_collections (Iterable[bpy.types.Collection]): tile collections
+        export_path (str, optional): directory to export to. Defaults to the default_export_path preference.
+
+    Returns:
+        list[str]: paths of the exported files, including any reused ones
+    """
+    jobs, reused = split_reused_jobs(plan_export(context, tile_collections, export_path))
+    return reused + run_export_jobs(context, jobs)
+
+
+def run_export_jobs(context, jobs, record=True):
+    """Export tile variants.
+
+    Args:
+        context (bpy.context): context
+        jobs (list[ExportJob]): jobs
+        record (bool, optional): add exported jobs to the export manifest
+
+    Returns:
+        list[str]: paths of the exported files
+    """
+    queue = ExportQueue(jobs, record=record)
+    queue.start()
+    try:
+        while not queue.done:
+            queue.step(context)
+    finally:
+        queue.finish()
+    return queue.file_paths
+
+
+class ExportQueue:
+    """Export tile variants one job at a time.
+
+    Jobs are grouped by tile collection. start() puts cycles in bake mode,
+    each call to step() exports one variant and finish() puts back the
+    renderer settings and the displacement state of the tiles. Calling
+    finish() before the queue is done cancels the rest of the jobs.
+
+    The queue can be saved with to_dict() and restored with from_dict() so
+    an interrupted export can be resumed. If record is set finish() adds the
+    exported jobs to the export manifest.
+    """
+
+    def __init__(self, jobs, next_job=0, file_paths=None, orig_settings=None, displacement_states=None, record=True):
+        collection_names = []
+        for job in jobs:
+            if job.collection not in collection_names:
+                collection_names.append(job.collection)
+        self.jobs = sorted(jobs, key=lambda job: collection_names.index(job.collection))
+        self.next_job = next_job
+        self.file_paths = list(file_paths or [])
+        self.orig_settings = orig_settings
+        # {collection name: [(object name, is_displaced)]} for collections being exported
+        self.displacement_states = displacement_states or {}
+        self.step_times = []
+        self.record = record
+
+    @property
+    def done(self):
+        return self.next_job >= len(self.jobs)
+
+    @property
+    def eta(self):
+        """Estimated seconds until the queue is done, or None before the first step."""
+        if not self.step_times:
+            return None
+        return sum(self.step_times) / len(self.step_times) * (len(self.jobs) - self.next_job)
+
+    def start(self):
+        """Set cycles to bake mode, keeping the original settings if resuming."""
+        settings = set_cycles_to_bake_mode()
+        if self.orig_settings is None:
+            self.orig_settings = settings
+
+    def step(self, context):
+        """Export the next variant.
+
+        Args:
+            context (bpy.context): context
+
+        Returns:
+            str | None: path of exported file or None if there was nothing to export
+        """
+        start = time.time()
+        job = self.jobs[self.next_job]
+        collection = bpy.data.collections[job.collection]
+
+        # store displacement state so we can reset it afterwards
+        if job.collection not in self.displacement_states:
+            self.displacement_states[job.collection] = [
+                (obj.name, obj.mt_object_props.is_displaced) for obj in get_visible_objects(collection)
+                if obj.mt_object_props.is_displacement]
+
+        file_path = export_tile_variant(context, collection, job)
+        self.next_job += 1
+        if file_path is not None:
+            self.file_paths.append(file_path)
+
+        if self.done or self.jobs[self.next_job].collection != job.collection:
+            self._reset_displacement(job.collection)
+
+        self.step_times.append(time.time() - start)
+        return file_path
+
+    def finish(self):
+        """Reset displacement objects and renderer settings."""
+        for name in list(self.displacement_states):
+            self._reset_displacement(name)
+        if self.orig_settings is not None:
+            reset_renderer_from_bake(self.orig_settings)
+            self.orig_settings = None
+        if self.record:
+            record_exports(self.jobs[:self.next_job])
+
+    def _reset_displacement(self, collection_name):
+        for obj_name, is_displaced in self.displacement_states.pop(collection_name, []):
+            obj = bpy.data.objects.get(obj_name)
+            if obj is not None and is_displaced is False:
+                set_to_preview(obj)
+
+    def to_dict(self):
+        return {
+            'jobs': [job._asdict() for job in self.jobs],
+            'next_job': self.next_job,
+            'file_paths': self.file_paths,
+            'orig_settings': self.orig_settings,
+            'displacement_states': self.displacement_states}
 
-        return {'FINISHED'}
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            [ExportJob(**job) for job in data['jobs']],
+            data['next_job'],
+            data['file_paths'],
+            data['orig_settings'],
+            {name: [tuple(state) for state in states] for name, states in data['displacement_states'].items()})
+
+
+def get_visible_objects(collection):
+    """Return the objects in a tile collection that are exported.
+
+    Args:
+        collection (bpy.types.Collection): tile collection
+
+    Returns:
+        list[bpy.types.Object]: objects
+    """
+    return [
+        obj for obj in collection.objects
+        if obj.type == 'MESH' and obj.visible_get() is True and obj.display_type in ['SOLID', 'TEXTURED']]
+
+
+def export_tile_variant(context, collection, job):
+    """Bake and export a single tile variant.
+
+    Cycles should already be in bake mode (see set_cycles_to_bake_mode).
+    Seed nodes randomised for the variant are put back afterwards, so the
+    tile keeps its hash and later variants of tiles that share materials
+    start from the same seeds as they would in a freshly opened file.
+
+    Args:
+        context (bpy.context): context
+        collection (bpy.types.Collection): tile collection
+        job (ExportJob): job
+
+    Returns:
+        str | None: path of exported file or None if there was nothing to export
+    """
+    seeds = get_seed_values(get_visible_objects(collection)) if job.seed is not None else {}
+    try:
+        return _export_tile_variant(context, collection, job)
+    finally:
+        set_seed_values(seeds)
+
+
+def get_seed_values(objects):
+    """Return the values of the Seed nodes in the materials of objects.
+
+    Args:
+        objects (Iterable[bpy.types.Object]): objects
+
+    Returns:
+        dict{bpy.types.Material: float}: Seed node value of each material
+    """
+    seeds = {}
+    for obj in objects:
+        for slot in obj.material_slots:
+            mat = slot.material
+            if mat is not None and mat.node_tree is not None and 'Seed' in mat.node_tree.nodes:
+                seeds[mat] = mat.node_tree.nodes['Seed'].outputs[0].default_value
+    return seeds
+
+
+def set_seed_values(seeds):
+    """Set the Seed nodes of materials to values returned by get_seed_values.
+
+    Args:
+        seeds (dict{bpy.types.Material: float}): Seed node value of each material
+    """
+    for mat, value in seeds.items():
+        mat.node_tree.nodes['Seed'].outputs[0].default_value = value
+
+
+def _export_tile_variant(context, collection, job):
+    scene_props = context.scene.mt_scene_props
+    objects = bpy.data.objects
+    file_path = job.file_path
+
+    export_dir = os.path.dirname(file_path)
+    if not os.path.exists(export_dir):
+        os.makedirs(export_dir)
+
+    # Controls if we rescale on export
+    blend_units = scene_props.export_units
+    if blend_units == 'CM':
+        unit_multiplier = 10
+    elif blend_units == 'INCHES':
+        unit_multiplier = 25.4
+    else:
+        unit_multiplier = 1
+
+    if job.seed is not None:
+        rand = Random(job.seed).random
+    else:
+        rand = None
+
+    visible_objects = get_visible_objects(collection)
+
+    disp_objects = []
+    for obj in visible_objects:
+        obj_props = obj.mt_object_props
+
+        # check if displacement modifier exists. If it doesn't user has removed it.
+        if obj_props.is_displacement and obj_props.disp_mod_name in obj.modifiers:
+
+            if obj_props.is_displaced and scene_props.randomise_on_export:
+                set_to_preview(obj)
+
+            if not obj_props.is_displaced:
+                disp_objects.append(obj)
+
+    def randomise(obj):
+        # generate a random variant for each displacement object
+        for item in obj.material_slots.items():
+            if item[0]:
+                tree = bpy.data.materials[item[0]].node_tree
+                if 'Seed' in tree.nodes:
+                    seed_node = tree.nodes['Seed']
+                    seed_node.outputs[0].default_value = rand() * 1000
+
+    prepare = randomise if rand is not None else None
+    if scene_props.displacement_method == 'CPU':
+        # objects whose materials can't be evaluated on the CPU are baked. They
+        # are prepared again as the bake may copy materials they share
+        disp_objects = list(displace_on_cpu(disp_objects, scene_props.export_subdivs, prepare))
+    disp_images = bake_displacement_maps(disp_objects, prepare)
+
+    for obj in disp_objects:
+        obj_props = obj.mt_object_props
+        disp_image = disp_images[obj]
+        disp_strength = obj_props.displacement_strength
+        disp_texture = obj_props.disp_texture
+
+        disp_texture.image = disp_image
+
+        if scene_props.apply_displacement:
+            displace_with_image(obj, disp_image, scene_props.export_subdivs)
+            continue
+
+        disp_mod = obj.modifiers[obj_props.disp_mod_name]
+        disp_mod.texture = disp_texture
+        disp_mod.mid_level = 0
+        disp_mod.strength = disp_strength
+        subsurf_mod = obj.modifiers[obj_props.subsurf_mod_name]
+        subsurf_mod.levels = scene_props.export_subdivs
+        subsurf_mod.show_viewport = True
+        with bpy.context.temp_override(
+                selected_objects=[obj],
+                selected_editable_objects=[obj],
+                active_object=obj,object=obj
+                ):
+            bpy.ops.object.modifier_move_to_index(
+                modifier=subsurf_mod.name,
+                index=0
+                )
+        obj_props.is_displaced = True
+
+    if len(visible_objects) == 0:
+        return None
+
+    depsgraph = context.evaluated_depsgraph_get()
+
+    if not (scene_props.voxelise_on_export
+            or scene_props.decimate_on_export
+            or scene_props.fix_non_manifold):
+        write_stl(file_path, visible_objects, depsgraph, unit_multiplier)
+        return file_path
+
+    # voxelising, decimating and making manifold work on a joined object
+    dupes = []
+    for obj in visible_objects:
+        object_eval = obj.evaluated_get(depsgraph)
+        mesh_from_eval = bpy.data.meshes.new_from_object(object_eval)
+        dup_obj = bpy.data.objects.new('dupe', mesh_from_eval)
+        dup_obj.data.transform(obj.matrix_world)
+        collection.objects.link(dup_obj)
+        dupes.append(dup_obj)
+
+    context.view_layer.update()
+
+    # join dupes together
+    bpy.ops.object.select_all(action='DESELECT')
+    for obj in dupes:
+        obj.select_set(True)
+    with bpy.context.temp_override(
+            object=dupes[0],
+            active_object=dupes[0],
+            selected_objects=dupes,
+            selected_editable_objects=dupes):
+        bpy.ops.object.join()
+
+    if scene_props.voxelise_on_export:
+        voxelise(context, dupes[0])
+    if scene_props.decimate_on_export:
+        decimate(context, dupes[0])
+    if scene_props.fix_non_manifold:
+        make_manifold(context, dupes[0])
+
+    write_stl(file_path, [dupes[0]], context.evaluated_depsgraph_get(), unit_multiplier)
+
+    objects.remove(dupes[0], do_unlink=True)
+
+    # clean up orphaned meshes
+    for mesh in bpy.data.meshes:
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+    return file_path
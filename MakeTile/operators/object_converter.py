@@ -20,6 +20,7 @@ from .. lib.utils.collections import (
     activate_collection)
 from .assign_reference_object import create_helper_object
 from ..tile_creation.create_tile import create_material_enums
+from ..materials.materials import get_material
 
 from ..utils.registration import get_prefs
 
@@ -107,7 +108,7 @@ class MT_OT_Convert_To_MT_Obj(bpy.types.Operator):
         # Remove any existing materials
         obj.data.materials.clear()
         # append secondary material
-        obj.data.materials.append(bpy.data.materials[prefs.secondary_material])
+        obj.data.materials.append(get_material(prefs.secondary_material))
 
         # create an all vertex group and ensure it is at index 0 as otherwise
         # the return to preview feature doesn't work properly
@@ -2,6 +2,7 @@ import bpy
 from ..materials.materials import assign_mat_to_vert_group
 from ..utils.registration import get_prefs
 from .. lib.utils.utils import view3d_find
+from .vertex_displacement import restore_preview_mesh
 
 class MT_OT_Return_To_Preview(bpy.types.Operator):
     """Return the maketile object to its preview state"""
@@ -36,6 +37,9 @@ def set_to_preview(obj):
     secondary_material = bpy.data.materials[prefs.secondary_material]
     props = obj.mt_object_props
 
+    # put back the original mesh of objects displaced on the CPU
+    restore_preview_mesh(obj)
+
     # check if displacement modifier exists. If it doesn't user has removed it.
     if props.disp_mod_name in obj.modifiers:
         disp_mod = obj.modifiers[props.disp_mod_name]
@@ -72,7 +76,7 @@ def set_to_preview(obj):
     region, rv3d, v3d, area = view3d_find(True)
 
     try:
-        if bpy.context.scene.render.engine != 'CYCLES' or v3d.shading.type != 'RENDERED':
+        if bpy.context.scene.render.engine != 'CYCLES' or v3d is None or v3d.shading.type != 'RENDERED':
             obj.modifiers[props.subsurf_mod_name].show_viewport = False
             obj.cycles.use_adaptive_subdivision = True
     except KeyError:
@@ -0,0 +1,294 @@
+"""Displace tiles by moving the vertices of a subdivided copy of their mesh.
+
+Instead of a subsurf and a displace modifier that are evaluated again on
+every depsgraph update, the mesh is subdivided once and its vertices are
+moved along their normals, either by a baked displacement map or by
+evaluating the displacement materials on the CPU. The undisplaced mesh is
+kept in the object's preview_mesh property so the tile can be returned to
+preview.
+"""
+import numpy as np
+import bpy
+from ..materials.materials import store_preview_materials, assign_secondary_material
+from ..lib.utils.vertex_groups import get_vert_group_mask
+
+# float attribute that carries the displacement vertex group through subdivision
+_weight_attribute = 'mt_disp_weight'
+
+
+def displace_on_cpu(objects, levels=None, prepare=None):
+    """Displace objects by evaluating their displacement materials on the CPU.
+
+    Args:
+        objects (list[bpy.types.Object]): displacement objects in preview mode
+        levels (int, optional): subdivision levels. Defaults to the levels of each object's subsurf modifier.
+        prepare (function, optional): called with each object before it is displaced,
+            e.g. to randomise its material
+
+    Returns:
+        dict{bpy.types.Object: str}: objects whose materials can't be evaluated and must be baked, and why
+    """
+    # the evaluator is only imported when tiles are displaced on the CPU
+    from ..materials.node_evaluator import UnsupportedNodeError
+    to_bake = {}
+    for obj in objects:
+        if prepare is not None:
+            prepare(obj)
+        try:
+            evaluators = get_displacement_evaluators(obj)
+        except UnsupportedNodeError as err:
+            to_bake[obj] = str(err)
+            continue
+
+        def get_heights(mesh, co, normals, mask):
+            heights = _evaluate_heights(obj, evaluators, mesh, co, normals, mask)
+            # only once the heights are known so an object that has to be baked is left as it was
+            store_preview_materials(obj)
+            return heights
+
+        try:
+            apply_displacement(obj, get_heights, levels)
+        except UnsupportedNodeError as err:
+            # some inputs can only be checked against the subdivided mesh
+            to_bake[obj] = str(err)
+    return to_bake
+
+
+def displace_with_image(obj, image, levels=None):
+    """Displace an object by its baked displacement map.
+
+    The map is sampled bilinearly at the UV of each vertex of the subdivided
+    mesh, as the displace modifier would sample it.
+
+    Args:
+        obj (bpy.types.Object): displacement object in preview mode
+        image (bpy.types.Image): displacement map
+        levels (int, optional): subdivision levels. Defaults to the levels of the object's subsurf modifier.
+    """
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    # the displace modifier uses the average of the colour channels
+    pixels = pixels.reshape(height, width, 4)[:, :, :3].mean(axis=2)
+
+    def get_heights(mesh, co, normals, mask):
+        return sample_image(pixels, _get_vertex_uvs(mesh, mesh.uv_layers.active))
+
+    apply_displacement(obj, get_heights, levels)
+
+
+def sample_image(pixels, uvs):
+    """Sample an image bilinearly, repeating it outside 0 to 1.
+
+    Args:
+        pixels (numpy.ndarray): (height, width) pixel values, bottom row first
+        uvs (numpy.ndarray): (n, 2) UV coordinates
+
+    Returns:
+        numpy.ndarray: (n,) values
+    """
+    height, width = pixels.shape
+    # pixel centres are at half pixel offsets
+    x = uvs[:, 0] * width - 0.5
+    y = uvs[:, 1] * height - 0.5
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    fx = x - x0
+    fy = y - y0
+    x0 = x0.astype(np.int64) % width
+    y0 = y0.astype(np.int64) % height
+    x1 = (x0 + 1) % width
+    y1 = (y0 + 1) % height
+    return (
+        (pixels[y0, x0] * (1 - fx) + pixels[y0, x1] * fx) * (1 - fy)
+        + (pixels[y1, x0] * (1 - fx) + pixels[y1, x1] * fx) * fy)
+
+
+def get_displacement_evaluators(obj):
+    """Return evaluators for the displacement materials of an object.
+
+    Args:
+        obj (bpy.types.Object): object
+
+    Raises:
+        UnsupportedNodeError: if a displacement material can't be evaluated
+
+    Returns:
+        dict{int: DisplacementEvaluator}: evaluator of each material slot with a displacement material
+    """
+    from ..materials.node_evaluator import DisplacementEvaluator
+    evaluators = {}
+    by_material = {}
+    for index, slot in enumerate(obj.material_slots):
+        material = slot.material
+        if material is None or material.node_tree is None or 'disp_emission' not in material.node_tree.nodes:
+            continue
+        if material.name not in by_material:
+            by_material[material.name] = DisplacementEvaluator(material)
+        evaluators[index] = by_material[material.name]
+    return evaluators
+
+
+def apply_displacement(obj, get_heights, levels=None):
+    """Subdivide an object's mesh and move its vertices along their normals.
+
+    The displacement is restricted to disp_mod_vert_group and scaled by the
+    object's displacement strength, as the displace modifier would. The
+    object's mesh is replaced by the displaced mesh, its subsurf modifier is
+    switched off and the original mesh is stored in preview_mesh. The
+    displaced mesh shows the secondary material, so store the preview
+    materials first. If get_heights raises the object is left unchanged.
+
+    Args:
+        obj (bpy.types.Object): displacement object in preview mode
+        get_heights (function): called with the subdivided mesh, its (n, 3)
+            vertex coordinates and normals and an (n,) bool mask of the
+            vertices that are displaced. Returns (n,) heights.
+        levels (int, optional): subdivision levels. Defaults to the levels of the object's subsurf modifier.
+    """
+    props = obj.mt_object_props
+    preview_mesh = obj.data
+    subsurf_mod = obj.modifiers[props.subsurf_mod_name]
+
+    if 'disp_mod_vert_group' in obj.vertex_groups:
+        weights = get_vert_group_mask('disp_mod_vert_group', obj).astype(np.float32)
+    else:
+        weights = np.zeros(len(preview_mesh.vertices), dtype=np.float32)
+    attribute = preview_mesh.attributes.new(_weight_attribute, 'FLOAT', 'POINT')
+    attribute.data.foreach_set('value', weights)
+
+    # evaluate the subsurf modifier on its own. Later modifiers such as booleans
+    # stay on the object and work on the displaced mesh
+    show_viewport = [mod.show_viewport for mod in obj.modifiers]
+    orig_levels = subsurf_mod.levels
+    try:
+        for mod in obj.modifiers:
+            mod.show_viewport = mod == subsurf_mod
+        if levels is not None:
+            subsurf_mod.levels = levels
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        mesh = bpy.data.meshes.new_from_object(
+            obj.evaluated_get(depsgraph),
+            preserve_all_data_layers=True,
+            depsgraph=depsgraph)
+    finally:
+        for mod, shown in zip(obj.modifiers, show_viewport):
+            mod.show_viewport = shown
+        subsurf_mod.levels = orig_levels
+        preview_mesh.attributes.remove(preview_mesh.attributes[_weight_attribute])
+
+    verts = mesh.vertices
+    co = np.empty(len(verts) * 3, dtype=np.float32)
+    verts.foreach_get('co', co)
+    co = co.reshape(-1, 3).astype(float)
+    normals = np.empty(len(verts) * 3, dtype=np.float32)
+    verts.foreach_get('normal', normals)
+    normals = normals.reshape(-1, 3).astype(float)
+    weights = np.empty(len(verts), dtype=np.float32)
+    mesh.attributes[_weight_attribute].data.foreach_get('value', weights)
+    mesh.attributes.remove(mesh.attributes[_weight_attribute])
+
+    try:
+        heights = get_heights(mesh, co, normals, weights > 0)
+    except Exception:
+        bpy.data.meshes.remove(mesh)
+        raise
+    co += normals * (heights * weights * props.displacement_strength)[:, None]
+    verts.foreach_set('co', co.ravel())
+    mesh.update()
+
+    mesh.name = preview_mesh.name + '.displaced'
+    props.preview_mesh = preview_mesh
+    obj.data = mesh
+    # show the actual geometry rather than the preview material
+    assign_secondary_material(obj)
+
+    subsurf_mod.show_viewport = False
+    subsurf_mod.show_render = False
+    props.is_displaced = True
+
+
+def restore_preview_mesh(obj):
+    """Swap an object displaced by apply_displacement back to its original mesh.
+
+    Args:
+        obj (bpy.types.Object): object
+    """
+    props = obj.mt_object_props
+    if props.preview_mesh is None:
+        return
+    displaced_mesh = obj.data
+    obj.data = props.preview_mesh
+    props.preview_mesh = None
+    if displaced_mesh.users == 0:
+        bpy.data.meshes.remove(displaced_mesh)
+
+    if props.subsurf_mod_name in obj.modifiers:
+        subsurf_mod = obj.modifiers[props.subsurf_mod_name]
+        subsurf_mod.show_viewport = True
+        subsurf_mod.show_render = True
+
+
+def _evaluate_heights(obj, evaluators, mesh, co, normals, mask):
+    """Evaluate the displacement materials of obj at the vertices of its subdivided mesh."""
+    from ..materials.node_evaluator import ShadingPoints
+    heights = np.zeros(len(co))
+    if not evaluators or not mask.any():
+        return heights
+
+    loops = mesh.loops
+    loop_verts = np.empty(len(loops), dtype=np.int32)
+    loops.foreach_get('vertex_index', loop_verts)
+    polys = mesh.polygons
+    loop_totals = np.empty(len(polys), dtype=np.int32)
+    polys.foreach_get('loop_total', loop_totals)
+    loop_starts = np.empty(len(polys), dtype=np.int32)
+    polys.foreach_get('loop_start', loop_starts)
+    material_indices = np.empty(len(polys), dtype=np.int32)
+    polys.foreach_get('material_index', material_indices)
+    order = np.argsort(loop_starts, kind='stable')
+    loop_materials = np.repeat(material_indices[order], loop_totals[order])
+
+    # a vertex takes its height from any displacement material around it
+    vert_materials = np.full(len(co), -1, dtype=np.int32)
+    displaced_loops = np.isin(loop_materials, list(evaluators))
+    vert_materials[loop_verts[displaced_loops]] = loop_materials[displaced_loops]
+
+    # shaders use the active render UV map
+    uv_layer = mesh.uv_layers.active
+    for layer in mesh.uv_layers:
+        if layer.active_render:
+            uv_layer = layer
+    uvs = np.zeros((len(co), 3))
+    uvs[:, :2] = _get_vertex_uvs(mesh, uv_layer)
+
+    # generated coordinates span the texture space of the undisplaced mesh
+    texspace_location = np.array(obj.data.texspace_location)
+    texspace_size = np.array(obj.data.texspace_size)
+    generated = np.divide(
+        co - (texspace_location - texspace_size),
+        2 * texspace_size,
+        out=np.zeros_like(co),
+        where=texspace_size != 0)
+
+    matrix_world = np.array(obj.matrix_world)
+    for index, evaluator in evaluators.items():
+        verts = np.flatnonzero(mask & (vert_materials == index))
+        if len(verts):
+            points = ShadingPoints(co[verts], normals[verts], generated[verts], uvs[verts], matrix_world)
+            heights[verts] = evaluator.evaluate(points)
+    return heights
+
+
+def _get_vertex_uvs(mesh, uv_layer):
+    """Return the (n, 2) UV of each vertex. Vertices on seams take the UV of their first loop."""
+    uvs = np.zeros((len(mesh.vertices), 2))
+    if uv_layer is None:
+        return uvs
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loop_verts)
+    loop_uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+    uv_layer.data.foreach_get('uv', loop_uvs)
+    # assign in reverse so the first loop of each vertex is written last
+    uvs[loop_verts[::-1]] = loop_uvs.reshape(-1, 2)[::-1]
+    return uvs
@@ -19,6 +19,8 @@ from .tile_creation.create_tile import (
     create_main_part_blueprint_enums)
 from .utils.registration import get_prefs
 from .app_handlers import create_default_materials
+from .lib.utils.bake_cache import get_bake_cache_stats_text
+from . import auto_load
 
 
 class MT_DefaultMaterial(PropertyGroup):
@@ -40,6 +42,7 @@ class MT_MakeTilePreferences(bpy.types.AddonPreferences):
     user_path = os.path.expanduser('~')
     export_path = os.path.join(user_path, 'MakeTile')
     user_assets_path = os.path.join(user_path, 'MakeTile')
+    bake_cache_path = os.path.join(user_path, 'MakeTile', 'bake_cache')
 
     assets_path: StringProperty(
         name="Default Asset Libraries",
@@ -67,6 +70,20 @@ class MT_MakeTilePreferences(bpy.types.AddonPreferences):
         default=export_path,
     )
 
+    bake_cache_path: StringProperty(
+        name="Bake Cache",
+        subtype='DIR_PATH',
+        description="Folder to keep baked displacement maps in so unchanged tiles don't need baking again",
+        default=bake_cache_path,
+    )
+
+    bake_cache_size: IntProperty(
+        name="Bake Cache Size (MB)",
+        description="Least recently used maps are deleted when the bake cache grows beyond this",
+        default=1024,
+        min=1
+    )
+
     old_path: StringProperty(
         name="Old Path",
         subtype='DIR_PATH',
@@ -123,6 +140,14 @@ class MT_MakeTilePreferences(bpy.types.AddonPreferences):
         layout.prop(self, 'default_export_path')
         layout.prop(self, 'default_units')
         layout.prop(self, 'default_mat_behaviour')
+        layout.prop(self, 'bake_cache_path')
+        row = layout.row()
+        row.prop(self, 'bake_cache_size')
+        row.operator('scene.mt_clear_bake_cache')
+        layout.label(text=get_bake_cache_stats_text())
+        row = layout.row()
+        row.label(text=auto_load.get_startup_report().splitlines()[0])
+        row.operator('addons.mt_print_startup_report')
         layout.label(text="Default Materials:")
         # Draw list of default materials
         i = 0
@@ -140,6 +165,16 @@ class MT_MakeTilePreferences(bpy.types.AddonPreferences):
         op = layout.operator('addons.mt_add_active_mat_to_defaults')
 
 
+class MT_OT_Print_Startup_Report(Operator):
+    bl_idname = "addons.mt_print_startup_report"
+    bl_label = "Print Startup Report"
+    bl_description = "Print how long MakeTile took to start up to the system console."
+
+    def execute(self, context):
+        print(auto_load.get_startup_report())
+        return {'FINISHED'}
+
+
 class MT_OT_Restore_Default_Materials(Operator):
     bl_idname = "addons.mt_restore_default_materials"
     bl_label = "Restore Default Materials"
@@ -134,6 +134,12 @@ class MT_Object_Properties(PropertyGroup):
         type=MT_Preview_Materials
     )
 
+    preview_mesh: bpy.props.PointerProperty(
+        name="Preview Mesh",
+        type=bpy.types.Mesh,
+        description="The undisplaced mesh of an object that has been displaced on the CPU"
+    )
+
 
 def register():
     # Property group that contains properties of an object stored on the object
@@ -8,11 +8,12 @@ from bpy.props import (
     PointerProperty)
 from ..enums.enums import (
     units,
-    material_mapping)
+    material_mapping,
+    displacement_methods)
 from ..tile_creation.create_tile import MT_Tile_Generator
 from ..lib.utils.utils import get_all_subclasses, get_annotations
 from ..tile_creation.create_tile import create_tile_type_enums
-from ..app_handlers import load_tile_defaults
+from ..app_handlers import get_tile_defaults
 
 def update_disp_strength(self, context):
     """Update the displacement strength of the maketile displacement modifier on active object.
@@ -24,6 +25,9 @@ def update_disp_strength(self, context):
     if context.active_object.select_get():
         obj_props = obj.mt_object_props
         obj_props.displacement_strength = context.scene.mt_scene_props.displacement_strength
+        # applied displacement is already part of the mesh
+        if obj_props.preview_mesh is not None:
+            return
         try:
             obj.modifiers[obj_props.disp_mod_name].strength = context.scene.mt_scene_props.displacement_strength
         except KeyError:
@@ -83,40 +87,32 @@ def reset_part_defaults(self, context):
     tile_type = self.tile_type
     base_blueprint = self.base_blueprint
     main_part_blueprint = self.main_part_blueprint
-    tile_defaults = load_tile_defaults(context)
-    for tile in tile_defaults:
-        if tile['type'] == tile_type:
-            defaults = tile['defaults']
-            base_defaults = defaults['base_defaults']
-            for key, value in base_defaults.items():
-                if key == base_blueprint:
-                    for k, v in value.items():
-                        setattr(self, k, v)
-                    break
-            try:
-                main_part_defaults = defaults['tile_defaults']
-                for key, value in main_part_defaults.items():
-                    if key == main_part_blueprint:
-                        for k, v in value.items():
-                            setattr(self, k, v)
-                        break
-            # Some tiles like mini bases don;t have main parts
-            except KeyError:
-                pass
+    tile = get_tile_defaults(context, tile_type)
+    if tile is None:
+        return
+
+    defaults = tile['defaults']
+    base_defaults = defaults['base_defaults']
+    if base_blueprint in base_defaults:
+        for k, v in base_defaults[base_blueprint].items():
+            setattr(self, k, v)
+
+    # Some tiles like mini bases don;t have main parts
+    main_part_defaults = defaults.get('tile_defaults', {})
+    if main_part_blueprint in main_part_defaults:
+        for k, v in main_part_defaults[main_part_blueprint].items():
+            setattr(self, k, v)
 
 def update_scene_defaults(self, context):
     tile_type = self.tile_type
-    tile_defaults = load_tile_defaults(context)
-    for tile in tile_defaults:
-        if tile['type'] == tile_type:
-            defaults = tile['defaults']
-            for key, value in defaults.items():
-                if hasattr(self, key):
-                    try:
-                        setattr(self, key, value)
-                    except TypeError:
-                        pass
-            break
+    tile = get_tile_defaults(context, tile_type)
+    if tile is not None:
+        for key, value in tile['defaults'].items():
+            if hasattr(self, key):
+                try:
+                    setattr(self, key, value)
+                except TypeError:
+                    pass
     reset_part_defaults(self, context)
 
 def create_scene_props():
@@ -200,6 +196,15 @@ def create_scene_props():
             name="Variants",
             description="Number of variants of tile to export",
             default=1),
+        "export_workers": IntProperty(
+            name="Workers",
+            description="Number of background Blender processes to export with. 1 exports in this Blender",
+            default=1,
+            min=1),
+        "reuse_exports": BoolProperty(
+            name="Reuse Exports",
+            description="Skip tile variants that are already in the export folder unchanged. Randomised variants are seeded from the tile so they are the same each export",
+            default=True),
         "randomise_on_export": BoolProperty(
             name="Randomise",
             description="Create random variant on export?",
@@ -221,6 +226,15 @@ def create_scene_props():
             default=3,
             soft_max=8,
             update=update_disp_subdivisions),
+        "displacement_method": EnumProperty(
+            name="Displacement",
+            items=displacement_methods,
+            description="How Make 3D and Export displace tiles",
+            default='BAKE'),
+        "apply_displacement": BoolProperty(
+            name="Apply Displacement",
+            description="Move the vertices of baked tiles rather than displacing them with modifiers. Faster, but changing the displacement strength needs Make 3D again",
+            default=True),
         # rather than creating this in the the MT_Tile_Generator class and copying it we set it seperately here
         # and in the tile_props to allow us to have different update functions
         "tile_type": EnumProperty(
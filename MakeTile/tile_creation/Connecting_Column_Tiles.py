@@ -20,6 +20,7 @@ from .create_tile import (
     get_subdivs,
     create_material_enums,
     add_subsurf_modifier)
+from ..lib.utils.asset_cache import cutter_cache
 from ..lib.bmturtle.scripts import (
     draw_cuboid)
 from .Straight_Tiles import (
@@ -507,10 +508,9 @@ def spawn_openlock_L_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    objects = cutter_cache.objects(booleans_path, ['openlock.wall.cutter.side'])
 
-    bottom_right_cutter = data_to.objects[0].copy()
+    bottom_right_cutter = objects[0]
     bottom_right_cutter.name = 'Right Bottom.' + tile_name
 
     add_object_to_collection(bottom_right_cutter, tile_name)
@@ -601,10 +601,9 @@ def spawn_openlock_T_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    objects = cutter_cache.objects(booleans_path, ['openlock.wall.cutter.side'])
 
-    bottom_left_cutter = data_to.objects[0].copy()
+    bottom_left_cutter = objects[0]
     bottom_left_cutter.name = 'Left Bottom.' + tile_name
 
     add_object_to_collection(bottom_left_cutter, tile_name)
@@ -722,10 +721,9 @@ def spawn_openlock_X_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    objects = cutter_cache.objects(booleans_path, ['openlock.wall.cutter.side'])
 
-    bottom_left_cutter = data_to.objects[0].copy()
+    bottom_left_cutter = objects[0]
     bottom_left_cutter.name = 'Left Bottom.' + tile_name
 
     add_object_to_collection(bottom_left_cutter, tile_name)
@@ -873,14 +871,13 @@ def spawn_socket_buffers(cutters, tile_props):
         "openlock.blend")
 
     # load buffer mesh
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.meshes = ['socket_buffer']
+    meshes = cutter_cache.meshes(booleans_path, ['socket_buffer'])
 
     buffers = []
 
     for cutter in cutters:
         buffer = cutter.copy()
-        buffer.data = data_to.meshes[0].copy()
+        buffer.data = meshes[0].copy()
         buffer.name = 'Buffer ' + cutter.name
         add_object_to_collection(buffer, tile_props.tile_name)
         buffers.append(buffer)
@@ -910,10 +907,9 @@ def spawn_openlock_I_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    objects = cutter_cache.objects(booleans_path, ['openlock.wall.cutter.side'])
 
-    bottom_left_cutter = data_to.objects[0].copy()
+    bottom_left_cutter = objects[0]
     bottom_left_cutter.name = 'Left Bottom.' + tile_name
 
     add_object_to_collection(bottom_left_cutter, tile_name)
@@ -994,10 +990,9 @@ def spawn_openlock_O_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter and add to collection
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    objects = cutter_cache.objects(booleans_path, ['openlock.wall.cutter.side'])
 
-    bottom_cutter = data_to.objects[0].copy()
+    bottom_cutter = objects[0]
     bottom_cutter.name = 'Bottom.' + tile_name
 
     add_object_to_collection(bottom_cutter, tile_name)
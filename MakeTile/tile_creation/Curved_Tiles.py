@@ -10,6 +10,7 @@ from bpy.props import (
     BoolProperty,
     StringProperty)
 
+from ..lib.utils.asset_cache import cutter_cache
 from ..lib.utils.collections import (
     add_object_to_collection)
 
@@ -516,13 +517,12 @@ def spawn_openlock_wall_cutters(tile_props):
         "openlock.blend")
 
     # load side cutter
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    objects = cutter_cache.objects(booleans_path, ['openlock.wall.cutter.side'])
 
     cutters = []
 
     # left side cutters
-    left_cutter_bottom = data_to.objects[0].copy()
+    left_cutter_bottom = objects[0]
     left_cutter_bottom.name = 'X Neg Bottom.' + tile_name
     add_object_to_collection(left_cutter_bottom, tile_props.tile_name)
 
@@ -575,8 +575,9 @@ def spawn_openlock_wall_cutters(tile_props):
         verts=bm.verts,
         vec=(0, radius, 0.63),
         space=left_cutter_bottom.matrix_world)
-    bm.to_mesh(left_cutter_bottom.data)
+    bm.to_mesh(me)
     bm.free()
+    left_cutter_bottom.data = me
 
     for cutter in cutters:
         array_mod = cutter.modifiers.new('Array', 'ARRAY')
@@ -773,13 +774,13 @@ def spawn_openlock_base_clip_cutter(self, base, tile_props):
         "booleans",
         cutter_file)
 
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        if self.base_socket_type == 'OPENLOCK':
-            data_to.objects = ['openlock.wall.base.cutter.clip_single']
-        elif self.base_socket_type == 'OPENLOCK-NoSupport':
-           data_to.objects = ['openlock.wall.base.cutter.clip_single.nosupp']
+    if self.base_socket_type == 'OPENLOCK':
+        names = ['openlock.wall.base.cutter.clip_single']
+    elif self.base_socket_type == 'OPENLOCK-NoSupport':
+        names = ['openlock.wall.base.cutter.clip_single.nosupp']
+    objects = cutter_cache.objects(booleans_path, names)
 
-    clip_cutter = data_to.objects[0]
+    clip_cutter = objects[0]
     add_object_to_collection(clip_cutter, tile_props.tile_name)
     deselect_all()
     select(clip_cutter.name)
@@ -843,8 +844,9 @@ def spawn_openlock_base_clip_cutter(self, base, tile_props):
             space=clip_cutter.matrix_world)
         i += 1
 
-    bm.to_mesh(clip_cutter.data)
+    bm.to_mesh(mesh)
     bm.free()
+    clip_cutter.data = mesh
 
     clip_cutter.name = 'Clip.' + base.name
     set_bool_obj_props(clip_cutter, base, tile_props, 'DIFFERENCE')
@@ -8,6 +8,7 @@ from bpy.props import (
     EnumProperty,
     FloatProperty)
 
+from ..lib.utils.asset_cache import cutter_cache
 from ..lib.utils.collections import (
     add_object_to_collection)
 
@@ -585,11 +586,10 @@ def spawn_openlock_wall_cutters(self, core, tile_props):
         "openlock.blend")
 
     # load side cutter
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    objects = cutter_cache.objects(booleans_path, ['openlock.wall.cutter.side'])
 
     cutters = []
-    cutter_mesh = data_to.objects[0].data.copy()
+    cutter_mesh = objects[0].data.copy()
     left_cutter_bottom = bpy.data.objects.new("cutter", cutter_mesh)
 
     # left side cutters
@@ -629,7 +629,7 @@ def spawn_openlock_wall_cutters(self, core, tile_props):
 
     # right side cutters
 
-    right_cutter_bottom = data_to.objects[0].copy()
+    right_cutter_bottom = objects[0]
     right_cutter_bottom.name = 'Leg 1 Bottom.' + tile_name
 
     add_object_to_collection(right_cutter_bottom, tile_name)
@@ -850,8 +850,6 @@ def spawn_s_base(self, context, tile_props, base_blueprint):
             base = spawn_openlock_rect_s_base(self, tile_props, unadjusted_base_size)
 
         if self.wall_position in ['SIDE', 'EXTERIOR']:
-            orig_loc = cursor.location.copy()
-
             cursor.location = (
                 orig_loc[0] + 0.09,
                 orig_loc[1] + 0.09,
@@ -971,21 +969,21 @@ def spawn_openlock_base(self, tile_props):
         cutter_file)
 
     # load base cutters
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        if self.base_socket_type == 'OPENLOCK':
-            data_to.objects = [
-                'openlock.wall.base.cutter.clip.001',
-                'openlock.wall.base.cutter.clip.cap.start.001',
-                'openlock.wall.base.cutter.clip.cap.end.001']
-        elif self.base_socket_type == 'OPENLOCK-NoSupport':
-            data_to.objects = [
-                'openlock.wall.base.cutter.clip.001.nosupp',
-                'openlock.wall.base.cutter.clip.cap.start.001',
-                'openlock.wall.base.cutter.clip.cap.end.001']
-
-    clip_cutter = data_to.objects[0]
-    cutter_start_cap = data_to.objects[1]
-    cutter_end_cap = data_to.objects[2]
+    if self.base_socket_type == 'OPENLOCK':
+        names = [
+            'openlock.wall.base.cutter.clip.001',
+            'openlock.wall.base.cutter.clip.cap.start.001',
+            'openlock.wall.base.cutter.clip.cap.end.001']
+    elif self.base_socket_type == 'OPENLOCK-NoSupport':
+        names = [
+            'openlock.wall.base.cutter.clip.001.nosupp',
+            'openlock.wall.base.cutter.clip.cap.start.001',
+            'openlock.wall.base.cutter.clip.cap.end.001']
+    objects = cutter_cache.objects(booleans_path, names)
+
+    clip_cutter = objects[0]
+    cutter_start_cap = objects[1]
+    cutter_end_cap = objects[2]
 
     # we copy the mesh from clip_cutter into a new object in bmesh array to
     # avoid having to update the view_layer before using bmesh.ops
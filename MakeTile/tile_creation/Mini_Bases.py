@@ -15,6 +15,7 @@ from MakeTile.lib.bmturtle.helpers import (
     bm_select_all,
     select_verts_in_bounds,
 )
+from MakeTile.lib.bmturtle.turtle import Turtle
 
 from bpy.types import Operator, Panel
 from bpy.props import (
@@ -627,10 +628,10 @@ def draw_rounded_cuboid(radius, length, segments, height, inset, name, offset=0.
     Returns:
         bpy.tyes.Object: Rounded Cuboid
     """
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     origin = turtle.location.copy()
 
-    bm, rounded_rect = create_turtle(name)
+    bm, rounded_rect = create_turtle(name, turtle=turtle)
     bmesh.ops.create_cone(
         bm,
         cap_ends=False,
@@ -784,10 +785,10 @@ def generate_grid_base(base_template, tile_props):
     margin = tile_props.texture_margin
     height = base_template.dimensions[2]
     subdivs = get_subdivs(tile_props.subdivision_density, [size, size, height])
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     origin = turtle.location.copy()
     # create grid
-    bm, base = create_turtle("base")
+    bm, base = create_turtle("base", turtle=turtle)
     ret = bmesh.ops.create_grid(
         bm, x_segments=subdivs[0], y_segments=subdivs[1], size=size + 0.5
     )
@@ -13,6 +13,7 @@ from .. lib.utils.collections import (
     add_object_to_collection)
 from .. lib.bmturtle.scripts import draw_cuboid
 
+from ..lib.utils.asset_cache import cutter_cache
 from ..lib.utils.selection import activate
 from .create_tile import (
     spawn_empty_base,
@@ -478,28 +479,27 @@ def spawn_openlock_base_slot_cutter(base, tile_props, offset=0.236):
             "booleans",
             "rect_floor_slot_cutter.blend")
 
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            data_to.objects = [
-                'corner_xneg_yneg',
-                'corner_xneg_ypos',
-                'corner_xpos_yneg',
-                'corner_xpos_ypos',
-                'slot_cutter_a',
-                'slot_cutter_b',
-                'slot_cutter_c',
-                'base_slot_cutter_final']
-
-        for obj in data_to.objects:
+        objects = cutter_cache.objects(booleans_path, [
+            'corner_xneg_yneg',
+            'corner_xneg_ypos',
+            'corner_xpos_yneg',
+            'corner_xpos_ypos',
+            'slot_cutter_a',
+            'slot_cutter_b',
+            'slot_cutter_c',
+            'base_slot_cutter_final'])
+
+        for obj in objects:
             add_object_to_collection(obj, tile_props.tile_name)
 
-        for obj in data_to.objects:
+        for obj in objects:
             # obj.hide_set(True)
             obj.hide_viewport = True
 
-        cutter_a = data_to.objects[4]
-        cutter_b = data_to.objects[5]
-        cutter_c = data_to.objects[6]
-        cutter_d = data_to.objects[7]
+        cutter_a = objects[4]
+        cutter_b = objects[5]
+        cutter_c = objects[6]
+        cutter_d = objects[7]
 
         cutter_d.name = 'Base Slot Cutter.' + tile_props.tile_name
 
@@ -32,10 +32,12 @@ from .. lib.utils.utils import (
     calc_tri)
 from .. lib.utils.collections import (
     add_object_to_collection)
+from ..lib.utils.asset_cache import cutter_cache
 from ..lib.bmturtle.helpers import (
     bm_select_all,
     bmesh_array,
     select_verts_in_bounds,
+    BoxIndex,
     assign_verts_to_group,
     calculate_corner_wall_triangles)
 from ..lib.bmturtle.commands import (
@@ -51,6 +53,7 @@ from ..lib.bmturtle.commands import (
     up,
     dn,
     arc)
+from ..lib.bmturtle.turtle import get_turtle
 
 '''
 from line_profiler import LineProfiler
@@ -514,24 +517,24 @@ def create_openlock_base_clip_cutters(self, tile_props):
         radius = radius / 2
 
     if radius >= 1:
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            if self.base_socket_type == 'OPENLOCK':
-                data_to.objects = [
-                    'openlock.wall.base.cutter.clip.001',
-                    'openlock.wall.base.cutter.clip.cap.start.001',
-                    'openlock.wall.base.cutter.clip.cap.end.001']
-            elif self.base_socket_type == 'OPENLOCK-NoSupport':
-                data_to.objects = [
-                    'openlock.wall.base.cutter.clip.001.nosupp',
-                    'openlock.wall.base.cutter.clip.cap.start.001',
-                    'openlock.wall.base.cutter.clip.cap.end.001']
+        if self.base_socket_type == 'OPENLOCK':
+            names = [
+                'openlock.wall.base.cutter.clip.001',
+                'openlock.wall.base.cutter.clip.cap.start.001',
+                'openlock.wall.base.cutter.clip.cap.end.001']
+        elif self.base_socket_type == 'OPENLOCK-NoSupport':
+            names = [
+                'openlock.wall.base.cutter.clip.001.nosupp',
+                'openlock.wall.base.cutter.clip.cap.start.001',
+                'openlock.wall.base.cutter.clip.cap.end.001']
+        objects = cutter_cache.objects(booleans_path, names)
         '''
-        for obj in data_to.objects:
+        for obj in objects:
             add_object_to_collection(obj, tile_props.tile_name)
         '''
-        cutter = data_to.objects[0]
-        cutter_start_cap = data_to.objects[1]
-        cutter_end_cap = data_to.objects[2]
+        cutter = objects[0]
+        cutter_start_cap = objects[1]
+        cutter_end_cap = objects[2]
 
         clip_cutter_1 = bpy.data.objects.new(
             "Clip Cutter 1", cutter.data.copy())
@@ -635,12 +638,12 @@ def create_openlock_base_clip_cutters(self, tile_props):
     bpy.data.objects.remove(cutter_start_cap)
 
     if tile_props.curve_type == 'POS':
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            if self.base_socket_type == 'OPENLOCK':
-                data_to.objects = ['openlock.wall.base.cutter.clip_single']
-            elif self.base_socket_type == 'OPENLOCK-NoSupport':
-                data_to.objects = ['openlock.wall.base.cutter.clip_single.nosupp']
-        cutter = data_to.objects[0]
+        if self.base_socket_type == 'OPENLOCK':
+            names = ['openlock.wall.base.cutter.clip_single']
+        elif self.base_socket_type == 'OPENLOCK-NoSupport':
+            names = ['openlock.wall.base.cutter.clip_single.nosupp']
+        objects = cutter_cache.objects(booleans_path, names)
+        cutter = objects[0]
 
         clip_cutter_3 = bpy.data.objects.new(
             "Clip Cutter 3", cutter.data.copy())
@@ -941,20 +944,24 @@ def draw_pos_curved_semi_circ_core(dimensions, subdivs, margin=0.001):
     verts.layers.deform.verify()
     deform_groups = verts.layers.deform.active
 
+    box_index = BoxIndex(bm)
     side_b_verts = []
     for loc in vert_locs['Side b']:
         side_b_verts.extend(select_verts_in_bounds(
             lbound=loc,
             ubound=(loc[0], loc[1], loc[2] + height),
             buffer=margin / 2,
-            bm=bm))
+            bm=bm,
+            index=box_index,
+            select=False))
 
     side_c_verts = select_verts_in_bounds(
         lbound=obj.location,
         ubound=(obj.location[0], obj.location[1] +
                 radius, obj.location[2] + height),
         buffer=margin / 2,
-        bm=bm)
+        bm=bm,
+        index=box_index)
 
     side_a_verts = []
     for loc in vert_locs['Side a']:
@@ -962,10 +969,12 @@ def draw_pos_curved_semi_circ_core(dimensions, subdivs, margin=0.001):
             lbound=loc,
             ubound=(loc[0], loc[1], loc[2] + height),
             buffer=margin / 2,
-            bm=bm))
+            bm=bm,
+            index=box_index,
+            select=False))
 
     # verts not to include in top
-    vert_list = bottom_verts + side_a_verts + side_b_verts + side_c_verts
+    vert_list = set(bottom_verts + side_a_verts + side_b_verts + side_c_verts)
 
     # assign verts to groups
     assign_verts_to_group(bottom_verts, obj, deform_groups, 'Bottom')
@@ -1114,20 +1123,24 @@ def draw_neg_curved_semi_circ_core(dimensions, subdivs, margin=0.001):
     verts.layers.deform.verify()
     deform_groups = verts.layers.deform.active
 
+    box_index = BoxIndex(bm)
     side_b_verts = []
     for loc in vert_locs['Side b']:
         side_b_verts.extend(select_verts_in_bounds(
             lbound=loc,
             ubound=(loc[0], loc[1], loc[2] + height),
             buffer=margin / 2,
-            bm=bm))
+            bm=bm,
+            index=box_index,
+            select=False))
 
     side_c_verts = select_verts_in_bounds(
         lbound=obj.location,
         ubound=(obj.location[0], obj.location[1] +
                 radius, obj.location[2] + height),
         buffer=margin / 2,
-        bm=bm)
+        bm=bm,
+        index=box_index)
 
     side_a_verts = []
     for loc in vert_locs['Side a']:
@@ -1135,10 +1148,12 @@ def draw_neg_curved_semi_circ_core(dimensions, subdivs, margin=0.001):
             lbound=loc,
             ubound=(loc[0], loc[1], loc[2] + height),
             buffer=margin / 2,
-            bm=bm))
+            bm=bm,
+            index=box_index,
+            select=False))
 
     # verts not to include in top
-    vert_list = bottom_verts + side_a_verts + side_b_verts + side_c_verts
+    vert_list = set(bottom_verts + side_a_verts + side_b_verts + side_c_verts)
 
     # assign verts to groups
     assign_verts_to_group(bottom_verts, obj, deform_groups, 'Bottom')
@@ -1178,7 +1193,7 @@ def draw_pos_curved_slot_cutter(dimensions, subdivs):
     verts = bm.verts
 
     bm.select_mode = {'VERT'}
-    turtle = bpy.context.scene.cursor
+    turtle = get_turtle()
     origin = turtle.location.copy()
 
     pu(bm)
@@ -1324,7 +1339,7 @@ def draw_neg_curved_slot_cutter(dimensions):
     bm, obj = create_turtle('slot_cutter')
     bm.select_mode = {'VERT'}
 
-    turtle = bpy.context.scene.cursor
+    turtle = get_turtle()
     # move turtle to start
     orig_rot = turtle.rotation_euler.copy()
 
@@ -12,6 +12,7 @@ from .. utils.registration import get_prefs
 from .. lib.utils.collections import (
     add_object_to_collection)
 
+from ..lib.utils.asset_cache import cutter_cache
 from ..lib.bmturtle.scripts import (
     draw_straight_wall_core,
     draw_cuboid,
@@ -513,14 +514,13 @@ def spawn_openlock_wall_cutters(core, base, tile_props):
         "openlock.blend")
 
     # load side cutter
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    objects = cutter_cache.objects(booleans_path, ['openlock.wall.cutter.side'])
 
     base_location = base.location.copy()
 
     cutters = []
     # left side cutters
-    left_cutter_bottom = data_to.objects[0].copy()
+    left_cutter_bottom = objects[0]
     left_cutter_bottom.name = 'X Neg Bottom.' + tile_name
 
     add_object_to_collection(left_cutter_bottom, tile_name)
@@ -562,7 +562,8 @@ def spawn_openlock_wall_cutters(core, base, tile_props):
 
     # right side cutters
 
-    right_cutter_bottom = data_to.objects[0].copy()
+    right_cutter_bottom = cutter_cache.objects(
+        booleans_path, ['openlock.wall.cutter.side'])[0]
     right_cutter_bottom.name = 'X Pos Bottom.' + tile_name
 
     add_object_to_collection(right_cutter_bottom, tile_name)
@@ -836,28 +837,27 @@ def spawn_openlock_base_slot_cutter(base, tile_props, offset=0.236):
             "booleans",
             "rect_floor_slot_cutter.blend")
 
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            data_to.objects = [
-                'corner_xneg_yneg',
-                'corner_xneg_ypos',
-                'corner_xpos_yneg',
-                'corner_xpos_ypos',
-                'slot_cutter_a',
-                'slot_cutter_b',
-                'slot_cutter_c',
-                'base_slot_cutter_final']
-
-        for obj in data_to.objects:
+        objects = cutter_cache.objects(booleans_path, [
+            'corner_xneg_yneg',
+            'corner_xneg_ypos',
+            'corner_xpos_yneg',
+            'corner_xpos_ypos',
+            'slot_cutter_a',
+            'slot_cutter_b',
+            'slot_cutter_c',
+            'base_slot_cutter_final'])
+
+        for obj in objects:
             add_object_to_collection(obj, tile_props.tile_name)
 
-        for obj in data_to.objects:
+        for obj in objects:
             # obj.hide_set(True)
             obj.hide_viewport = True
 
-        cutter_a = data_to.objects[4]
-        cutter_b = data_to.objects[5]
-        cutter_c = data_to.objects[6]
-        cutter_d = data_to.objects[7]
+        cutter_a = objects[4]
+        cutter_b = objects[5]
+        cutter_c = objects[6]
+        cutter_d = objects[7]
 
         cutter_d.name = 'Base Slot Cutter.' + tile_props.tile_name
 
@@ -921,24 +921,24 @@ def spawn_openlock_base_clip_cutters(self, base, tile_props):
             "booleans",
             cutter_file)
 
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            if self.base_socket_type == 'OPENLOCK':
-                data_to.objects = [
-                    'openlock.wall.base.cutter.clip',
-                    'openlock.wall.base.cutter.clip.cap.start',
-                    'openlock.wall.base.cutter.clip.cap.end']
-            elif self.base_socket_type == 'OPENLOCK-NoSupport':
-                data_to.objects = [
-                    'openlock.wall.base.cutter.clip.nosupp',
-                    'openlock.wall.base.cutter.clip.cap.start',
-                    'openlock.wall.base.cutter.clip.cap.end']
+        if self.base_socket_type == 'OPENLOCK':
+            names = [
+                'openlock.wall.base.cutter.clip',
+                'openlock.wall.base.cutter.clip.cap.start',
+                'openlock.wall.base.cutter.clip.cap.end']
+        elif self.base_socket_type == 'OPENLOCK-NoSupport':
+            names = [
+                'openlock.wall.base.cutter.clip.nosupp',
+                'openlock.wall.base.cutter.clip.cap.start',
+                'openlock.wall.base.cutter.clip.cap.end']
+        objects = cutter_cache.objects(booleans_path, names)
                 
-        for obj in data_to.objects:
+        for obj in objects:
             add_object_to_collection(obj, tile_props.tile_name)
 
-        source_cutter = data_to.objects[0]
-        cutter_start_cap = data_to.objects[1]
-        cutter_end_cap = data_to.objects[2]
+        source_cutter = objects[0]
+        cutter_start_cap = objects[1]
+        cutter_end_cap = objects[2]
 
         cutter_start_cap.hide_viewport = True
         cutter_end_cap.hide_viewport = True
@@ -13,6 +13,7 @@ from mathutils import Matrix
 
 from .. utils.registration import get_prefs
 
+from ..lib.utils.asset_cache import cutter_cache
 from ..lib.bmturtle.scripts import (
     draw_tri_prism,
     draw_tri_floor_core,
@@ -21,6 +22,7 @@ from ..lib.bmturtle.helpers import (
     bm_select_all,
     bmesh_array,
     extrude_translate)
+from ..lib.bmturtle.turtle import Turtle
 
 from .. lib.utils.collections import (
     add_object_to_collection)
@@ -415,21 +417,21 @@ def spawn_openlock_base_clip_cutters(self, dimensions, tile_props):
             cutter_file)
 
         cutters = []
-        with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-            if self.base_socket_type == 'OPENLOCK':
-                data_to.objects = [
-                    'openlock.wall.base.cutter.clip.001',
-                    'openlock.wall.base.cutter.clip.cap.start.001',
-                    'openlock.wall.base.cutter.clip.cap.end.001']
-            elif self.base_socket_type == 'OPENLOCK-NoSupport':
-                data_to.objects = [
-                    'openlock.wall.base.cutter.clip.001.nosupp',
-                    'openlock.wall.base.cutter.clip.cap.start.001',
-                    'openlock.wall.base.cutter.clip.cap.end.001']
-
-        cutter = data_to.objects[0]
-        cutter_start_cap = data_to.objects[1]
-        cutter_end_cap = data_to.objects[2]
+        if self.base_socket_type == 'OPENLOCK':
+            names = [
+                'openlock.wall.base.cutter.clip.001',
+                'openlock.wall.base.cutter.clip.cap.start.001',
+                'openlock.wall.base.cutter.clip.cap.end.001']
+        elif self.base_socket_type == 'OPENLOCK-NoSupport':
+            names = [
+                'openlock.wall.base.cutter.clip.001.nosupp',
+                'openlock.wall.base.cutter.clip.cap.start.001',
+                'openlock.wall.base.cutter.clip.cap.end.001']
+        objects = cutter_cache.objects(booleans_path, names)
+
+        cutter = objects[0]
+        cutter_start_cap = objects[1]
+        cutter_end_cap = objects[2]
 
         # for cutters the number of cutters and start and end location has to take into account
         # the angles of the triangle in order to prevent overlaps between cutters
@@ -584,9 +586,7 @@ def spawn_openlock_base_clip_cutters(self, dimensions, tile_props):
             bm = bmesh.new()
             bm.from_mesh(me)
             add_object_to_collection(a_cutter, tile_props.tile_name)
-            turtle = bpy.context.scene.cursor
-            turtle.location = loc_C
-            turtle.rotation_euler = (0, 0, 0)
+            turtle = Turtle(location=loc_C)
             bm.select_mode = {'VERT'}
             bm_select_all(bm)
             dims = cutter.dimensions.copy() + cutter_end_cap.dimensions.copy() + cutter_start_cap.dimensions.copy()
@@ -606,9 +606,9 @@ def spawn_openlock_base_clip_cutters(self, dimensions, tile_props):
             bm_select_all(bm)
             turtle.rotation_euler = (0, 0, -radians(A))
             extrude_translate(
-                bm, (0, b, 0), del_original=False, extrude=False)
+                bm, (0, b, 0), del_original=False, extrude=False, turtle=turtle)
             turtle.rotation_euler = (0, 0, 0)
-            extrude_translate(bm, (1, 0.25, 0.0002), extrude=False)
+            extrude_translate(bm, (1, 0.25, 0.0002), extrude=False, turtle=turtle)
             bmesh.ops.rotate(
                 bm,
                 verts=bm.verts,
@@ -619,7 +619,7 @@ def spawn_openlock_base_clip_cutters(self, dimensions, tile_props):
             caps = 0.083333
             turtle.rotation_euler = (0, 0, radians(C))
             extrude_translate(bm, (0, (caps * (count + 1)), 0),
-                                del_original=False, extrude=False)
+                                del_original=False, extrude=False, turtle=turtle)
 
             bm.to_mesh(me)
             bm.free()
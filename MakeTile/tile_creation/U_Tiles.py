@@ -9,6 +9,7 @@ from bpy.props import (
     FloatProperty,
     StringProperty)
 from bpy.types import Panel, Operator
+from ..lib.utils.asset_cache import cutter_cache
 from ..lib.bmturtle.commands import (
     pd,
     pu,
@@ -26,7 +27,9 @@ from ..lib.bmturtle.helpers import (
     bm_deselect_all,
     assign_verts_to_group,
     select_verts_in_bounds,
-    bm_shortest_path)
+    bm_shortest_path,
+    BMeshGraph,
+    BoxIndex)
 from .. utils.registration import get_prefs
 from .. lib.utils.collections import (
     add_object_to_collection)
@@ -314,13 +317,12 @@ def spawn_openlock_wall_cutters(base, tile_props):
         "openlock.blend")
 
     # load side cutter
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.wall.cutter.side']
+    objects = cutter_cache.objects(booleans_path, ['openlock.wall.cutter.side'])
 
-    for obj in data_to.objects:
+    for obj in objects:
         add_object_to_collection(obj, tile_name)
 
-    cutter = data_to.objects[0]
+    cutter = objects[0]
 
     array_mod = cutter.modifiers.new('Array', 'ARRAY')
     array_mod.use_relative_offset = False
@@ -650,7 +652,6 @@ def spawn_s_base(self, context, tile_props):
         base = spawn_openlock_rect_s_base(self, tile_props, unadjusted_base_size)
 
     if self.wall_position in ['SIDE', 'EXTERIOR']:
-        orig_loc = cursor.location.copy()
         cursor.location = (
                 orig_loc[0] + 0.09,
                 orig_loc[1] + 0.09,
@@ -777,24 +778,23 @@ def spawn_openlock_base_slot_cutter(tile_props):
         "booleans",
         "openlock.blend")
 
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = [
-            'openlock.u_tile.base.cutter.slot.root',
-            'openlock.u_tile.base.cutter.slot.start_cap.root',
-            'openlock.u_tile.base.cutter.slot.end_cap.root']
+    objects = cutter_cache.objects(booleans_path, [
+        'openlock.u_tile.base.cutter.slot.root',
+        'openlock.u_tile.base.cutter.slot.start_cap.root',
+        'openlock.u_tile.base.cutter.slot.end_cap.root'])
 
-    for obj in data_to.objects:
+    for obj in objects:
         add_object_to_collection(obj, tile_props.tile_name)
         # obj.hide_set(True)
         obj.hide_viewport = True
 
     # The slot cutter is a 0.1 wide rectangle with an array modifier
-    slot_cutter = data_to.objects[0]
+    slot_cutter = objects[0]
     slot_cutter.name = 'Base Slot.' + tile_props.tile_name + '.slot_cutter'
 
     # the start and end caps are both made of objects with their own modifier
-    cutter_start_cap = data_to.objects[1]
-    cutter_end_cap = data_to.objects[2]
+    cutter_start_cap = objects[1]
+    cutter_end_cap = objects[2]
 
     if base_socket_side == 'OUTER':
         # gap between slot end and side
@@ -856,24 +856,24 @@ def spawn_openlock_base_clip_cutter(self, tile_props):
         cutter_file)
 
     # load base cutters
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        if self.base_socket_type == 'OPENLOCK':
-            data_to.objects = [
-                'openlock.wall.base.cutter.clip',
-                'openlock.wall.base.cutter.clip.cap.start',
-                'openlock.wall.base.cutter.clip.cap.end']
-        elif self.base_socket_type == 'OPENLOCK-NoSupport':
-            data_to.objects = [
-                'openlock.wall.base.cutter.clip.nosupp',
-                'openlock.wall.base.cutter.clip.cap.start',
-                'openlock.wall.base.cutter.clip.cap.end']
-
-    for obj in data_to.objects:
+    if self.base_socket_type == 'OPENLOCK':
+        names = [
+            'openlock.wall.base.cutter.clip',
+            'openlock.wall.base.cutter.clip.cap.start',
+            'openlock.wall.base.cutter.clip.cap.end']
+    elif self.base_socket_type == 'OPENLOCK-NoSupport':
+        names = [
+            'openlock.wall.base.cutter.clip.nosupp',
+            'openlock.wall.base.cutter.clip.cap.start',
+            'openlock.wall.base.cutter.clip.cap.end']
+    objects = cutter_cache.objects(booleans_path, names)
+
+    for obj in objects:
         add_object_to_collection(obj, tile_props.tile_name)
 
-    clip_cutter = data_to.objects[0]
-    cutter_start_cap = data_to.objects[1]
-    cutter_end_cap = data_to.objects[2]
+    clip_cutter = objects[0]
+    cutter_start_cap = objects[1]
+    cutter_end_cap = objects[2]
 
     # cutter_start_cap.hide_set(True)
     # cutter_end_cap.hide_set(True)
@@ -1369,6 +1369,11 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
 
     kd.balance()
 
+    # vert adjacency for shortest path queries
+    graph = BMeshGraph(bm)
+    # vert locations for box queries
+    box_index = BoxIndex(bm)
+
     # leg_sides
     leg_sides = {
         'Leg 1 Inner': (vert_locs['Leg 1 Inner'][::-1], leg_1_inner_len),
@@ -1382,7 +1387,9 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
             ubound=(value[0][-1][0], value[0][-1][1] +
                     value[1], value[0][-1][2] + height),
             buffer=margin / 2,
-            bm=bm)
+            bm=bm,
+            index=box_index,
+            select=False)
 
     end_wall_sides = {
         'End Wall Inner': vert_locs['End Wall Inner'],
@@ -1394,7 +1401,9 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
             lbound=(value[0]),
             ubound=(value[-1][0], value[-1][1], value[-1][2] + height),
             buffer=margin / 2,
-            bm=bm)
+            bm=bm,
+            index=box_index,
+            select=False)
 
     # leg ends
     ends = {
@@ -1406,7 +1415,9 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
             lbound=(value[0]),
             ubound=(value[1][0], value[1][1], value[1][2] + height),
             buffer=margin / 2,
-            bm=bm)
+            bm=bm,
+            index=box_index,
+            select=False)
     bm_deselect_all(bm)
 
     # bottom
@@ -1424,8 +1435,7 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        # TODO This is really expensive. See if we can find an alternative
-        nodes = bm_shortest_path(bm, v1, v2)
+        nodes = bm_shortest_path(bm, v1, v2, graph)
         node = nodes[v2]
 
         for e in node.shortest_path:
@@ -1453,7 +1463,7 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        nodes = bm_shortest_path(bm, v1, v2)
+        nodes = bm_shortest_path(bm, v1, v2, graph)
         node = nodes[v2]
 
         for e in node.shortest_path:
@@ -1480,7 +1490,7 @@ def create_u_core_vert_groups_vert_lists_2(bm, dimensions, margin, vert_locs, su
         v1 = bm.verts[v1_index]
         v2 = bm.verts[v2_index]
 
-        nodes = bm_shortest_path(bm, v1, v2)
+        nodes = bm_shortest_path(bm, v1, v2, graph)
         node = nodes[v2]
 
         for e in node.shortest_path:
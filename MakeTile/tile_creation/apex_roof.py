@@ -1,5 +1,5 @@
 from math import radians, tan, sqrt
-from mathutils import geometry
+from mathutils import geometry, Matrix
 import bmesh
 import bpy
 from ..lib.bmturtle.commands import (
@@ -24,7 +24,8 @@ from ..lib.bmturtle.helpers import (
     assign_verts_to_group,
     select_verts_in_bounds,
     select_edges_in_bounds,
-    points_are_inside_bmesh)
+    PointClassifier)
+from ..lib.bmturtle.turtle import Turtle
 
 from .create_tile import get_subdivs
 
@@ -44,7 +45,7 @@ def draw_apex_base(self, tile_props, margin=0.001):
     #  |   C b |
     #  |_______|
     #     base
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     # roof_tile_props = tile.mt_roof_tile_props
 
     base_dims = [s for s in tile_props.base_size]
@@ -81,7 +82,7 @@ def draw_apex_base(self, tile_props, margin=0.001):
 
     # Create bmesh and object
     vert_groups = ['Base Left', 'Base Right', 'Gable Front', 'Gable Back', 'Bottom', 'Top']
-    bm, obj = create_turtle('Base', vert_groups)
+    bm, obj = create_turtle('Base', vert_groups, turtle=turtle)
 
     # create vertex group layer
     bm.verts.layers.deform.verify()
@@ -324,27 +325,16 @@ def draw_apex_base(self, tile_props, margin=0.001):
     bmesh.ops.recalc_face_normals(gable_bm, faces=gable_bm.faces)
 
     # select all points in roof mesh that are inside gable mesh
-    bm_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = points_are_inside_bmesh(bm_coords, gable_bm)
-
-    # points_are_inside isn't perfect on low poly meshes so filter out false positives here
-    for vert, select in zip(bm.verts, to_select):
-        if vert.co[1] < draw_origin[1] + margin / 2:
-            vert.select = select
-    front_verts = [v for v in bm.verts if v.select]
-    bm_deselect_all(bm)
+    bm_coords = [v.co for v in bm.verts]
+    gable = PointClassifier(gable_bm, robust=True)
+    to_select = gable.contains(bm_coords)
+    front_verts = [v for v, select in zip(bm.verts, to_select) if select]
 
     # Gable Back
-    # move gable mesh to other end
-    for v in gable_bm.verts:
-        v.co[1] = v.co[1] + base_dims[1]
-
-    to_select = points_are_inside_bmesh(bm_coords, gable_bm)
-    for vert, select in zip(bm.verts, to_select):
-        if vert.co[1] > base_dims[1] - margin / 2:
-            vert.select = select
-
-    back_verts = [v for v in bm.verts if v.select]
+    # test against gable mesh moved to other end
+    to_select = gable.contains(
+        bm_coords, Matrix.Translation((0, -base_dims[1], 0)))
+    back_verts = [v for v, select in zip(bm.verts, to_select) if select]
 
     # Free gable bmesh as we don't need it any more
     gable_bm.free()
@@ -435,7 +425,7 @@ def draw_apex_roof_top(self, tile_props, margin=0.001):
     #  |_______|
     #     base
 
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     # roof_tile_props = tile.mt_roof_tile_props
 
     base_dims = [s for s in tile_props.base_size]
@@ -556,7 +546,7 @@ def draw_apex_roof_top(self, tile_props, margin=0.001):
     subdivs = get_subdivs(density, base_dims)
 
     vert_groups = ['Left', 'Right']
-    bm, obj = create_turtle('Roof', vert_groups)
+    bm, obj = create_turtle('Roof', vert_groups, turtle=turtle)
 
     # create vertex group layer
     bm.verts.layers.deform.verify()
@@ -719,8 +709,9 @@ def draw_apex_roof_top(self, tile_props, margin=0.001):
     bmesh.ops.recalc_face_normals(left_bm, faces=left_bm.faces)
 
     # select all points inside left_bm
-    bm_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = points_are_inside_bmesh(bm_coords, left_bm)
+    bm_coords = [v.co for v in bm.verts]
+    left = PointClassifier(left_bm, robust=True)
+    to_select = left.contains(bm_coords)
 
     for vert, select in zip(bm.verts, to_select):
         if vert.co[0] < apex_loc[0] + margin and \
@@ -734,26 +725,11 @@ def draw_apex_roof_top(self, tile_props, margin=0.001):
     assign_verts_to_group(left_verts, obj, deform_groups, "Left")
     bm_deselect_all(bm)
 
-    # mirror selector mesh
-    ret = bmesh.ops.mirror(
-        left_bm,
-        geom=left_bm.verts[:] + left_bm.edges[:] + left_bm.faces[:],
-        merge_dist=0,
-        axis='X')
-
-    verts = [v for v in ret['geom'] if isinstance(v, bmesh.types.BMVert)]
-
-    for v in left_bm.verts:
-        if v not in verts:
-            left_bm.verts.remove(v)
-
-    for v in left_bm.verts:
-        v.co[0] = v.co[0] + tile_props.base_size[0]
-    bmesh.ops.recalc_face_normals(left_bm, faces=left_bm.faces)
+    # mirror selector mesh about x = base_size[0] / 2
+    mirror = Matrix.Translation((tile_props.base_size[0], 0, 0)) @ Matrix.Scale(-1, 4, (1, 0, 0))
 
-    # select all points inside right_bm
-    bm_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = points_are_inside_bmesh(bm_coords, left_bm)
+    # select all points inside mirrored left_bm
+    to_select = left.contains(bm_coords, mirror)
 
     for vert, select in zip(bm.verts, to_select):
         if vert.co[0] > apex_loc[0] - margin and \
@@ -1,7 +1,7 @@
 from math import tan, radians, sqrt, sin
 import bmesh
 import bpy
-from mathutils import geometry
+from mathutils import geometry, Matrix
 from ..lib.bmturtle.commands import (
     create_turtle,
     finalise_turtle,
@@ -21,7 +21,8 @@ from ..lib.bmturtle.helpers import (
     bm_deselect_all,
     assign_verts_to_group,
     select_verts_in_bounds,
-    points_are_inside_bmesh)
+    PointClassifier)
+from ..lib.bmturtle.turtle import Turtle
 
 from .create_tile import get_subdivs
 '''
@@ -45,7 +46,7 @@ def draw_butterfly_base(self, tile_props, margin=0.001):
     #   | b      |
     #   |________|
 
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     # roof_tile_props = tile.mt_roof_tile_props
 
     base_dims = [s for s in tile_props.base_size]
@@ -82,7 +83,7 @@ def draw_butterfly_base(self, tile_props, margin=0.001):
 
     # Create bmesh and object
     vert_groups = ['Base Left', 'Base Right', 'Gable Front', 'Gable Back', 'Bottom', 'Top']
-    bm, obj = create_turtle('Base', vert_groups)
+    bm, obj = create_turtle('Base', vert_groups, turtle=turtle)
 
     # create vertex group layer
     bm.verts.layers.deform.verify()
@@ -394,13 +395,9 @@ def draw_butterfly_base(self, tile_props, margin=0.001):
     bmesh.ops.recalc_face_normals(roof_bm, faces=roof_bm.faces)
 
     # select all points in roof mesh that are inside gable mesh
-    bm_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = points_are_inside_bmesh(
-        bm_coords,
-        roof_bm)
-    for vert, select in zip(bm.verts, to_select):
-        vert.select = select
-    top_verts = [v for v in bm.verts if v.select]
+    bm_coords = [v.co for v in bm.verts]
+    to_select = PointClassifier(roof_bm, robust=True).contains(bm_coords)
+    top_verts = [v for v, select in zip(bm.verts, to_select) if select]
 
     assign_verts_to_group(top_verts, obj, deform_groups, "Top")
     roof_bm.free()
@@ -508,7 +505,7 @@ def draw_butterfly_roof_top(self, tile_props, margin=0.001):
     #   |     B     |
     #   |___________|
 
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     # roof_tile_props = tile.mt_roof_tile_props
 
     base_dims = [s for s in tile_props.base_size]
@@ -609,7 +606,7 @@ def draw_butterfly_roof_top(self, tile_props, margin=0.001):
         base_dims[1] - (margin * 2) + tile_props.end_eaves_neg + tile_props.end_eaves_pos) / subdivs[1]
 
     vert_groups = ['Left', 'Right']
-    bm, obj = create_turtle('Roof Top', vert_groups)
+    bm, obj = create_turtle('Roof Top', vert_groups, turtle=turtle)
 
     # create vertex group layer
     bm.verts.layers.deform.verify()
@@ -693,8 +690,9 @@ def draw_butterfly_roof_top(self, tile_props, margin=0.001):
     bmesh.ops.recalc_face_normals(left_bm, faces=left_bm.faces)
 
     # select all points inside left_bm
-    bm_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = points_are_inside_bmesh(bm_coords, left_bm)
+    bm_coords = [v.co for v in bm.verts]
+    left = PointClassifier(left_bm, robust=True)
+    to_select = left.contains(bm_coords)
     # filter
     for vert, select in zip(bm.verts, to_select):
         if vert.co[0] <= select_origin[0] + margin and \
@@ -704,27 +702,11 @@ def draw_butterfly_roof_top(self, tile_props, margin=0.001):
     left_verts = [v for v in bm.verts if v.select]
     assign_verts_to_group(left_verts, obj, deform_groups, 'Left')
 
-    # mirror selector mesh
-    ret = bmesh.ops.mirror(
-        left_bm,
-        geom=left_bm.verts[:] + left_bm.edges[:] + left_bm.faces[:],
-        merge_dist=0,
-        axis='X')
-
-    verts = [v for v in ret['geom'] if isinstance(v, bmesh.types.BMVert)]
-
-    for v in left_bm.verts:
-        if v not in verts:
-            left_bm.verts.remove(v)
-
-    for v in left_bm.verts:
-        v.co[0] = v.co[0] + tile_props.base_size[0]
-
-    bmesh.ops.recalc_face_normals(left_bm, faces=left_bm.faces)
+    # mirror selector mesh about x = base_size[0] / 2
+    mirror = Matrix.Translation((tile_props.base_size[0], 0, 0)) @ Matrix.Scale(-1, 4, (1, 0, 0))
 
-    # select all points inside right_bm
-    bm_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = points_are_inside_bmesh(bm_coords, left_bm)
+    # select all points inside mirrored left_bm
+    to_select = left.contains(bm_coords, mirror)
 
     bm_deselect_all(bm)
     # filter
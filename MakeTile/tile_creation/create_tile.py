@@ -23,8 +23,9 @@ from ..lib.utils.collections import (
     activate_collection)
 
 from ..lib.utils.selection import deselect_all
+from ..lib.utils.asset_cache import cutter_cache
 from ..lib.utils.multimethod import multimethod
-from ..materials.materials import assign_mat_to_vert_group
+from ..materials.materials import assign_mat_to_vert_group, get_material
 from ..lib.utils.utils import get_all_subclasses, get_annotations
 from ..lib.utils.file_handling import absolute_file_paths
 
@@ -32,7 +33,7 @@ from ..enums.enums import (
     units,
     collection_types)
 
-from ..app_handlers import load_tile_defaults
+from ..app_handlers import get_tile_defaults, get_tile_enum_items
 '''
 from line_profiler import LineProfiler
 from os.path import splitext
@@ -81,48 +82,19 @@ def create_main_part_blueprint_enums(self, context):
     Returns:
         list[enum_item]: list of enum items
     """
-    enum_items = []
-
     if context is None:
-        return enum_items
-
-    scene = context.scene
-    scene_props = scene.mt_scene_props
-
-    tile_type = scene_props.tile_type
-    tile_defaults = load_tile_defaults(context)
+        return []
 
-    for default in tile_defaults:
-        if default['type'] == tile_type:
-            try:
-                for key, value in default['main_part_blueprints'].items():
-                    enum = (key, value, "")
-                    enum_items.append(enum)
-                return sorted(enum_items)
-            # some tiles such as mini bases don't have a main part
-            except KeyError:
-                pass
-    return enum_items
+    tile_type = context.scene.mt_scene_props.tile_type
+    return get_tile_enum_items(context, tile_type, 'main_part_blueprints')
 
 
 def create_base_blueprint_enums(self, context):
-    enum_items = []
     if context is None:
-        return enum_items
-
-    scene = context.scene
-    scene_props = scene.mt_scene_props
-
-    tile_type = scene_props.tile_type
-    tile_defaults = load_tile_defaults(context)
+        return []
 
-    for default in tile_defaults:
-        if default['type'] == tile_type:
-            for key, value in default['base_blueprints'].items():
-                enum = (key, value, "")
-                enum_items.append(enum)
-            return sorted(enum_items)
-    return enum_items
+    tile_type = context.scene.mt_scene_props.tile_type
+    return get_tile_enum_items(context, tile_type, 'base_blueprints')
 
 
 def update_scene_defaults(self, context):
@@ -133,15 +105,12 @@ def update_scene_defaults(self, context):
 def reset_scene_defaults(self, context):
     scene_props = context.scene.mt_scene_props
     tile_type = scene_props.tile_type
-    tile_defaults = load_tile_defaults(context)
+    tile = get_tile_defaults(context, tile_type)
 
-    for tile in tile_defaults:
-        if tile['type'] == tile_type:
-            defaults = tile['defaults']
-            for key, value in defaults.items():
-                if hasattr(scene_props, key):
-                    setattr(scene_props, key, value)
-            break
+    if tile is not None:
+        for key, value in tile['defaults'].items():
+            if hasattr(scene_props, key):
+                setattr(scene_props, key, value)
     reset_part_defaults(scene_props, context)
 
 
@@ -150,32 +119,24 @@ def reset_part_defaults(self, context):
     tile_type = scene_props.tile_type
     base_blueprint = self.base_blueprint
     main_part_blueprint = self.main_part_blueprint
-    floor_material = self.floor_material
-    tile_defaults = load_tile_defaults(context)
-    for tile in tile_defaults:
-        if tile['type'] == tile_type:
-            defaults = tile['defaults']
-            base_defaults = defaults['base_defaults']
-            for key, value in base_defaults.items():
-                if key == base_blueprint:
-                    for k, v in value.items():
-                        setattr(self, k, v)
-                    break
-            try:
-                main_part_defaults = defaults['tile_defaults']
-                for key, value in main_part_defaults.items():
-                    if key == main_part_blueprint:
-                        for k, v in value.items():
-                            setattr(self, k, v)
-                        break
-            # some tiles such as mini bases don't have a main part
-            except KeyError:
-                pass
-            try:
-                setattr(self, 'floor_material', defaults['floor_material'])
-            except KeyError:
-                break
-            break
+    tile = get_tile_defaults(context, tile_type)
+    if tile is None:
+        return
+
+    defaults = tile['defaults']
+    base_defaults = defaults['base_defaults']
+    if base_blueprint in base_defaults:
+        for k, v in base_defaults[base_blueprint].items():
+            setattr(self, k, v)
+
+    # some tiles such as mini bases don't have a main part
+    main_part_defaults = defaults.get('tile_defaults', {})
+    if main_part_blueprint in main_part_defaults:
+        for k, v in main_part_defaults[main_part_blueprint].items():
+            setattr(self, k, v)
+
+    if 'floor_material' in defaults:
+        setattr(self, 'floor_material', defaults['floor_material'])
 
 
 # TODO: Work out why this is called twice by operator
@@ -222,28 +183,11 @@ def create_wall_position_enums(self, context):
     Returns:
         list[EnumPropertyItem]: enum items
     """
-    prefs = get_prefs()
-    enum_items = []
-
     if context is None:
-        return enum_items
-
-    scene = context.scene
-    scene_props = scene.mt_scene_props
-
-    tile_type = scene_props.tile_type
-    tile_defaults = load_tile_defaults(context)
+        return []
 
-    for default in tile_defaults:
-        if default['type'] == tile_type:
-            try:
-                for key, value in default['wall_positions'].items():
-                    enum = (key, value, "")
-                    enum_items.append(enum)
-                return sorted(enum_items)
-            except KeyError:
-                pass
-    return enum_items
+    tile_type = context.scene.mt_scene_props.tile_type
+    return get_tile_enum_items(context, tile_type, 'wall_positions')
 
 
 class MT_OT_Reset_Tile_Defaults(Operator):
@@ -493,14 +437,11 @@ class MT_Tile_Generator:
         self.reset_defaults = False
 
         scene_props = context.scene.mt_scene_props
-        all_annotations = get_annotations(self.__class__)
-        for key in scene_props.__annotations__.keys():
-            for k in all_annotations.keys():
-                try:
-                    if k == key:
-                        setattr(self, str(k), getattr(scene_props, str(k)))
-                except TypeError:
-                    pass
+        copy_annotation_props(
+            scene_props,
+            self,
+            scene_props.__annotations__,
+            get_class_annotations(self.__class__))
         self.refresh = True
         return self.execute(context)
 
@@ -518,33 +459,20 @@ class MT_Tile_Generator:
 
         # reset tile defaults
         if self.reset_defaults:
-            tile_defaults = load_tile_defaults(context)
-            for tile in tile_defaults:
-                if tile['type'] == tile_type:
-                    defaults = tile['defaults']
-                    for key, value in defaults.items():
-                        setattr(self, key, value)
-                    break
+            defaults = get_tile_defaults(context, tile_type)['defaults']
+            for key, value in defaults.items():
+                setattr(self, key, value)
+
             main_part_blueprint = self.main_part_blueprint
             base_blueprint = self.base_blueprint
-            try:
-                main_part_defaults = defaults['tile_defaults']
-                for key, value in main_part_defaults.items():
-                    if key == main_part_blueprint:
-                        for k, v in value.items():
-                            setattr(self, k, v)
-                        break
-            except KeyError:
-                pass
-            try:
-                base_defaults = defaults['base_defaults']
-                for key, value in base_defaults.items():
-                    if key == base_blueprint:
-                        for k, v in value.items():
-                            setattr(self, k, v)
-                        break
-            except KeyError:
-                pass
+            main_part_defaults = defaults.get('tile_defaults', {})
+            if main_part_blueprint in main_part_defaults:
+                for k, v in main_part_defaults[main_part_blueprint].items():
+                    setattr(self, k, v)
+            base_defaults = defaults.get('base_defaults', {})
+            if base_blueprint in base_defaults:
+                for k, v in base_defaults[base_blueprint].items():
+                    setattr(self, k, v)
             self.reset_defaults = False
 
         # We create tile at origin and then move it back to original location.
@@ -572,7 +500,8 @@ class MT_Tile_Generator:
         # later access by the tile constructors
         tile_props = tile_collection.mt_tile_props
 
-        self_annotations = get_annotations(self.__class__)
+        # only this tile type's properties are stored on the collection
+        self_annotations = get_class_annotations(self.__class__)
         try:
             copy_annotation_props(self, tile_props, self_annotations)
         except TypeError as err:
@@ -635,7 +564,7 @@ class MT_Tile_Generator:
         prefs = get_prefs()
         if base.type == 'MESH' and prefs.secondary_material not in base.material_slots:
             base.data.materials.append(
-                bpy.data.materials[prefs.secondary_material])
+                get_material(prefs.secondary_material))
 
         # Reset location of base
         base.location = self.cursor_orig_loc
@@ -763,7 +692,10 @@ def initialise_tile_creator(context):
 
 def create_common_tile_props(scene_props, tile_props, tile_collection):
     """Create properties common to all tiles."""
-    copy_annotation_props(scene_props, tile_props)
+    copy_annotation_props(
+        scene_props,
+        tile_props,
+        target_annotations=get_class_annotations(MT_Tile_Generator))
 
     tile_props.tile_name = tile_collection.name
     tile_props.is_mt_collection = True
@@ -787,14 +719,36 @@ def copy_annotation_props(source_props, target_props, source_annotations=None, t
     if not target_annotations:
         target_annotations = target_props.__annotations__
 
+    # props are set in source order as some have update functions
     for key in source_annotations.keys():
-        for k in target_annotations.keys():
-            if k == key:
-                try:
-                    setattr(target_props, str(k),
-                            getattr(source_props, str(k)))
-                except TypeError:
-                    pass
+        if key in target_annotations:
+            try:
+                setattr(target_props, key, getattr(source_props, key))
+            except TypeError:
+                pass
+
+
+# {class: annotations}. Annotations don't change once a generator class is
+# defined so its MRO is only walked once.
+_class_annotations = {}
+
+
+def get_class_annotations(cls):
+    """Return all annotations of a class including those of its parents.
+
+    The result is cached, so don't modify it.
+
+    Args:
+        cls (type): class
+
+    Returns:
+        dict: {property name: property}
+    """
+    try:
+        return _class_annotations[cls]
+    except KeyError:
+        annotations = _class_annotations[cls] = get_annotations(cls)
+        return annotations
 
 
 def lock_all_transforms(obj):
@@ -848,8 +802,9 @@ def convert_to_displacement_core(core, textured_vertex_groups, material, subsurf
     prefs = get_prefs()
     props = core.mt_object_props
     scene_props = scene.mt_scene_props
-    prim_mat = bpy.data.materials[material]
-    sec_mat = bpy.data.materials[prefs.secondary_material]
+    # default materials are linked the first time they are used
+    prim_mat = get_material(material)
+    sec_mat = get_material(prefs.secondary_material)
 
     # check if we need to append primary material
     if prefs.default_mat_behaviour == 'APPEND' and prim_mat.library:
@@ -974,10 +929,9 @@ def load_openlock_top_peg(tile_props):
         "openlock.blend")
 
     # load peg bool
-    with bpy.data.libraries.load(booleans_path) as (data_from, data_to):
-        data_to.objects = ['openlock.top_peg']
+    objects = cutter_cache.objects(booleans_path, ['openlock.top_peg'])
 
-    peg = data_to.objects[0]
+    peg = objects[0]
     peg.name = 'Top Peg.' + tile_name
     add_object_to_collection(peg, tile_name)
 
@@ -1,5 +1,5 @@
 from math import radians, tan, sqrt
-from mathutils import geometry
+from mathutils import geometry, Matrix
 import bmesh
 import bpy
 from ..lib.bmturtle.commands import (
@@ -23,7 +23,8 @@ from ..lib.bmturtle.helpers import (
     bm_deselect_all,
     assign_verts_to_group,
     select_verts_in_bounds,
-    points_are_inside_bmesh)
+    PointClassifier)
+from ..lib.bmturtle.turtle import Turtle
 
 from ..lib.bmturtle.scripts import draw_cuboid
 
@@ -37,7 +38,7 @@ def draw_shed_base(self, tile_props, margin=0.001):
     #  |__\A
     #  C b |
     #  |___|
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
 
     # roof_tile_props = tile.mt_roof_tile_props
 
@@ -75,7 +76,7 @@ def draw_shed_base(self, tile_props, margin=0.001):
 
     # Create bmesh and object
     vert_groups = ['Base Left', 'Base Right', 'Gable Front', 'Gable Back', 'Bottom', 'Top']
-    bm, obj = create_turtle('Base', vert_groups)
+    bm, obj = create_turtle('Base', vert_groups, turtle=turtle)
 
     # create vertex group layer
     bm.verts.layers.deform.verify()
@@ -259,28 +260,16 @@ def draw_shed_base(self, tile_props, margin=0.001):
     bmesh.ops.recalc_face_normals(gable_bm, faces=gable_bm.faces)
 
     # select all points in roof mesh that are inside gable mesh
-    bm_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = points_are_inside_bmesh(bm_coords, gable_bm)
-
-    # points_are_inside isn't perfect on low poly meshes so filter out false positives here
-    for vert, select in zip(bm.verts, to_select):
-        if vert.co[1] < draw_origin[1] + margin / 2:
-            vert.select = select
-    front_verts = [v for v in bm.verts if v.select]
-
-    bm_deselect_all(bm)
+    bm_coords = [v.co for v in bm.verts]
+    gable = PointClassifier(gable_bm, robust=True)
+    to_select = gable.contains(bm_coords)
+    front_verts = [v for v, select in zip(bm.verts, to_select) if select]
 
     # Gable Back
-    # move gable mesh to other end
-    for v in gable_bm.verts:
-        v.co[1] = v.co[1] + base_dims[1]
-
-    to_select = points_are_inside_bmesh(bm_coords, gable_bm)
-    for vert, select in zip(bm.verts, to_select):
-        if vert.co[1] > base_dims[1] - margin / 2:
-            vert.select = select
-
-    back_verts = [v for v in bm.verts if v.select]
+    # test against gable mesh moved to other end
+    to_select = gable.contains(
+        bm_coords, Matrix.Translation((0, -base_dims[1], 0)))
+    back_verts = [v for v, select in zip(bm.verts, to_select) if select]
     # Free gable bmesh as we don't need it any more
     gable_bm.free()
 
@@ -366,7 +355,7 @@ def draw_shed_roof_top(self, tile_props, margin=0.001):
     #  C b |
     #  |___|
 
-    turtle = bpy.context.scene.cursor
+    turtle = Turtle.from_cursor()
     #roof_tile_props = tile.mt_roof_tile_props
 
     base_dims = [s for s in tile_props.base_size]
@@ -490,7 +479,7 @@ def draw_shed_roof_top(self, tile_props, margin=0.001):
     subdivs = get_subdivs(density, base_dims)
 
     vert_groups = ['Left', 'Right']
-    bm, obj = create_turtle('Roof', vert_groups)
+    bm, obj = create_turtle('Roof', vert_groups, turtle=turtle)
 
     # create vertex group layer
     bm.verts.layers.deform.verify()
@@ -606,8 +595,8 @@ def draw_shed_roof_top(self, tile_props, margin=0.001):
     bmesh.ops.recalc_face_normals(top_bm, faces=top_bm.faces)
 
     # select all points inside top_bm
-    bm_coords = [v.co.to_tuple() for v in bm.verts]
-    to_select = points_are_inside_bmesh(bm_coords, top_bm)
+    bm_coords = [v.co for v in bm.verts]
+    to_select = PointClassifier(top_bm).contains(bm_coords)
 
     for vert, select in zip(bm.verts, to_select):
 
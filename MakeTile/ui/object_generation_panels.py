@@ -1,7 +1,7 @@
 import bpy
 from bpy.types import Panel
 from bpy.props import BoolProperty, EnumProperty
-from ..app_handlers import load_tile_defaults
+from ..app_handlers import get_tile_defaults
 
 # TODO create a Layout Mode, Preview Mode switch. Add in a triangulate modifier that can be switched on and off for layout mode.
 # Layout mode should also switch everything to 0 subdivision layers and to solid shading
@@ -29,15 +29,16 @@ class MT_PT_Tile_Generator_Panel(Panel):
 
         layout.prop(scene_props, 'tile_type')
         layout.prop(scene_props, 'subdivisions')
+        layout.prop(scene_props, 'displacement_method')
+        layout.prop(scene_props, 'apply_displacement')
 
         # Display the appropriate operator based on tile_type
         tile_type = scene_props.tile_type
         #tile_defaults = scene_props['tile_defaults']
-        tile_defaults = load_tile_defaults(context)
+        tile = get_tile_defaults(context, tile_type)
 
-        for default in tile_defaults:
-            if default['type'] == tile_type:
-                layout.operator(default['bl_idname'], text="MakeTile")
+        if tile is not None:
+            layout.operator(tile['bl_idname'], text="MakeTile")
 
         if obj is not None and obj.type == 'MESH':
             #if obj.mt_object_props.geometry_type == 'PREVIEW':
@@ -0,0 +1,18 @@
+"""Generate and export MakeTile tiles from a manifest without the UI.
+
+MakeTile must be installed. To run:
+    blender -b -P batch_generate.py -- manifest.json [--report report.json] [--export-path dir]
+
+See MakeTile/batch.py for the manifest format.
+"""
+import sys
+import addon_utils
+
+
+def main():
+    addon_utils.enable('MakeTile', default_set=True)
+    from MakeTile.batch import main as batch_main
+    sys.exit(batch_main())
+
+
+main()
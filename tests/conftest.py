@@ -43,3 +43,30 @@ def straight_wall():
         base_blueprint = 'OPENLOCK')
     return bpy.data.collections['straight_wall']
 
+
+@pytest.fixture
+def seed_material():
+    """Return a function that makes a material with a Seed value node."""
+    def make(name, seed=1.0):
+        mat = bpy.data.materials.new(name)
+        mat.use_nodes = True
+        node = mat.node_tree.nodes.new('ShaderNodeValue')
+        node.name = 'Seed'
+        node.outputs[0].default_value = seed
+        return mat
+    return make
+
+@pytest.fixture
+def cube_object():
+    """Return a function that makes an unlinked cube object with a UV map."""
+    def make(name, material=None):
+        mesh = bpy.data.meshes.new(name)
+        bm = bmesh.new()
+        bmesh.ops.create_cube(bm, size=1)
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.uv_layers.new()
+        if material is not None:
+            mesh.materials.append(material)
+        return bpy.data.objects.new(name, mesh)
+    return make
@@ -0,0 +1,89 @@
+import os
+import json
+import pytest
+from MakeTile import auto_load
+
+
+@pytest.fixture
+def registry_path(tmp_path, monkeypatch):
+    """Point the registry at a temporary file with the add-on unregistered.
+
+    Registered classes aren't found again, so the add-on is unregistered
+    while the registry is rebuilt and registered again afterwards.
+    """
+    path = str(tmp_path / 'registry.json')
+    monkeypatch.setattr(auto_load, 'get_registry_path', lambda: path)
+    monkeypatch.setattr(auto_load, 'timings', dict(auto_load.timings))
+    modules = auto_load.modules
+    ordered_classes = auto_load.ordered_classes
+    auto_load.unregister()
+    yield path
+    auto_load.modules = modules
+    auto_load.ordered_classes = ordered_classes
+    auto_load.register()
+
+
+def test_source_key_changes_with_modules(tmp_path):
+    package = tmp_path / 'package'
+    package.mkdir()
+    module = package / 'module.py'
+    module.write_text('x = 1\n')
+    key = auto_load.get_source_key(package)
+    assert auto_load.get_source_key(package) == key
+
+    # compiled files don't change the key
+    (package / '__pycache__').mkdir()
+    (package / '__pycache__' / 'module.cpython.pyc').write_bytes(b'pyc')
+    assert auto_load.get_source_key(package) == key
+
+    module.write_text('x = 22\n')
+    edited = auto_load.get_source_key(package)
+    assert edited != key
+
+    stat = os.stat(module)
+    os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    touched = auto_load.get_source_key(package)
+    assert touched != edited
+
+    (package / 'other.py').write_text('')
+    assert auto_load.get_source_key(package) != touched
+
+
+def test_registry_is_cached(registry_path):
+    auto_load.init()
+    assert not auto_load.timings['cached']
+    assert os.path.exists(registry_path)
+    classes = list(auto_load.ordered_classes)
+    assert len(classes) > 0
+    modules = list(auto_load.modules)
+
+    auto_load.init()
+    assert auto_load.timings['cached']
+    assert auto_load.ordered_classes == classes
+    assert auto_load.modules == modules
+
+
+def test_registry_is_rebuilt_when_a_module_changes(registry_path, monkeypatch):
+    auto_load.init()
+    with open(registry_path) as f:
+        key = json.load(f)['key']
+
+    # as if a source file had been edited
+    monkeypatch.setattr(auto_load, 'get_source_key', lambda directory: 'edited')
+    auto_load.init()
+    assert not auto_load.timings['cached']
+    with open(registry_path) as f:
+        registry = json.load(f)
+    assert registry['key'] == 'edited' != key
+    assert len(registry['classes']) == len(auto_load.ordered_classes) > 0
+
+    auto_load.init()
+    assert auto_load.timings['cached']
+
+
+def test_invalid_registry_is_ignored(registry_path):
+    with open(registry_path, 'w') as f:
+        f.write('not json')
+    auto_load.init()
+    assert not auto_load.timings['cached']
+    assert auto_load.get_startup_report().startswith('MakeTile started in')
@@ -0,0 +1,61 @@
+import os
+import bpy
+from MakeTile.lib.utils.bake_cache import BakeCache
+
+
+def make_image(name, value):
+    image = bpy.data.images.new(name, 8, 8)
+    image.pixels.foreach_set([value] * 8 * 8 * 4)
+    return image
+
+
+def test_key_is_stable(tmp_path, seed_material, cube_object):
+    cache = BakeCache(str(tmp_path), 1024 * 1024)
+    mat = seed_material('bake_key_mat')
+    obj = cube_object('bake_key_obj', mat)
+    key = cache.get_key(obj, [mat], 256)
+    assert cache.get_key(obj, [mat], 256) == key
+
+    # an identical object with a copy of the material shares the key
+    copy = mat.copy()
+    other = cube_object('bake_key_other', copy)
+    assert cache.get_key(other, [copy], 256) == key
+
+    assert cache.get_key(obj, [mat], 512) != key
+    mat.node_tree.nodes['Seed'].outputs[0].default_value = 2
+    assert cache.get_key(obj, [mat], 256) != key
+
+
+def test_load_and_save(tmp_path):
+    cache = BakeCache(str(tmp_path), 1024 * 1024)
+    assert cache.load('missing', 'missing.image') is None
+    cache.save('key', make_image('bake_save', 0.5))
+    image = cache.load('key', 'bake_load')
+    assert image is not None and image.packed_file is not None
+    assert tuple(image.size) == (8, 8)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['maps']) == (1, 1, 1)
+    # a map removed by another process is a miss
+    os.remove(os.path.join(str(tmp_path), 'key.png'))
+    assert cache.load('key', 'bake_load') is None
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith('.tmp')]
+
+
+def test_eviction(tmp_path):
+    cache = BakeCache(str(tmp_path), 0)
+    for i in range(3):
+        cache.save(f'key{i}', make_image(f'bake_evict{i}', i / 3))
+        path = os.path.join(str(tmp_path), f'key{i}.png')
+        os.utime(path, (i, i))
+    # the most recent map is always kept
+    assert sorted(os.listdir(str(tmp_path))) == ['key2.png']
+    assert cache.stats()['evictions'] == 2
+
+
+def test_no_eviction(tmp_path):
+    cache = BakeCache(str(tmp_path), 0, evict=False)
+    for i in range(3):
+        cache.save(f'key{i}', make_image(f'bake_keep{i}', i / 3))
+    assert len(os.listdir(str(tmp_path))) == 3
+    cache.trim()
+    assert len(os.listdir(str(tmp_path))) == 1
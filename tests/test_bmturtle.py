@@ -0,0 +1,140 @@
+import pytest
+import bpy
+import bmesh
+from mathutils import Matrix
+from MakeTile.lib.bmturtle.turtle import Turtle
+from MakeTile.lib.bmturtle.commands import create_turtle, finalise_turtle, add_vert, fd, rt, pu, arc
+from MakeTile.lib.bmturtle.helpers import (
+    bm_deselect_all, bmesh_array, bm_shortest_path, BMeshGraph, PointClassifier,
+    BoxIndex, select_verts_in_bounds, select_edges_in_bounds)
+from MakeTile.lib.bmturtle.program import Program, build, compile_program, clear_cache
+from MakeTile.lib.bmturtle.scripts import draw_cuboid
+
+
+def test_turtle_does_not_move_cursor():
+    cursor = bpy.context.scene.cursor
+    cursor.location = (1, 2, 3)
+    cursor.rotation_euler = (0, 0, 0)
+    bm, obj = create_turtle('turtle_test')
+    add_vert(bm)
+    bm.select_mode = {'VERT'}
+    fd(bm, 2)
+    rt(90)
+    fd(bm, 1)
+    pu(bm)
+    finalise_turtle(bm, obj)
+    assert tuple(cursor.location) == pytest.approx((1, 2, 3))
+    assert len(obj.data.vertices) == 3
+
+
+def test_turtle_explicit_state():
+    bm, obj = create_turtle('turtle_test', turtle=Turtle(location=(0, 0, 0)))
+    turtle = Turtle(location=(5, 0, 0))
+    add_vert(bm, turtle)
+    bm.select_mode = {'VERT'}
+    fd(bm, 1, turtle=turtle)
+    finalise_turtle(bm, obj)
+    assert tuple(turtle.location) == pytest.approx((5, 1, 0))
+    assert sorted(tuple(v.co) for v in obj.data.vertices) == [
+        pytest.approx((5, 0, 0)), pytest.approx((5, 1, 0))]
+
+
+def test_draw_cuboid():
+    bpy.context.scene.cursor.location = (0, 0, 0)
+    obj = draw_cuboid((2, 1, 3))
+    assert tuple(obj.dimensions) == pytest.approx((2, 1, 3))
+
+
+def test_turtle_active_geometry():
+    turtle = Turtle()
+    bm, obj = create_turtle('turtle_test', turtle=turtle)
+    bm.select_mode = {'VERT'}
+    add_vert(bm, turtle)
+    fd(bm, 1, turtle=turtle)
+    vert = turtle.get_active(bm)[0]
+    assert vert.select and tuple(vert.co) == pytest.approx((0, 1, 0))
+    bm_deselect_all(bm)
+    assert turtle.get_active(bm) is None
+    finalise_turtle(bm, obj)
+
+
+def test_program_cache():
+    clear_cache()
+    program = Program()
+    program.add_vert()
+    program.select_mode({'VERT'})
+    program.fd(1)
+    program.mark('end')
+    program.select_mode({'EDGE'})
+    program.select_all()
+    program.ri(2)
+    obj, marks = build(program, 'program_test', Turtle(location=(1, 0, 0)))
+    assert compile_program(program) is compile_program(program)
+    assert tuple(marks['end']) == pytest.approx((1, 1, 0))
+    assert len(obj.data.polygons) == 1
+    assert tuple(obj.dimensions) == pytest.approx((2, 1, 0))
+
+
+def test_arc():
+    turtle = Turtle(location=(1, 1, 0))
+    bm, obj = create_turtle('turtle_test', turtle=turtle)
+    bm.select_mode = {'VERT'}
+    edges = arc(bm, 2, 90, 8, turtle=turtle)
+    assert len(edges) == 8 and len(bm.verts) == 9
+    assert tuple(turtle.location) == pytest.approx((1, 1, 0))
+    assert turtle.penstate is False
+    for v in bm.verts:
+        assert (v.co - turtle.location).length == pytest.approx(2, abs=0.05)
+    finalise_turtle(bm, obj)
+
+
+def test_bmesh_array_merges_seams():
+    bpy.context.scene.cursor.location = (0, 0, 0)
+    obj = draw_cuboid((1, 1, 1))
+    bm = bmesh_array(
+        source_obj=obj,
+        count=3,
+        relative_offset_displace=(1, 0, 0),
+        fit_type='FIXED_COUNT')
+    assert len(bm.verts) == 20
+    assert len(bm.faces) == 21
+    bm.free()
+
+
+def test_bm_shortest_path():
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=4, y_segments=4, size=1)
+    bm.verts.ensure_lookup_table()
+    graph = BMeshGraph(bm)
+    v1, v2 = bm.verts[0], bm.verts[-1]
+    for g in (None, graph):
+        node = bm_shortest_path(bm, v1, v2, g)[v2]
+        assert node.length == pytest.approx(4)
+        assert len(node.shortest_path) == 8
+    bm.free()
+
+
+def test_point_classifier():
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=2)
+    points = [(0, 0, 0), (0.9, 0.9, 0.9), (1.1, 0, 0), (0, 0, -2)]
+    for robust in (False, True):
+        classifier = PointClassifier(bm, robust=robust)
+        assert classifier.contains(points).tolist() == [True, True, False, False]
+        moved = classifier.contains(points, Matrix.Translation((-2, 0, 0)))
+        assert moved.tolist() == [False, False, True, False]
+    bm.free()
+
+
+def test_select_in_bounds():
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=4, y_segments=4, size=1)
+    index = BoxIndex(bm)
+    verts = select_verts_in_bounds((-1, -1, 0), (-1, 1, 0), 0.001, bm, index)
+    assert len(verts) == 5
+    assert [v for v in bm.verts if v.select] == verts
+    verts = select_verts_in_bounds((-1, -1, 0), (1, -1, 0), 0.001, bm, index, select=False)
+    assert len(verts) == 5 and not any(v.select for v in verts[1:])
+    edges = select_edges_in_bounds((-1, -1, 0), (1, -1, 0), 0.001, bm, index)
+    assert len(edges) == 4
+    bm.free()
@@ -0,0 +1,216 @@
+import filecmp
+import pytest
+import bpy
+from MakeTile.utils.registration import get_prefs
+from MakeTile.operators import return_to_preview
+from MakeTile.operators.exporter import ExportJob, plan_export, run_export_jobs
+from MakeTile.operators.export_farm import export_tiles_in_background
+from MakeTile.operators.export_cache import (
+    get_tile_hash,
+    get_variant_hash,
+    get_variant_seed,
+    split_reused_jobs,
+    record_exports)
+
+
+@pytest.fixture
+def make_tile(seed_material, cube_object):
+    """Return a function that makes a tile collection with one object."""
+    def make(name, material=None):
+        if material is None:
+            material = seed_material(name + '.material', 3)
+            math = material.node_tree.nodes.new('ShaderNodeMath')
+            math.name = 'Math'
+            math.operation = 'ADD'
+            material.node_tree.links.new(material.node_tree.nodes['Seed'].outputs[0], math.inputs[0])
+        collection = bpy.data.collections.new(name)
+        collection.mt_tile_props.tile_name = name
+        obj = cube_object(name + '.core', material)
+        collection.objects.link(obj)
+        obj.mt_object_props.tile_name = name
+        obj.mt_object_props.disp_texture = bpy.data.textures.new(obj.name + '.texture', 'IMAGE')
+        return collection, obj
+    return make
+
+
+@pytest.fixture
+def displacement_material(seed_material):
+    """Return a function that makes a displacement material whose noise is seeded by its Seed node."""
+    def make(name):
+        material = seed_material(name, 3)
+        nodes = material.node_tree.nodes
+        emission = nodes.new('ShaderNodeEmission')
+        emission.name = 'disp_emission'
+        noise = nodes.new('ShaderNodeTexNoise')
+        noise.noise_dimensions = '4D'
+        material.node_tree.links.new(nodes['Seed'].outputs[0], noise.inputs['W'])
+        material.node_tree.links.new(noise.outputs['Fac'], emission.inputs['Color'])
+        return material
+    return make
+
+
+@pytest.fixture
+def make_displacement_tile(make_tile):
+    """Return a function that makes a tile in the scene with a displacement object."""
+    def make(name, material):
+        collection, obj = make_tile(name, material)
+        bpy.context.scene.collection.children.link(collection)
+        props = obj.mt_object_props
+        props.is_mt_object = True
+        props.is_displacement = True
+        # the whole cube is textured with the displacement material
+        for group_name in ('disp_mod_vert_group', 'Top'):
+            group = obj.vertex_groups.new(name=group_name)
+            group.add(range(len(obj.data.vertices)), 1, 'ADD')
+        subsurf = obj.modifiers.new(props.subsurf_mod_name, 'SUBSURF')
+        subsurf.subdivision_type = 'SIMPLE'
+        obj.modifiers.new(props.disp_mod_name, 'DISPLACE').strength = 0
+        obj.data.materials.append(bpy.data.materials[get_prefs().secondary_material])
+        return collection
+    return make
+
+
+@pytest.fixture
+def export_settings(monkeypatch):
+    """Set the scene to export randomised variants on the CPU, restoring its settings afterwards.
+
+    There is no 3D view in background mode, so tiles are returned to preview
+    as if they were shown in a rendered view, which leaves their cycles
+    settings alone.
+    """
+    rendered_view = type('View3D', (), {'shading': type('Shading', (), {'type': 'RENDERED'})})
+    monkeypatch.setattr(return_to_preview, 'view3d_find', lambda return_area=False: (None, None, rendered_view, None))
+    render = bpy.context.scene.render
+    monkeypatch.setattr(render, 'engine', 'CYCLES')
+    scene_props = bpy.context.scene.mt_scene_props
+    settings = {
+        'displacement_method': 'CPU',
+        'apply_displacement': True,
+        'randomise_on_export': True,
+        'num_variants': 2,
+        'reuse_exports': True,
+        'export_subdivs': 1,
+        'voxelise_on_export': False,
+        'decimate_on_export': False,
+        'fix_non_manifold': False}
+    orig = {name: getattr(scene_props, name) for name in settings}
+    for name, value in settings.items():
+        setattr(scene_props, name, value)
+    secondary_material = get_prefs().secondary_material
+    if secondary_material not in bpy.data.materials:
+        bpy.data.materials.new(secondary_material)
+    yield scene_props
+    for name, value in orig.items():
+        setattr(scene_props, name, value)
+
+
+def tile_hash(collection, obj):
+    return get_tile_hash(bpy.context, collection, [obj])
+
+
+def test_identical_tiles_have_the_same_hash(make_tile):
+    first = make_tile('hash_tile')
+    second = make_tile('hash_tile')
+    assert first[0].name != second[0].name
+    assert first[1].mt_object_props.disp_texture.name != second[1].mt_object_props.disp_texture.name
+    assert tile_hash(*first) == tile_hash(*second)
+
+
+def test_seed_changes_hash(make_tile):
+    collection, obj = make_tile('seed_tile')
+    before = tile_hash(collection, obj)
+    obj.material_slots[0].material.node_tree.nodes['Seed'].outputs[0].default_value = 4
+    assert tile_hash(collection, obj) != before
+
+
+def test_node_attributes_and_links_change_hash(make_tile):
+    collection, obj = make_tile('node_tile')
+    tree = obj.material_slots[0].material.node_tree
+    before = tile_hash(collection, obj)
+    tree.nodes['Math'].operation = 'MULTIPLY'
+    after_operation = tile_hash(collection, obj)
+    assert after_operation != before
+    tree.links.remove(tree.links[0])
+    assert tile_hash(collection, obj) != after_operation
+
+
+def test_geometry_and_props_change_hash(make_tile):
+    collection, obj = make_tile('geometry_tile')
+    before = tile_hash(collection, obj)
+    obj.mt_object_props.displacement_strength = 0.5
+    after_props = tile_hash(collection, obj)
+    assert after_props != before
+    obj.data.vertices[0].co.x += 0.1
+    assert tile_hash(collection, obj) != after_props
+
+
+def test_variant_seeds_are_stable(make_tile):
+    collection, obj = make_tile('variant_tile')
+    h = tile_hash(collection, obj)
+    assert get_variant_seed(h, 1) == get_variant_seed(h, 1)
+    assert get_variant_seed(h, 1) != get_variant_seed(h, 2)
+    assert 0 <= get_variant_seed(h, 1) < 1
+    assert get_variant_hash(bpy.context, h, None) != get_variant_hash(bpy.context, h, 0.5)
+
+
+def test_recorded_exports_are_reused(tmp_path):
+    jobs = [
+        ExportJob('tile', i, str(tmp_path / f'tile.{i}.stl'), None, f'hash{i}')
+        for i in range(3)]
+    (tmp_path / 'tile.0.stl').write_bytes(b'stl')
+    (tmp_path / 'tile.1.stl').write_bytes(b'stl')
+    record_exports(jobs)
+
+    to_export, reused = split_reused_jobs(jobs)
+    assert [job.variant for job in to_export] == [2]
+    assert sorted(reused) == [str(tmp_path / 'tile.0.stl'), str(tmp_path / 'tile.1.stl')]
+
+    # a reused file that has been deleted is exported again
+    (tmp_path / 'tile.1.stl').unlink()
+    to_export, reused = split_reused_jobs(jobs)
+    assert [job.variant for job in to_export] == [1, 2]
+
+
+def seed_values(collection):
+    return [
+        slot.material.node_tree.nodes['Seed'].outputs[0].default_value
+        for obj in collection.objects for slot in obj.material_slots if 'Seed' in slot.material.node_tree.nodes]
+
+
+def test_randomised_export_is_reused(tmp_path, export_settings, displacement_material, make_displacement_tile):
+    collection = make_displacement_tile('reuse_tile', displacement_material('reuse_material'))
+    seeds = seed_values(collection)
+
+    jobs, reused = split_reused_jobs(plan_export(bpy.context, [collection], str(tmp_path)))
+    assert len(jobs) == 2 and reused == []
+    assert len(run_export_jobs(bpy.context, jobs)) == 2
+    # randomised Seed nodes are put back so the tile keeps its hash
+    assert seed_values(collection) == seeds
+
+    jobs, reused = split_reused_jobs(plan_export(bpy.context, [collection], str(tmp_path)))
+    assert jobs == []
+    assert len(reused) == 2
+
+    # no export farm is started when there is nothing to export
+    assert export_tiles_in_background(bpy.context, [collection], str(tmp_path)) == ([], reused, [])
+
+
+def test_variants_do_not_depend_on_earlier_tiles(tmp_path, export_settings, displacement_material, make_displacement_tile):
+    # tiles sharing a material, as with the LINK material setting. Export
+    # farm workers export each tile from the saved file, so serial exports
+    # must not depend on the tiles exported before them.
+    material = displacement_material('shared_material')
+    first = make_displacement_tile('first_tile', material)
+    second = make_displacement_tile('second_tile', material)
+
+    jobs = plan_export(bpy.context, [first, second], str(tmp_path / 'serial'))
+    run_export_jobs(bpy.context, jobs)
+
+    # the first variant of the second tile keeps the current seeds, as it
+    # would if it was exported on its own from the saved file
+    job = next(job for job in jobs if job.collection == second.name and job.seed is None)
+    alone = plan_export(bpy.context, [second], str(tmp_path / 'alone'))
+    alone_job = next(j for j in alone if j.seed is None)
+    assert alone_job.hash == job.hash
+    run_export_jobs(bpy.context, [alone_job])
+    assert filecmp.cmp(job.file_path, alone_job.file_path, shallow=False)
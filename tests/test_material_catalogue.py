@@ -0,0 +1,58 @@
+import os
+import bpy
+from MakeTile.lib.utils import material_catalogue
+from MakeTile.lib.utils.material_catalogue import get_material_catalogue
+
+
+def write_library(path, names):
+    materials = set(bpy.data.materials.new(name) for name in names)
+    bpy.data.libraries.write(path, materials)
+    for mat in materials:
+        bpy.data.materials.remove(mat)
+
+
+def count_reads(monkeypatch):
+    reads = []
+    read = material_catalogue._read_material_names
+
+    def read_material_names(path):
+        reads.append(path)
+        return read(path)
+    monkeypatch.setattr(material_catalogue, '_read_material_names', read_material_names)
+    return reads
+
+
+def test_catalogue_is_cached(tmp_path, monkeypatch):
+    reads = count_reads(monkeypatch)
+    library = str(tmp_path / 'stone.blend')
+    write_library(library, ['catalogue_stone'])
+    catalogue_path = str(tmp_path / 'catalogue.json')
+
+    assert get_material_catalogue([str(tmp_path)], catalogue_path) == {library: ['catalogue_stone']}
+    assert get_material_catalogue([str(tmp_path)], catalogue_path) == {library: ['catalogue_stone']}
+    assert reads == [library]
+
+
+def test_catalogue_is_invalidated_when_library_changes(tmp_path, monkeypatch):
+    reads = count_reads(monkeypatch)
+    library = str(tmp_path / 'stone.blend')
+    write_library(library, ['catalogue_stone'])
+    catalogue_path = str(tmp_path / 'catalogue.json')
+    get_material_catalogue([str(tmp_path)], catalogue_path)
+
+    write_library(library, ['catalogue_stone', 'catalogue_brick'])
+    stat = os.stat(library)
+    os.utime(library, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    catalogue = get_material_catalogue([str(tmp_path)], catalogue_path)
+    assert sorted(catalogue[library]) == ['catalogue_brick', 'catalogue_stone']
+    assert reads == [library, library]
+
+
+def test_removed_library_is_dropped(tmp_path):
+    library = str(tmp_path / 'stone.blend')
+    write_library(library, ['catalogue_stone'])
+    catalogue_path = str(tmp_path / 'catalogue.json')
+    get_material_catalogue([str(tmp_path)], catalogue_path)
+
+    os.remove(library)
+    assert get_material_catalogue([str(tmp_path), str(tmp_path / 'missing')], catalogue_path) == {}
@@ -0,0 +1,71 @@
+import bpy
+from MakeTile.materials.materials import (
+    load_materials,
+    material_is_unique,
+    get_material_signature,
+    signature_index)
+
+
+def test_signature_ignores_numeric_suffix(seed_material):
+    mat = seed_material('signature_mat')
+    copy = mat.copy()
+    assert copy.name != mat.name
+    assert get_material_signature(copy) == get_material_signature(mat)
+    copy.node_tree.nodes['Seed'].outputs[0].default_value = 2
+    assert get_material_signature(copy) != get_material_signature(mat)
+
+
+def test_signature_hit_dedups_loaded_material(tmp_path, seed_material):
+    mat = seed_material('library_mat')
+    path = str(tmp_path / 'library.blend')
+    bpy.data.libraries.write(path, {mat})
+    count = len(bpy.data.materials)
+
+    load_materials(path)
+    assert len(bpy.data.materials) == count
+    assert material_is_unique(mat) == (True, None)
+
+
+def test_edit_invalidates_entry(seed_material):
+    mat = seed_material('edited_mat')
+    copy = mat.copy()
+    signature_index.sync()
+    assert signature_index.find(copy) == mat
+
+    mat.node_tree.nodes['Seed'].outputs[0].default_value = 5
+    # the stale entry isn't returned even before the index is synced again
+    assert signature_index.find(copy) is None
+    signature_index.sync()
+    assert signature_index.find(copy) is None
+
+    copy.node_tree.nodes['Seed'].outputs[0].default_value = 5
+    signature_index.sync()
+    assert signature_index.find(copy) == mat
+
+
+def test_material_is_unique(seed_material):
+    mat = seed_material('unique_mat')
+    assert material_is_unique(mat) == (True, None)
+    copy = mat.copy()
+    assert material_is_unique(copy) == (False, mat)
+    assert material_is_unique(copy, [mat, copy]) == (False, mat)
+    assert material_is_unique(copy, [copy]) == (True, None)
+
+
+def test_swapped_values_are_different_materials(tmp_path, seed_material):
+    mat = seed_material('swapped_mat', 1.0)
+    scale = mat.node_tree.nodes.new('ShaderNodeValue')
+    scale.name = 'Scale'
+    scale.outputs[0].default_value = 2.0
+    swapped = mat.copy()
+    swapped.node_tree.nodes['Seed'].outputs[0].default_value = 2.0
+    swapped.node_tree.nodes['Scale'].outputs[0].default_value = 1.0
+    assert get_material_signature(swapped) != get_material_signature(mat)
+    assert material_is_unique(swapped) == (True, None)
+
+    path = str(tmp_path / 'library.blend')
+    bpy.data.libraries.write(path, {swapped})
+    bpy.data.materials.remove(swapped)
+    count = len(bpy.data.materials)
+    load_materials(path)
+    assert len(bpy.data.materials) == count + 1
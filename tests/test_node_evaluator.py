@@ -0,0 +1,260 @@
+import pytest
+import numpy as np
+import bpy
+from MakeTile.materials.node_evaluator import DisplacementEvaluator, ShadingPoints, UnsupportedNodeError
+from MakeTile.operators.vertex_displacement import displace_on_cpu
+
+
+def make_material(name='evaluator_mat'):
+    """Return a material with a disp_emission node and the emission node."""
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    emission = mat.node_tree.nodes.new('ShaderNodeEmission')
+    emission.name = 'disp_emission'
+    return mat, emission
+
+
+def add_node(mat, bl_idname, **settings):
+    node = mat.node_tree.nodes.new(bl_idname)
+    for key, value in settings.items():
+        setattr(node, key, value)
+    return node
+
+
+def link(mat, from_socket, to_socket):
+    mat.node_tree.links.new(from_socket, to_socket)
+
+
+def evaluate(mat, positions=((0, 0, 0),)):
+    points = np.array(positions, dtype=float)
+    normals = np.tile((0.0, 0.0, 1.0), (len(points), 1))
+    return DisplacementEvaluator(mat).evaluate(
+        ShadingPoints(points, normals, points, points, np.identity(4)))
+
+
+def value_node(mat, value):
+    node = add_node(mat, 'ShaderNodeValue')
+    node.outputs[0].default_value = value
+    return node
+
+
+@pytest.mark.parametrize('operation, a, b, expected', [
+    ('ADD', 0.2, 0.3, 0.5),
+    ('SUBTRACT', 0.7, 0.2, 0.5),
+    ('MULTIPLY', 0.5, 0.5, 0.25),
+    ('DIVIDE', 0.5, 2, 0.25),
+    ('DIVIDE', 0.5, 0, 0),
+    ('POWER', 0.5, 2, 0.25),
+    ('MINIMUM', 0.4, 0.6, 0.4),
+    ('MAXIMUM', 0.4, 0.6, 0.6),
+    ('MODULO', 0.7, 0.5, 0.2),
+])
+def test_math(operation, a, b, expected):
+    mat, emission = make_material()
+    math = add_node(mat, 'ShaderNodeMath', operation=operation)
+    link(mat, value_node(mat, a).outputs[0], math.inputs[0])
+    math.inputs[1].default_value = b
+    link(mat, math.outputs[0], emission.inputs['Color'])
+    assert evaluate(mat) == pytest.approx([expected])
+
+
+def test_strength_and_clamping():
+    mat, emission = make_material()
+    link(mat, value_node(mat, 0.4).outputs[0], emission.inputs['Color'])
+    emission.inputs['Strength'].default_value = 2
+    assert evaluate(mat) == pytest.approx([0.8])
+    emission.inputs['Strength'].default_value = 5
+    # a baked map is clamped to 0 - 1
+    assert evaluate(mat) == pytest.approx([1])
+
+
+def test_coordinates_and_vector_nodes():
+    mat, emission = make_material()
+    coords = add_node(mat, 'ShaderNodeTexCoord')
+    mapping = add_node(mat, 'ShaderNodeMapping', vector_type='POINT')
+    mapping.inputs['Scale'].default_value = (0.5, 1, 1)
+    mapping.inputs['Location'].default_value = (0.1, 0, 0)
+    separate = add_node(mat, 'ShaderNodeSeparateXYZ')
+    link(mat, coords.outputs['Object'], mapping.inputs['Vector'])
+    link(mat, mapping.outputs[0], separate.inputs[0])
+    link(mat, separate.outputs['X'], emission.inputs['Color'])
+    assert evaluate(mat, [(0, 0, 0), (0.5, 0, 0), (1, 0, 0)]) == pytest.approx([0.1, 0.35, 0.6])
+
+
+def test_vector_math_and_combine():
+    mat, emission = make_material()
+    combine = add_node(mat, 'ShaderNodeCombineXYZ')
+    combine.inputs['X'].default_value = 0.3
+    combine.inputs['Y'].default_value = 0.6
+    combine.inputs['Z'].default_value = 0.9
+    vector_math = add_node(mat, 'ShaderNodeVectorMath', operation='SCALE')
+    vector_math.inputs['Scale'].default_value = 0.5
+    link(mat, combine.outputs[0], vector_math.inputs[0])
+    link(mat, vector_math.outputs['Vector'], emission.inputs['Color'])
+    # the mean of the colour channels
+    assert evaluate(mat) == pytest.approx([0.3])
+
+
+def test_map_range_and_clamp():
+    mat, emission = make_material()
+    map_range = add_node(mat, 'ShaderNodeMapRange')
+    map_range.inputs['To Min'].default_value = 0.2
+    map_range.inputs['To Max'].default_value = 0.4
+    link(mat, value_node(mat, 0.5).outputs[0], map_range.inputs['Value'])
+    link(mat, map_range.outputs['Result'], emission.inputs['Color'])
+    assert evaluate(mat) == pytest.approx([0.3])
+
+    clamp = add_node(mat, 'ShaderNodeClamp')
+    clamp.inputs['Max'].default_value = 0.25
+    link(mat, map_range.outputs['Result'], clamp.inputs['Value'])
+    link(mat, clamp.outputs[0], emission.inputs['Color'])
+    assert evaluate(mat) == pytest.approx([0.25])
+
+
+def test_color_nodes():
+    mat, emission = make_material()
+    ramp = add_node(mat, 'ShaderNodeValToRGB')
+    ramp.color_ramp.elements[1].color = (0.5, 0.5, 0.5, 1)
+    link(mat, value_node(mat, 0.5).outputs[0], ramp.inputs['Fac'])
+    invert = add_node(mat, 'ShaderNodeInvert')
+    link(mat, ramp.outputs['Color'], invert.inputs['Color'])
+    link(mat, invert.outputs[0], emission.inputs['Color'])
+    assert evaluate(mat) == pytest.approx([0.75], abs=0.01)
+
+    rgb = add_node(mat, 'ShaderNodeRGB')
+    rgb.outputs[0].default_value = (1, 0, 0, 1)
+    bw = add_node(mat, 'ShaderNodeRGBToBW')
+    link(mat, rgb.outputs[0], bw.inputs[0])
+    link(mat, bw.outputs[0], emission.inputs['Color'])
+    assert evaluate(mat) == pytest.approx([0.2126729])
+
+
+@pytest.mark.parametrize('blend_type, expected', [
+    ('MIX', 0.35),
+    ('ADD', 0.45),
+    ('MULTIPLY', 0.15),
+    ('LIGHTEN', 0.35),
+])
+def test_mix(blend_type, expected):
+    mat, emission = make_material()
+    mix = add_node(mat, 'ShaderNodeMix', data_type='RGBA', blend_type=blend_type)
+    inputs = {socket.identifier: socket for socket in mix.inputs}
+    inputs['Factor_Float'].default_value = 0.5
+    inputs['A_Color'].default_value = (0.2, 0.2, 0.2, 1)
+    inputs['B_Color'].default_value = (0.5, 0.5, 0.5, 1)
+    outputs = {socket.identifier: socket for socket in mix.outputs}
+    link(mat, outputs['Result_Color'], emission.inputs['Color'])
+    assert evaluate(mat) == pytest.approx([expected])
+
+
+def test_checker_texture():
+    mat, emission = make_material()
+    checker = add_node(mat, 'ShaderNodeTexChecker')
+    checker.inputs['Scale'].default_value = 2
+    checker.inputs['Color1'].default_value = (0.2, 0.2, 0.2, 1)
+    checker.inputs['Color2'].default_value = (0.8, 0.8, 0.8, 1)
+    link(mat, checker.outputs['Color'], emission.inputs['Color'])
+    # the vector input defaults to generated coordinates
+    heights = evaluate(mat, [(0.25, 0.25, 0.25), (0.75, 0.25, 0.25), (0.75, 0.75, 0.25)])
+    assert heights == pytest.approx([0.8, 0.2, 0.8])
+
+
+@pytest.mark.parametrize('bl_idname', ['ShaderNodeTexNoise', 'ShaderNodeTexVoronoi', 'ShaderNodeTexBrick'])
+def test_textures_are_deterministic(bl_idname):
+    mat, emission = make_material()
+    texture = add_node(mat, bl_idname)
+    link(mat, texture.outputs[0], emission.inputs['Color'])
+    points = np.random.default_rng(0).random((100, 3)) * 4
+    heights = evaluate(mat, points)
+    assert heights.shape == (100,)
+    assert np.all((heights >= 0) & (heights <= 1))
+    assert heights.std() > 0
+    assert np.array_equal(evaluate(mat, points), heights)
+
+
+def test_noise_seed():
+    mat, emission = make_material()
+    noise = add_node(mat, 'ShaderNodeTexNoise', noise_dimensions='4D')
+    seed = value_node(mat, 1)
+    link(mat, seed.outputs[0], noise.inputs['W'])
+    link(mat, noise.outputs['Fac'], emission.inputs['Color'])
+    points = np.random.default_rng(0).random((20, 3))
+    before = evaluate(mat, points)
+    seed.outputs[0].default_value = 2
+    assert not np.allclose(evaluate(mat, points), before)
+
+
+def test_group_and_mute():
+    group = bpy.data.node_groups.new('evaluator_group', 'ShaderNodeTree')
+    # node tree interfaces replaced inputs and outputs in Blender 4.0
+    if hasattr(group, 'interface'):
+        group.interface.new_socket('Value', in_out='INPUT', socket_type='NodeSocketFloat')
+        group.interface.new_socket('Value', in_out='OUTPUT', socket_type='NodeSocketFloat')
+    else:
+        group.inputs.new('NodeSocketFloat', 'Value')
+        group.outputs.new('NodeSocketFloat', 'Value')
+    group_input = group.nodes.new('NodeGroupInput')
+    group_output = group.nodes.new('NodeGroupOutput')
+    math = group.nodes.new('ShaderNodeMath')
+    math.operation = 'MULTIPLY'
+    math.inputs[1].default_value = 0.5
+    group.links.new(group_input.outputs[0], math.inputs[0])
+    group.links.new(math.outputs[0], group_output.inputs[0])
+
+    mat, emission = make_material()
+    group_node = add_node(mat, 'ShaderNodeGroup', node_tree=group)
+    link(mat, value_node(mat, 0.6).outputs[0], group_node.inputs[0])
+    link(mat, group_node.outputs[0], emission.inputs['Color'])
+    assert evaluate(mat) == pytest.approx([0.3])
+
+    # a muted node passes its first input through
+    math.mute = True
+    assert evaluate(mat) == pytest.approx([0.6])
+
+
+def test_unsupported_node():
+    mat, emission = make_material()
+    magic = add_node(mat, 'ShaderNodeTexMagic')
+    link(mat, magic.outputs['Fac'], emission.inputs['Color'])
+    with pytest.raises(UnsupportedNodeError):
+        DisplacementEvaluator(mat)
+
+    with pytest.raises(UnsupportedNodeError):
+        DisplacementEvaluator(bpy.data.materials.new('evaluator_no_emission'))
+
+
+def test_unsupported_material_falls_back_to_baking(cube_object):
+    mat, emission = make_material()
+    magic = add_node(mat, 'ShaderNodeTexMagic')
+    link(mat, magic.outputs['Fac'], emission.inputs['Color'])
+    obj = cube_object('evaluator_fallback', mat)
+    mesh = obj.data
+
+    to_bake = displace_on_cpu([obj])
+    assert list(to_bake) == [obj]
+    assert 'ShaderNodeTexMagic' in to_bake[obj]
+    assert obj.data == mesh
+
+
+def test_varying_input_falls_back_to_baking(cube_object):
+    mat, emission = make_material()
+    noise = add_node(mat, 'ShaderNodeTexNoise')
+    coords = add_node(mat, 'ShaderNodeTexCoord')
+    separate = add_node(mat, 'ShaderNodeSeparateXYZ')
+    link(mat, coords.outputs['Object'], separate.inputs[0])
+    link(mat, separate.outputs['X'], noise.inputs['Detail'])
+    link(mat, noise.outputs['Fac'], emission.inputs['Color'])
+    obj = cube_object('evaluator_varying', mat)
+    obj.modifiers.new(obj.mt_object_props.subsurf_mod_name, 'SUBSURF')
+    obj.vertex_groups.new(name='disp_mod_vert_group').add(range(len(obj.data.vertices)), 1, 'ADD')
+    mesh = obj.data
+    meshes = len(bpy.data.meshes)
+
+    # the Detail input only varies once the mesh is evaluated
+    to_bake = displace_on_cpu([obj])
+    assert list(to_bake) == [obj]
+    assert 'must not vary' in to_bake[obj]
+    assert obj.data == mesh
+    assert not obj.mt_object_props.is_displaced
+    assert len(obj.mt_object_props.preview_materials) == 0
+    assert len(bpy.data.meshes) == meshes
@@ -0,0 +1,48 @@
+import struct
+import pytest
+import bpy
+from MakeTile.lib.utils.stl import write_stl
+
+
+def make_triangle():
+    mesh = bpy.data.meshes.new('stl_triangle')
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+    obj = bpy.data.objects.new('stl_triangle', mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.location = (1, 2, 3)
+    return obj
+
+
+def test_write_triangle(tmp_path):
+    obj = make_triangle()
+    path = str(tmp_path / 'triangle.stl')
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    assert write_stl(path, [obj], depsgraph, scale=2, centre=False) == 1
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert len(data) == 80 + 4 + 50
+    assert data[:80] == b'Binary STL exported by MakeTile'.ljust(80, b' ')
+    assert struct.unpack('<I', data[80:84]) == (1,)
+
+    values = struct.unpack('<12fH', data[84:])
+    assert values[:3] == pytest.approx((0, 0, 1))
+    assert values[3:12] == pytest.approx((2, 4, 6, 4, 4, 6, 2, 6, 6))
+    assert values[12] == 0
+
+
+def test_write_centred(tmp_path, cube):
+    path = str(tmp_path / 'cube.stl')
+    cube.location = (5, 0, 0)
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    assert write_stl(path, [cube], depsgraph) == 12
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    assert len(data) == 80 + 4 + 12 * 50
+    for i in range(12):
+        values = struct.unpack('<12fH', data[84 + i * 50:84 + (i + 1) * 50])
+        normal = values[:3]
+        assert sum(n * n for n in normal) == pytest.approx(1)
+        # cube vertices are centred on the origin
+        assert all(abs(c) == pytest.approx(0.5) for c in values[3:12])